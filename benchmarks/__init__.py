@@ -0,0 +1,3 @@
+# SPDX-FileCopyrightText: 2024-present Ashish Patel <ashishpatel0720@gmail.com>
+#
+# SPDX-License-Identifier: MIT
@@ -0,0 +1,190 @@
+"""
+Startup benchmark for hckr, measures cold start and ``-h`` latency of every registered command
+along with ``python -X importtime`` breakdown, and writes a JSON report which can be compared between versions.
+
+    $ python -m benchmarks.startup -o bench_output.json
+    $ python -m benchmarks.startup -o new.json --compare bench_output.json
+"""
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+import click
+
+# isolate startup from network / telemetry side effects
+BENCH_ENV = {"HCKR_UPDATE_CHECK_TTL": "0", "HCKR_TELEMETRY": "off"}
+COLD_START = "hckr --version"
+
+
+def list_command_paths(group=None, prefix=()):
+    """All command paths registered in hckr cli eg. ``('data', 'peek')``, groups are included as well."""
+    if group is None:
+        from hckr.cli import cli
+
+        group = cli
+    ctx = click.Context(group)
+    paths = []
+    for name in group.list_commands(ctx):
+        if name == "repl":
+            continue
+        command = group.get_command(ctx, name)
+        path = prefix + (name,)
+        paths.append(path)
+        if isinstance(command, click.Group):
+            paths.extend(list_command_paths(command, path))
+    return paths
+
+
+def _hckr_argv(args):
+    return [sys.executable, "-m", "hckr"] + list(args)
+
+
+def _env():
+    env = dict(os.environ)
+    env.update(BENCH_ENV)
+    return env
+
+
+def time_command(args, repeat):
+    """Wall time ( in milliseconds ) of running ``hckr args`` in a fresh interpreter ``repeat`` times."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(
+            _hckr_argv(args),
+            env=_env(),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=False,
+        )
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        "min_ms": round(min(timings), 2),
+        "median_ms": round(statistics.median(timings), 2),
+        "max_ms": round(max(timings), 2),
+    }
+
+
+def parse_importtime(output, top=10):
+    """Parse ``-X importtime`` stderr into total import time and ``top`` modules by cumulative time."""
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line.split(":", 1)[1].split("|", 2)
+        modules.append(
+            {
+                "module": module.strip(),
+                "self_us": int(self_us),
+                "cumulative_us": int(cumulative_us),
+            }
+        )
+    total_us = sum(m["self_us"] for m in modules)
+    slowest = sorted(modules, key=lambda m: m["cumulative_us"], reverse=True)[:top]
+    return {
+        "total_us": total_us,
+        "module_count": len(modules),
+        "top": [
+            {"module": m["module"], "cumulative_us": m["cumulative_us"]}
+            for m in slowest
+        ],
+    }
+
+
+def import_breakdown(args, top=10):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime"] + _hckr_argv(args)[1:],
+        env=_env(),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        check=False,
+    )
+    return parse_importtime(result.stderr, top)
+
+
+def run_benchmark(paths, repeat=5, top=10):
+    from hckr.__about__ import __version__
+
+    report = {
+        "version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "commands": {},
+    }
+    targets = [(COLD_START, ["--version"])] + [
+        (f"hckr {' '.join(path)} -h", list(path) + ["-h"]) for path in paths
+    ]
+    for name, args in targets:
+        click.echo(f"Benchmarking: {name}", err=True)
+        report["commands"][name] = {
+            "wall": time_command(args, repeat),
+            "imports": import_breakdown(args, top),
+        }
+    return report
+
+
+def compare_reports(baseline, current, threshold):
+    """Returns list of ``(command, baseline_ms, current_ms, change %)`` slower than ``threshold`` percent."""
+    regressions = []
+    for name, result in current["commands"].items():
+        if name not in baseline["commands"]:
+            continue
+        before = baseline["commands"][name]["wall"]["median_ms"]
+        after = result["wall"]["median_ms"]
+        change = (after - before) / before * 100 if before else 0
+        if change > threshold:
+            regressions.append((name, before, after, round(change, 1)))
+    return regressions
+
+
+@click.command(context_settings={"help_option_names": ["-h", "--help"]})
+@click.option("-o", "--output", help="Report file path, [default: stdout]")
+@click.option("-r", "--repeat", default=5, help="Runs per command, [default: 5]")
+@click.option(
+    "-c",
+    "--command",
+    "commands",
+    multiple=True,
+    help="Only benchmark given command eg. 'data peek', [default: all commands]",
+)
+@click.option("--top", default=10, help="Slowest imports to keep per command")
+@click.option("--compare", type=click.Path(exists=True), help="Baseline report")
+@click.option(
+    "--threshold",
+    default=10.0,
+    help="Fail if median is slower than baseline by this percent, [default: 10]",
+)
+def main(output, repeat, commands, top, compare, threshold):
+    if commands:
+        paths = [tuple(command.split()) for command in commands]
+    else:
+        paths = list_command_paths()
+    report = run_benchmark(paths, repeat, top)
+    content = json.dumps(report, indent=2)
+    if output:
+        with open(output, "w") as report_file:
+            report_file.write(content)
+    else:
+        click.echo(content)
+
+    if compare:
+        with open(compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare_reports(baseline, report, threshold)
+        for name, before, after, change in regressions:
+            click.echo(
+                f"REGRESSION {name}: {before}ms -> {after}ms (+{change}%)", err=True
+            )
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
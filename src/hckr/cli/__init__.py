@@ -6,28 +6,10 @@ import logging
 import click
 from click_repl import register_repl  # type: ignore
 
-from hckr.cli.db import db
-from hckr.cli.configure import configure
-from hckr.cli.config import config
-from hckr.cli.env import env
-from hckr.cli.azure import azure
-from hckr.cli.k8s.context import context
-from hckr.cli.k8s.namespace import namespace
-from hckr.cli.k8s.pod import pod
 from hckr.utils import CliUtils
-from .crypto.fernet import fernet
-from .data import data
-from .info import info
-from .k8s import k8s
-from .net import net
-from .dt import dt
 from ..__about__ import __version__
-from ..cli.cron import cron
-from ..cli.crypto import crypto
-from ..cli.hash import hash
-from ..utils.CliUtils import check_update, Info, LOGGING_LEVELS
-from ..utils.MessageUtils import warning
-
+from ..utils.CliUtils import check_update, Info, LOGGING_LEVELS, LazyGroup
+from ..utils.MessageUtils import warning, OUTPUT_FORMATS, OUTPUT_FORMAT_KEY
 
 # sentry logging and monitoring
 CliUtils.sentry_init()
@@ -36,7 +18,29 @@ CliUtils.sentry_init()
 pass_info = click.make_pass_decorator(Info, ensure=True)
 
 
+# subcommands are imported only when invoked, so a command doesn't pay for heavy imports ( pandas, kubernetes etc.)
+# of other commands, nested groups ( crypto, k8s ) register their own subcommands lazily
+LAZY_SUBCOMMANDS = {
+    "azure": "hckr.cli.azure.azure",
+    "config": "hckr.cli.config.config",
+    "configure": "hckr.cli.configure.configure",
+    "cron": "hckr.cli.cron.cron",
+    "crypto": "hckr.cli.crypto.crypto",
+    "data": "hckr.cli.data.data",
+    "db": "hckr.cli.db.db",
+    "dt": "hckr.cli.dt.dt",
+    "env": "hckr.cli.env.env",
+    "hash": "hckr.cli.hash.hash",
+    "info": "hckr.cli.info.info",
+    "k8s": "hckr.cli.k8s.k8s",
+    "net": "hckr.cli.net.net",
+    "serve": "hckr.cli.serve.serve",
+}
+
+
 @click.group(
+    cls=LazyGroup,
+    lazy_subcommands=LAZY_SUBCOMMANDS,
     context_settings={"help_option_names": ["-h", "--help"]},
     invoke_without_command=True,
 )
@@ -46,6 +50,11 @@ pass_info = click.make_pass_decorator(Info, ensure=True)
     count=True,
     help="Enable verbose output, use -v for INFO and -vv for DEBUG",
 )
+@click.option(
+    "--output",
+    type=click.Choice(OUTPUT_FORMATS, case_sensitive=False),
+    help="Print results as records instead of tables / panels, other messages are written to stderr",
+)
 @click.version_option(version=__version__, prog_name="hckr")
 @click.pass_context
 @pass_info
@@ -53,7 +62,10 @@ def cli(
     _info: Info,
     ctx: click.Context,
     verbose: int,
+    output: str,
 ):
+    if output:
+        ctx.meta[OUTPUT_FORMAT_KEY] = output.lower()
     if verbose > 0:
         logging.basicConfig(
             level=(LOGGING_LEVELS.get(verbose, logging.DEBUG)),
@@ -77,38 +89,6 @@ def cli(
 
 
 register_repl(cli)
-cli.add_command(info)
-cli.add_command(cron)
-cli.add_command(hash)
-cli.add_command(data)
-
-# we have to add these here otherwise it will be circular imports
-# CRYPTO
-cli.add_command(crypto)
-crypto.add_command(fernet)
-
-# k8s
-cli.add_command(k8s)
-k8s.add_command(pod)
-k8s.add_command(namespace)
-k8s.add_command(context)
-
-# NETWORK command
-cli.add_command(net)
-cli.add_command(dt)
-
-# config
-cli.add_command(config)
-cli.add_command(configure)
-
-# database
-cli.add_command(db)
-
-# environment
-cli.add_command(env)
-
-# azure
-cli.add_command(azure)
 
 
 # implementing this so that if the user just uses `hckr` we show them something
@@ -1,7 +1,11 @@
 import click
 
+from ...utils.CliUtils import LazyGroup
+
 
 @click.group(
+    cls=LazyGroup,
+    lazy_subcommands={"fernet": "hckr.cli.crypto.fernet.fernet"},
     help="crypto commands",
     context_settings={"help_option_names": ["-h", "--help"]},
 )
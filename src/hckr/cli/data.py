@@ -1,23 +1,62 @@
+import contextlib
+import functools
 import json
 import logging
+import sys
 
 import click
-import fastavro
 import pandas as pd
 import pyarrow as pa  # type: ignore
-import rich
-from cron_descriptor import get_description  # type: ignore
-from faker import Faker
-from pyarrow import parquet as pq  # type: ignore
-from rich.panel import Panel
 
-from hckr.utils.DataUtils import safe_faker_method, print_df_as_table, readFile
+from hckr.utils.DataUtils import (
+    print_df,
+    print_df_as_table,
+    readFile,
+    readFileTail,
+    readColumns,
+    is_json_array,
+    countRows,
+    readFileBatches,
+    DEFAULT_PARQUET_COMPRESSION,
+    PARQUET_COMPRESSIONS,
+    DEFAULT_AVRO_CODEC,
+    AVRO_CODECS,
+    BatchWriter,
+    DEFAULT_COL_COUNT,
+    DEFAULT_BATCH_SIZE,
+    COMMA,
+    sniffCsvDelimiter,
+    validate_format,
+)
+from hckr.utils import CacheUtils
+from hckr.utils.DatasetUtils import Dataset, is_dataset, parse_partitions
+from hckr.utils.HashUtils import human_readable_size
+from hckr.utils.FollowUtils import end_offset, follow_records, parse_records
+from hckr.utils.FakerUtils import fake_batches, fake_part_files
 from hckr.utils.FileUtils import (
-    validate_file_extension,
     get_file_format_from_extension,
+    infer_input_format,
+    open_input,
+    spooled_copy,
     FileFormat,
+    RANDOM_ACCESS_FORMATS,
+)
+from hckr.utils.QueryUtils import Query, QueryError, parse_query, parse_where, run_query
+from hckr.utils.SampleUtils import (
+    bernoulli_sample,
+    reservoir_sample,
+    sampled_batches,
 )
-from hckr.utils.MessageUtils import success, colored, info, error
+from hckr.utils.StatsUtils import (
+    DEFAULT_QUANTILES,
+    column_stats,
+    parquet_statistics,
+)
+from hckr.utils.MessageUtils import success, colored, info, error, warning, PInfo
+from hckr.utils.MessageUtils import output_format as global_output_format
+
+# formats which are appended line by line
+FOLLOW_FORMATS = (FileFormat.CSV, FileFormat.TXT, FileFormat.JSONL, FileFormat.JSON)
 
 
 @click.group(
@@ -43,14 +82,55 @@ def data():
     help="Path to the JSON schema file.",
     required=True,
 )
-@click.option("-o", "--output", help="Output file path", required=True)
+@click.option(
+    "-o",
+    "--output",
+    help="Output file path, use '-' to stream data to stdout",
+    required=True,
+)
 @click.option(
     "-f",
     "--format",
-    help=f"Output file format, Options: {FileFormat.validFormats()} [default: Inferred from file extension]",
+    help=f"Output file format, Options: {FileFormat.validFormats()} [default: Inferred from file extension, csv for stdout]",
+    required=False,
+)
+@click.option(
+    "-b",
+    "--batch-size",
+    default=DEFAULT_BATCH_SIZE,
+    type=click.IntRange(min=1),
+    help=f"Number of rows generated and written at a time, [default: {DEFAULT_BATCH_SIZE}]",
+    required=False,
+)
+@click.option(
+    "-w",
+    "--workers",
+    default=1,
+    type=click.IntRange(min=1),
+    help="Number of processes generating data, [default: 1]",
     required=False,
 )
-def faker(count, schema, output, format):
+@click.option(
+    "--seed",
+    type=int,
+    help="Seed for reproducible data, same for any number of workers ( given same batch size )",
+    required=False,
+)
+@click.option(
+    "--part-files",
+    is_flag=True,
+    default=False,
+    help="Write every batch as a part file inside OUTPUT directory, instead of a single file",
+)
+@click.option(
+    "--no-preview",
+    is_flag=True,
+    default=False,
+    help="Don't print sample of generated data",
+)
+def faker(
+    count, schema, output, format, batch_size, workers, seed, part_files, no_preview
+):
     """
     This command Generate fake Data in different file formats
 
@@ -86,84 +166,108 @@ def faker(count, schema, output, format):
 
         $ hckr data faker -s schema.json -o output -f csv
 
+    * Data is generated and written in batches of ``-b/--batch-size`` rows, so memory stays flat for any count
+
+    .. code-block:: shell
+
+        $ hckr data faker -s schema.json -o file.parquet -c 50000000 -b 100000
+
+    * Data can be generated by multiple processes using ``-w/--workers``, and ``--seed`` makes it reproducible
+      for any number of workers, as every batch has its own seed ( ``seed + batch number`` )
+
+    .. code-block:: shell
+
+        $ hckr data faker -s schema.json -o file.parquet -c 1000000 -w 8 --seed 42
+
+    * With ``--part-files`` every batch is written by its worker as ``part-NNNNN.<ext>`` inside output directory
+
+    .. code-block:: shell
+
+        $ hckr data faker -s schema.json -o output_dir -f parquet -c 1000000 -w 8 --part-files
+
+    * Use ``-o -`` to stream data to stdout batch by batch ( **csv** by default ), all other messages are
+      written to stderr, so data can be piped to another command without a temporary file
+
+    .. code-block:: shell
+
+        $ hckr data faker -s schema.json -o - -c 1000000 | gzip > file.csv.gz
+        $ hckr data faker -s schema.json -o - -f jsonl | kafka-console-producer --topic users ...
+
+    * Sample table of generated data can be skipped using ``--no-preview``
+
+    .. code-block:: shell
+
+        $ hckr data faker -s schema.json -o file.parquet --no-preview
+
 
     **Command Reference**:
     """
 
-    try:
-        if not format:
-            format = get_file_format_from_extension(output)
+    # with `-o -` data is streamed to stdout, so every message is written to stderr
+    stdout = sys.stdout.buffer if output == "-" else None
+    messages = (
+        contextlib.redirect_stdout(sys.stderr)
+        if stdout is not None
+        else contextlib.nullcontext()
+    )
+    with messages:
+        try:
+            if not format and part_files:
+                error(
+                    "Please provide format using -f / --format option with --part-files"
+                )
+                exit(1)
+            if stdout is not None and part_files:
+                error("--part-files can't be used when streaming data to stdout")
+                exit(1)
+            if not format and stdout is not None:
+                format = FileFormat.CSV
+            elif not format:
+                format = get_file_format_from_extension(output)
+                info(
+                    f"File format is not passed, inferring from output file path {colored(output, 'yellow')}"
+                )
+                info(f"Format inferred: {colored(format, 'magenta')}")
+            else:
+                format = format.lower()
+            with open(schema, "r") as schema_file:
+                schema = json.load(schema_file)
+
+            if part_files:
+                validate_format(format)
+                sample, rows = fake_part_files(
+                    schema, count, format, output, batch_size, seed, workers
+                )
+            else:
+                sample = None
+                with BatchWriter(
+                    format, output if stdout is None else stdout
+                ) as writer:
+                    for batch in fake_batches(schema, count, batch_size, seed, workers):
+                        if sample is None:
+                            sample = batch.head(3)
+                        writer.write(batch)
+                        logging.debug(f"{writer.rows} rows written to {output}")
+                rows = writer.rows
             info(
-                f"File format is not passed, inferring from output file path {colored(output, 'yellow')}"
-            )
-            info(f"Format inferred: {colored(format, 'magenta')}")
-        else:
-            format = format.lower()
-        fake = Faker()
-        with open(schema, "r") as schema_file:
-            schema = json.load(schema_file)
-
-        records = []
-
-        # Adjusted fake data generation
-        for _ in range(count):
-            entry = {
-                key: safe_faker_method(fake, *value.split(":"))
-                for key, value in schema.items()
-            }
-            records.append(entry)
-
-        df = pd.DataFrame(records)
-
-        # this is same as CSV in case of faker as columns are determined by schema
-        if format == FileFormat.TXT or format == FileFormat.CSV:
-            df.to_csv(output, index=False, quotechar='"', escapechar="\\")
-        elif format == FileFormat.JSON:
-            df.to_json(output, orient="records")
-        elif format == FileFormat.EXCEL:
-            validate_file_extension(output, [".xlsx", ".xls"])
-            df.to_excel(output, index=False, engine="openpyxl")
-        elif format == FileFormat.PARQUET:
-            table = pa.Table.from_pandas(df)
-            pq.write_table(table, output)
-        elif format == FileFormat.AVRO:
-            records = df.to_dict(orient="records")
-            schema = {
-                "doc": "Avro schema for generated data",
-                "name": "Root",
-                "type": "record",
-                "fields": [
-                    {"name": str(key), "type": ["null", "string"], "default": None}
-                    for key in records[0]
-                ],
-            }
-            parsed_schema = fastavro.parse_schema(schema)
-            with open(output, "wb") as out:
-                fastavro.writer(out, parsed_schema, records)
-        else:
-            error(
-                f"Invalid file format {str(format)}, Available {FileFormat.validFormats()}"
+                f"Generating {colored(count, 'magenta')} rows in {colored(format, 'yellow')} format."
             )
-            exit(1)
-        info(
-            f"Generating {colored(count, 'magenta')} rows in {colored(format, 'yellow')} format."
-        )
-        # logging.debug(f"Data head:\n'{df.head()}'")
 
-        print_df_as_table(df)
-        success(
-            f"Data written to {colored(output, 'magenta')} in {colored(format, 'yellow')} format."
-        )
-
-        rich.print(
-            Panel(
-                output,
-                expand=True,
-                title="File Output",
+            if sample is not None and not no_preview and stdout is None:
+                print_df_as_table(sample, total_rows=rows)
+            if stdout is not None:
+                success(
+                    f"{rows} rows written to stdout in {colored(format, 'yellow')} format."
+                )
+                return
+            success(
+                f"Data written to {colored(output, 'magenta')} in {colored(format, 'yellow')} format."
             )
-        )
-    except Exception as e:
-        error(f"Some error occurred while generating data\n{e}")
+
+            PInfo(output, title="File Output")
+        except Exception as e:
+            error(f"Some error occurred while generating data\n{e}")
+            exit(1)
 
 
 @data.command()
@@ -181,14 +285,79 @@ def faker(count, schema, output, format):
     help="Output file format, if not provided it gets inferred from file extension",
     required=False,
 )
-def peek(input, count, format):
+@click.option(
+    "--columns",
+    help=f"Comma separated columns to show eg. 'id,name', [default: first {DEFAULT_COL_COUNT} columns]",
+    required=False,
+)
+@click.option(
+    "--partition",
+    "partitions",
+    multiple=True,
+    help="Only read partition KEY=VALUE of a partitioned dataset eg. 'year=2024', can be repeated",
+)
+@click.option(
+    "--sample",
+    type=click.IntRange(min=1),
+    help="Show N random rows instead of top rows, sampled in a single pass over the file",
+    required=False,
+)
+@click.option(
+    "--sample-fraction",
+    type=click.FloatRange(min=0, max=1, min_open=True),
+    help="Only read a random fraction of the file eg. 0.01, blocks of Parquet / Avro / Feather / ORC files are skipped",
+    required=False,
+)
+@click.option(
+    "--seed",
+    type=int,
+    help="Seed for random sampling, so same rows are sampled every time",
+    required=False,
+)
+@click.option(
+    "--tail",
+    is_flag=True,
+    default=False,
+    help="Show last COUNT rows instead of top rows, only end of the file is read",
+)
+@click.option(
+    "--follow",
+    is_flag=True,
+    default=False,
+    help="Show last COUNT rows and keep showing rows appended to a CSV or JSON lines file, like `tail -f`",
+)
+@click.option(
+    "--where",
+    help="Only show followed rows matching a filter eg. \"level = 'ERROR'\"",
+    required=False,
+)
+@click.option(
+    "--follow-timeout",
+    type=click.FloatRange(min=0),
+    help="Stop following after SECONDS without new rows, [default: follow till Ctrl+C]",
+    required=False,
+)
+def peek(
+    input,
+    count,
+    format,
+    columns,
+    partitions,
+    sample,
+    sample_fraction,
+    seed,
+    tail,
+    follow,
+    where,
+    follow_timeout,
+):
     """
     This command allows us to peek into top COUNT rows from a file
 
     **Example Usage**:
 
     * We can look into an input file by providing **-i** or **-\-input** option
-    * It will show top 10 rows ( by default )
+    * It will show top 10 rows ( by default ), only these rows are read from the file, so peeking into large files is fast
 
     .. code-block:: shell
 
@@ -206,27 +375,909 @@ def peek(input, count, format):
 
         $ hckr data peek -i input.data -f csv
 
+    * We can select columns to show using **-\-columns** option, only these columns are read from the file
+      ( otherwise first 10 columns are read ), which makes peeking into wide files fast
+
+    .. code-block:: shell
+
+        $ hckr data peek -i input.parquet --columns id,name,email
+
+    * Feather ( Arrow IPC ) files are memory mapped, so only the rows and columns shown are read from disk
+
+    .. code-block:: shell
+
+        $ hckr data peek -i input.feather
+
+    * Compressed files ( gzip, bz2, xz or zstd ) are decompressed while reading
+
+    .. code-block:: shell
+
+        $ hckr data peek -i input.csv.gz
+
+    * A directory ( eg. partitioned output ``year=2024/month=10/part-0.parquet`` ) or a glob pattern is read as
+      a dataset of its files, first rows are read by scanning files in parallel and scan stops once rows are read.
+      Partitions are shown as columns, and **-\-partition** option reads only given partitions
+
+    .. code-block:: shell
+
+        $ hckr data peek -i output/ --partition year=2024
+        $ hckr data peek -i "logs/*.avro"
+
+    * Top rows of a sorted file ( eg. logs ) are often not representative, **-\-sample** option shows N random rows
+      sampled in a single pass, and **-\-sample-fraction** option reads only a fraction of the file, skipping
+      whole Parquet row groups and Avro blocks, so even very large files are sampled in seconds
+
+    .. code-block:: shell
+
+        $ hckr data peek -i events.csv --sample 20 --seed 42
+        $ hckr data peek -i events.parquet --sample-fraction 0.01
+
+    * Last rows of a file ( eg. an append only log ) can be seen using **-\-tail** option, CSV and JSON lines files
+      are read backwards from the end till enough lines are found, and only last row groups / blocks of
+      Parquet, Avro, Feather and ORC files are read
+
+    .. code-block:: shell
+
+        $ hckr data peek -i app-log.jsonl --tail -c 20
+
+    * A growing CSV or JSON lines file ( eg. an ingestion landing file ) can be followed using **-\-follow** option,
+      only newly appended bytes are parsed and shown as new rows, and **-\-where** option shows only matching rows
+
+    .. code-block:: shell
+
+        $ hckr data peek -i landing/events.jsonl --follow --where "level = 'ERROR'"
+
 
     **Command Reference**:
     """
+    sampling = sample is not None or sample_fraction is not None
+    if tail and sampling:
+        error("--tail option can't be used with --sample or --sample-fraction")
+        exit(1)
+    if follow and sampling:
+        error("--follow option can't be used with --sample or --sample-fraction")
+        exit(1)
+    if where and not follow:
+        error(
+            "--where option is only supported with --follow, please use `hckr data query` to filter a file"
+        )
+        exit(1)
     try:
         info(
-            f"Peeking {colored(count, 'magenta')} rows in file {colored(input, 'yellow')}"
+            f"{'Sampling' if sampling else 'Peeking'} {colored(sample or count, 'magenta')} rows in file {colored(input, 'yellow')}"
         )
-        if not format:
-            format = get_file_format_from_extension(input)
-            info(
-                f"File format is not passed, inferring from file path {colored(input, 'yellow')}"
+        dataset = _dataset(input, format, partitions)
+        if dataset is not None:
+            if tail or follow:
+                error(
+                    f"{'--follow' if follow else '--tail'} option is only supported for a file"
+                )
+                exit(1)
+            if sampling:
+                _peek_sample(
+                    dataset.columns(),
+                    lambda columns: _dataset_sample_batches(
+                        dataset, sample_fraction, seed, columns
+                    ),
+                    sample or count,
+                    columns,
+                    sample_fraction,
+                    seed,
+                )
+                return
+            _peek(dataset.columns(), dataset.head, count, columns)
+            return
+        with _open_input(format, input) as (handle, format, compression):
+            if follow:
+                # rows appended to a JSON array come after its closing bracket
+                if (
+                    compression
+                    or format not in FOLLOW_FORMATS
+                    or (format == FileFormat.JSON and is_json_array(handle))
+                ):
+                    error(
+                        "--follow option is only supported for uncompressed CSV and JSON lines files"
+                    )
+                    exit(1)
+                _follow(input, format, handle, count, columns, where, follow_timeout)
+                return
+            if tail:
+                _peek(
+                    readColumns(format, handle),
+                    functools.partial(
+                        readFileTail,
+                        format,
+                        handle,
+                        streamed=compression is not None
+                        and format not in RANDOM_ACCESS_FORMATS,
+                    ),
+                    count,
+                    columns,
+                    tail=True,
+                )
+                return
+            if sampling:
+                _peek_sample(
+                    readColumns(format, handle),
+                    lambda columns: sampled_batches(
+                        format, handle, sample_fraction, seed, columns
+                    ),
+                    sample or count,
+                    columns,
+                    sample_fraction,
+                    seed,
+                )
+                return
+            _peek(
+                readColumns(format, handle),
+                functools.partial(readFile, format, handle),
+                count,
+                columns,
             )
-            info(f"Format inferred: {colored(format, 'magenta')}")
+    except Exception as e:
+        error(
+            f"Some error occurred while reading data {colored(input,'magenta')} in format {colored(format,'yellow')}\n{e}"
+        )
+
+
+def _peek_columns(all_columns, columns):
+    """Columns to read, selected with --columns option or first columns of the file, and total columns"""
+    total_columns = None if all_columns is None else len(all_columns)
+    if columns:
+        columns = [column.strip() for column in columns.split(",") if column.strip()]
+        missing = [c for c in columns if all_columns and c not in all_columns]
+        if missing:
+            error(
+                f"Columns {colored(missing, 'yellow')} not found, available columns: {colored(all_columns, 'magenta')}"
+            )
+            exit(1)
+        total_columns = len(columns)
+    elif all_columns is not None:
+        # only columns which are shown are read
+        columns = all_columns[:DEFAULT_COL_COUNT]
+    return columns, total_columns
+
+
+def _peek(all_columns, read, count, columns, tail=False):
+    # read(nrows, columns) reads first ( or last ) rows of a file or dataset
+    columns, total_columns = _peek_columns(all_columns, columns)
+    # one more row than shown, to know if file has more rows without reading it all
+    df = read(nrows=count + 1, columns=columns)
+    print_df_as_table(
+        df.tail(count) if tail else df.head(count),
+        title="Last Rows" if tail else "Data Sample",
+        count=count,
+        truncated=df.shape[0] > count,
+        total_columns=total_columns,
+    )
+
+
+@data.command()
+@click.option("-i", "--input", help="Input file to count rows of", required=True)
+@click.option(
+    "-f",
+    "--format",
+    help="Input file format, if not provided it gets inferred from file extension",
+    required=False,
+)
+@click.option(
+    "-w",
+    "--workers",
+    default=1,
+    type=click.IntRange(min=1),
+    help="Number of processes scanning CSV/TXT/JSON lines files, [default: 1]",
+    required=False,
+)
+@click.option(
+    "--partition",
+    "partitions",
+    multiple=True,
+    help="Only read partition KEY=VALUE of a partitioned dataset eg. 'year=2024', can be repeated",
+)
+def count(input, format, workers, partitions):
+    """
+    This command counts rows in a file, without reading the data where possible
+
+    **Example Usage**:
+
+    * Parquet and ORC row count is read from file metadata, Feather from record batch headers ( memory mapped ),
+      and Avro row count from block headers, so it is instant for any size
+
+    .. code-block:: shell
+
+        $ hckr data count -i input.parquet
+
+    * CSV, TXT and JSON lines files are counted by scanning newlines ( newlines inside quoted CSV values are ignored ),
+      large files can be scanned in parallel using **-w** or **-\-workers** option
+
+    .. code-block:: shell
+
+        $ hckr data count -i input.csv -w 8
+
+    * We can also provide data format explicitly using **-f** or **-\-format** option, if file extension is not clear
+
+    .. code-block:: shell
+
+        $ hckr data count -i input.data -f csv
+
+    * Rows of a directory or glob pattern dataset can be counted as well, Parquet / ORC files are counted from metadata
+
+    .. code-block:: shell
+
+        $ hckr data count -i output/ --partition year=2024
+
+
+    **Command Reference**:
+    """
+    try:
+        dataset = _dataset(input, format, partitions)
+        if dataset is not None:
+            rows = dataset.count(workers)
+            success(
+                f"Dataset {colored(input, 'magenta')} has {colored(rows, 'yellow')} rows in {len(dataset.files)} files"
+            )
+            return
+        with _open_input(format, input) as (handle, format, compression):
+            # compressed file is scanned while decompressing, otherwise file can be scanned in parallel
+            rows = countRows(format, handle if compression else input, workers)
+        success(f"File {colored(input, 'magenta')} has {colored(rows, 'yellow')} rows")
+    except Exception as e:
+        error(
+            f"Some error occurred while counting rows in {colored(input,'magenta')} in format {colored(format,'yellow')}\n{e}"
+        )
+        exit(1)
+
+
+def _follow(path, _format, handle, count, columns, where, timeout):
+    # last rows are shown first, then rows appended after them. An incomplete last line is shown once it's complete
+    offset = end_offset(path)
+    columns, total_columns = _peek_columns(readColumns(_format, handle), columns)
+    df = readFileTail(_format, handle, count, columns, end=offset)
+    schema = pa.Table.from_pandas(df, preserve_index=False).schema
+    expression = None
+    if where:
+        try:
+            expression = parse_where(where, schema)
+        except QueryError as e:
+            error(f"Invalid filter\n{e}")
+            exit(1)
+    csv_file = _format in (FileFormat.CSV, FileFormat.TXT)
+    header, delimiter = b"", COMMA
+    if csv_file:
+        delimiter = sniffCsvDelimiter(handle) if _format == FileFormat.CSV else COMMA
+        handle.seek(0)
+        header = handle.readline()
+
+    printed = False
+
+    def show(df, title):
+        nonlocal printed
+        df = _filter_rows(df, schema, expression)
+        if columns is not None:
+            df = df[columns]
+        if not df.shape[0]:
+            return
+        if global_output_format():
+            # rows are printed as one stream, with a single csv header
+            print_df(df, global_output_format(), header=not printed)
         else:
-            format = format.lower()
+            print_df_as_table(
+                df, title=title, count=df.shape[0], total_columns=total_columns
+            )
+        printed = True
+
+    show(df, "Last Rows")
+    info(f"Following {colored(path, 'yellow')} for new rows, press Ctrl+C to stop")
+    try:
+        for records in follow_records(
+            path, offset, quoted=csv_file, header=csv_file, idle_timeout=timeout
+        ):
+            show(parse_records(_format, records, header, delimiter), "New Rows")
+    except KeyboardInterrupt:
+        pass
+    info(f"Stopped following {colored(path, 'yellow')}")
 
-        # Adjusted fake data generation
-        df = readFile(format, input)
-        # logging.debug(f"Data head:\n'{df.head()}'")
-        print_df_as_table(df, count=count)
+
+def _filter_rows(df, schema, expression):
+    if expression is None:
+        return df
+    try:
+        # types of new rows are inferred on their own, so they are converted to types of first rows
+        table = pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, KeyError):
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    return table.filter(expression).to_pandas()
+
+
+def _peek_sample(all_columns, batches, size, columns, fraction, seed):
+    # batches(columns) streams ( a fraction of ) a file or dataset, rows are sampled from it in a single pass
+    columns, total_columns = _peek_columns(all_columns, columns)
+    df, rows = reservoir_sample(batches(columns), size, seed)
+    info(
+        f"Sampled {colored(df.shape[0], 'yellow')} random rows from {colored(rows, 'yellow')} rows read"
+    )
+    print_df_as_table(
+        df,
+        title="Random Sample",
+        count=size,
+        total_rows=rows,
+        truncated=fraction is not None,  # rest of the data is not read
+        total_columns=total_columns,
+    )
+
+
+def _dataset_sample_batches(dataset, fraction, seed, columns):
+    batches = dataset.batches()
+    if fraction is not None:
+        batches = bernoulli_sample(batches, fraction, seed)
+    for df in batches:
+        yield df if columns is None else df[columns]
+
+
+def _input_format(_format, handle, path):
+    """Format passed with an option, or detected from content of input file ( and its extension )"""
+    if _format:
+        return _format.lower()
+    _format = infer_input_format(handle, path)
+    info(
+        f"File format is not passed, inferring from file path {colored(path, 'yellow')} and its content"
+    )
+    info(f"Format inferred: {colored(_format, 'magenta')}")
+    return _format
+
+
+@contextlib.contextmanager
+def _open_input(_format, path):
+    """
+    Open input file ( decompressed while reading if compressed ) and find its format, yields ``(handle, format, compression)``.
+    Columnar formats and Excel need random access, so they are decompressed into a temporary file first.
+    """
+    with open_input(path) as (handle, compression):
+        _format = _input_format(_format, handle, path)
+        if not compression:
+            # Feather is memory mapped from its path, instead of reading through open file
+            yield (path if _format == FileFormat.FEATHER else handle), _format, None
+            return
+        if _format not in RANDOM_ACCESS_FORMATS:
+            yield handle, _format, compression
+            return
+        info(
+            f"Decompressing {colored(compression, 'yellow')} compressed {colored(_format, 'magenta')} file"
+        )
+        with spooled_copy(handle) as spooled:
+            yield spooled, _format, compression
+
+
+def _dataset(path, _format, partitions):
+    """Dataset of a directory / glob pattern input, ``None`` for a single file"""
+    if not is_dataset(path):
+        if partitions:
+            warning("Partitions are only used for a directory or glob pattern input")
+        return None
+    dataset = Dataset(path, _format and _format.lower(), parse_partitions(partitions))
+    info(
+        f"Reading dataset {colored(path, 'yellow')} of {colored(len(dataset.files), 'magenta')} files "
+        f"in formats {colored(dataset.formats, 'magenta')}"
+    )
+    return dataset
+
+
+@contextlib.contextmanager
+def _open_batches(path, _format, partitions, batch_size):
+    """Batches of a file or dataset, yields ``(batches, format)``"""
+    dataset = _dataset(path, _format, partitions)
+    if dataset is not None:
+        batches = dataset.batches(batch_size)
+        with contextlib.closing(batches):
+            yield batches, ",".join(dataset.formats)
+        return
+    with _open_input(_format, path) as (handle, _format, _):
+        validate_format(_format)
+        batches = readFileBatches(_format, handle, batch_size)
+        # closed before the input file, so a partly read generator isn't finalized later on a closed file
+        with contextlib.closing(batches):
+            yield batches, _format
+
+
+def _format_or_inferred(_format, path):
+    if _format:
+        return _format.lower()
+    _format = get_file_format_from_extension(path)
+    info(
+        f"File format is not passed, inferring from file path {colored(path, 'yellow')}"
+    )
+    info(f"Format inferred: {colored(_format, 'magenta')}")
+    return _format
+
+
+@data.command()
+@click.option("-i", "--input", help="Input file to convert", required=True)
+@click.option("-o", "--output", help="Output file path", required=True)
+@click.option(
+    "--input-format",
+    help="Input file format, if not provided it gets inferred from file extension",
+    required=False,
+)
+@click.option(
+    "--output-format",
+    help=f"Output file format, Options: {FileFormat.validFormats()} [default: Inferred from file extension]",
+    required=False,
+)
+@click.option(
+    "-b",
+    "--batch-size",
+    default=DEFAULT_BATCH_SIZE,
+    type=click.IntRange(min=1),
+    help=f"Number of rows read and written at a time, [default: {DEFAULT_BATCH_SIZE}]",
+    required=False,
+)
+@click.option(
+    "--row-group-size",
+    type=click.IntRange(min=1),
+    help="Rows per Parquet row group, [default: batch size]",
+    required=False,
+)
+@click.option(
+    "--compression",
+    default=DEFAULT_PARQUET_COMPRESSION,
+    type=click.Choice(PARQUET_COMPRESSIONS, case_sensitive=False),
+    help=f"Parquet compression codec, [default: {DEFAULT_PARQUET_COMPRESSION}]",
+    required=False,
+)
+@click.option(
+    "--avro-codec",
+    default=DEFAULT_AVRO_CODEC,
+    type=click.Choice(AVRO_CODECS, case_sensitive=False),
+    help=f"Avro compression codec, [default: {DEFAULT_AVRO_CODEC}]",
+    required=False,
+)
+@click.option(
+    "--partition",
+    "partitions",
+    multiple=True,
+    help="Only read partition KEY=VALUE of a partitioned dataset eg. 'year=2024', can be repeated",
+)
+def convert(
+    input,
+    output,
+    input_format,
+    output_format,
+    batch_size,
+    row_group_size,
+    compression,
+    avro_codec,
+    partitions,
+):
+    """
+    This command converts a file from one format to another, data is streamed in batches so memory stays flat
+    for any file size
+
+    **Example Usage**:
+
+    * Convert a CSV file to Parquet, formats are inferred from file extensions
+
+    .. code-block:: shell
+
+        $ hckr data convert -i input.csv -o output.parquet
+
+    * We can also provide formats explicitly, if file extensions are not clear
+
+    .. code-block:: shell
+
+        $ hckr data convert -i input.data --input-format csv -o output.data --output-format avro
+
+    * Number of rows read at a time can be changed using **-b** or **-\-batch-size** option,
+      Parquet row groups can be larger than batch size using **-\-row-group-size** option
+
+    .. code-block:: shell
+
+        $ hckr data convert -i input.csv -o output.parquet -b 100000 --row-group-size 1000000 --compression zstd
+
+    * Avro output can be compressed using **-\-avro-codec** option
+
+    .. code-block:: shell
+
+        $ hckr data convert -i input.parquet -o output.avro --avro-codec deflate
+
+    * Input can be a compressed file, and output is compressed if its path ends with **.gz**, **.bz2**, **.xz** or **.zst**
+
+    .. code-block:: shell
+
+        $ hckr data convert -i input.csv.gz -o output.jsonl.zst
+
+    * Files of a directory or glob pattern can be combined into one file, partitions are written as columns
+
+    .. code-block:: shell
+
+        $ hckr data convert -i "output/year=2024/*/*.parquet" -o output-2024.parquet
+
+
+    **Command Reference**:
+    """
+    try:
+        with _open_batches(input, input_format, partitions, batch_size) as (
+            batches,
+            input_format,
+        ):
+            output_format = _format_or_inferred(output_format, output)
+            with BatchWriter(
+                output_format,
+                output,
+                row_group_size=row_group_size,
+                compression=compression.lower(),
+                avro_codec=avro_codec.lower(),
+            ) as writer:
+                for batch in batches:
+                    writer.write(batch)
+                    logging.debug(f"{writer.rows} rows written to {output}")
+        if not writer.written:
+            return
+        success(
+            f"Converted {colored(writer.rows, 'yellow')} rows from {colored(input_format, 'yellow')} "
+            f"to {colored(output_format, 'yellow')} format."
+        )
+        PInfo(output, title="File Output")
     except Exception as e:
         error(
-            f"Some error occurred while reading data {colored(input,'magenta')} in format {colored(format,'yellow')}\n{e}"
+            f"Some error occurred while converting {colored(input, 'magenta')} to {colored(output_format, 'yellow')}\n{e}"
         )
+        exit(1)
+
+
+@data.command()
+@click.argument("query", required=False)
+@click.option(
+    "-i", "--input", help="Input file, directory or glob pattern", required=True
+)
+@click.option(
+    "-f",
+    "--format",
+    help="Input file format, if not provided it gets inferred from file extension",
+    required=False,
+)
+@click.option(
+    "--where",
+    help="Filter rows eg. \"age >= 18 and country in ('IN', 'US')\"",
+    required=False,
+)
+@click.option(
+    "-c",
+    "--count",
+    default=10,
+    type=click.IntRange(min=1),
+    help="Number of result rows to show, [default: 10]",
+    required=False,
+)
+@click.option("-o", "--output", help="Write result to a file", required=False)
+@click.option(
+    "--output-format",
+    help=f"Output file format, Options: {FileFormat.validFormats()} [default: Inferred from file extension]",
+    required=False,
+)
+@click.option(
+    "-b",
+    "--batch-size",
+    default=DEFAULT_BATCH_SIZE,
+    type=click.IntRange(min=1),
+    help=f"Number of rows read at a time, [default: {DEFAULT_BATCH_SIZE}]",
+    required=False,
+)
+@click.option(
+    "--partition",
+    "partitions",
+    multiple=True,
+    help="Only read partition KEY=VALUE of a partitioned dataset eg. 'year=2024', can be repeated",
+)
+def query(
+    query, input, format, where, count, output, output_format, batch_size, partitions
+):
+    """
+    This command filters and aggregates a file ( or a dataset ) using a SQL like QUERY, data is scanned
+    in batches so memory stays flat for any file size
+
+    **Example Usage**:
+
+    * Filter rows using **-\-where** option, filter is pushed down to the scan so Parquet row groups
+      which can't match ( using their min/max statistics ) are skipped
+
+    .. code-block:: shell
+
+        $ hckr data query -i events.parquet --where "ts >= '2024-10-01' and country in ('IN', 'US')"
+
+    * A QUERY can select columns, aggregate ( count, sum, min, max, avg ) by groups, order and limit result
+
+    .. code-block:: shell
+
+        $ hckr data query -i events.parquet "select user, count(*) as events, max(ts) where ts >= '2024-10-01' group by user order by events desc limit 20"
+
+    * Result can be written to a file using **-o** or **-\-output** option, format is inferred from file extension
+
+    .. code-block:: shell
+
+        $ hckr data query -i "logs/*.avro" --where "level = 'ERROR'" -o errors.parquet
+
+
+    **Command Reference**:
+    """
+    try:
+        dataset = _scan_dataset(input, format, partitions)
+        schema = dataset.schema()
+        parsed = parse_query(query, schema) if query else Query()
+        if where:
+            expression = parse_where(where, schema)
+            parsed.where = (
+                expression if parsed.where is None else parsed.where & expression
+            )
+    except QueryError as e:
+        error(f"Invalid query\n{e}")
+        exit(1)
+    except Exception as e:
+        error(f"Some error occurred while reading {colored(input, 'magenta')}\n{e}")
+        exit(1)
+    try:
+        results = run_query(dataset, parsed, batch_size)
+        if output:
+            output_format = _format_or_inferred(output_format, output)
+            with BatchWriter(output_format, output) as writer:
+                for df in results:
+                    writer.write(df)
+            if writer.written:
+                success(
+                    f"{colored(writer.rows, 'yellow')} rows written to {colored(output, 'magenta')} in {colored(output_format, 'yellow')} format."
+                )
+            return
+        frames, rows = [], 0
+        for df in results:
+            frames.append(df)
+            rows += df.shape[0]
+            if rows > count:
+                break  # one more row than shown, rest of the data is not read
+        results.close()
+        df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        print_df_as_table(
+            df.head(count), title="Query Result", count=count, truncated=rows > count
+        )
+    except Exception as e:
+        error(f"Some error occurred while querying {colored(input, 'magenta')}\n{e}")
+        exit(1)
+
+
+def _scan_dataset(path, _format, partitions):
+    # a single file is scanned as a dataset as well, so filters are pushed down to it
+    dataset = _dataset(path, _format, partitions)
+    if dataset is not None:
+        return dataset
+    with open_input(path) as (handle, _):
+        _format = _input_format(_format, handle, path)
+    return Dataset(path, _format)
+
+
+@data.command()
+@click.option(
+    "-i", "--input", help="Input file, directory or glob pattern", required=True
+)
+@click.option(
+    "-f",
+    "--format",
+    help="Input file format, if not provided it gets inferred from file extension",
+    required=False,
+)
+@click.option(
+    "--columns",
+    help="Comma separated columns to profile, [default: all columns]",
+    required=False,
+)
+@click.option(
+    "--quantiles",
+    default=",".join(f"{q:g}" for q in DEFAULT_QUANTILES),
+    help=f"Comma separated approximate quantiles to compute, [default: {','.join(f'{q:g}' for q in DEFAULT_QUANTILES)}]",
+    required=False,
+)
+@click.option(
+    "--metadata",
+    is_flag=True,
+    default=False,
+    help="Only read null counts, min and max from Parquet metadata, without reading any data",
+)
+@click.option(
+    "-b",
+    "--batch-size",
+    default=DEFAULT_BATCH_SIZE,
+    type=click.IntRange(min=1),
+    help=f"Number of rows read at a time, [default: {DEFAULT_BATCH_SIZE}]",
+    required=False,
+)
+@click.option(
+    "--partition",
+    "partitions",
+    multiple=True,
+    help="Only read partition KEY=VALUE of a partitioned dataset eg. 'year=2024', can be repeated",
+)
+def stats(input, format, columns, quantiles, metadata, batch_size, partitions):
+    """
+    This command profiles columns of a file ( or a dataset ): null count, min, max, mean, standard deviation,
+    approximate distinct count and approximate quantiles. Data is read in a single pass of batches, so memory
+    stays flat for any file size
+
+    **Example Usage**:
+
+    * We can profile an input file by providing **-i** or **-\-input** option, distinct counts ( HyperLogLog )
+      and quantiles ( t-digest ) are approximate
+
+    .. code-block:: shell
+
+        $ hckr data stats -i input.avro
+
+    * We can select columns using **-\-columns** option and quantiles using **-\-quantiles** option
+
+    .. code-block:: shell
+
+        $ hckr data stats -i input.csv --columns age,salary --quantiles 0.5,0.9,0.99
+
+    * For Parquet files null counts, min and max are read from column chunk statistics, and with
+      **-\-metadata** option no data is read at all
+
+    .. code-block:: shell
+
+        $ hckr data stats -i events.parquet --metadata
+
+
+    **Command Reference**:
+    """
+    quantiles = _parse_quantiles(quantiles)
+    try:
+        dataset = _scan_dataset(input, format, partitions)
+        schema = dataset.schema()
+        if columns:
+            columns = [c.strip() for c in columns.split(",") if c.strip()]
+            missing = [c for c in columns if c not in schema.names]
+            if missing:
+                error(
+                    f"Columns {colored(missing, 'yellow')} not found, available columns: {colored(schema.names, 'magenta')}"
+                )
+                exit(1)
+            schema = pa.schema([schema.field(c) for c in columns])
+        single_parquet = (
+            not is_dataset(input)
+            and dataset.formats == [str(FileFormat.PARQUET)]
+            and not dataset.others  # compressed, it's not scanned
+        )
+        known = {}
+        if single_parquet:
+            rows, known = parquet_statistics(input)
+        if metadata:
+            if not single_parquet:
+                error(
+                    "--metadata option is only supported for an uncompressed Parquet file"
+                )
+                exit(1)
+            df = pd.DataFrame(
+                [
+                    {
+                        "column": field.name,
+                        "type": str(field.type),
+                        "count": (
+                            rows - known[field.name]["nulls"]
+                            if field.name in known
+                            else None
+                        ),
+                        **known.get(
+                            field.name, {"nulls": None, "min": None, "max": None}
+                        ),
+                    }
+                    for field in schema
+                ]
+            )
+        else:
+            df = column_stats(
+                dataset.tables(batch_size, columns=schema.names),
+                schema,
+                quantiles,
+                known,
+            )
+        print_df_as_table(
+            df, title="Column Stats", count=df.shape[0], col_count=df.shape[1]
+        )
+    except Exception as e:
+        error(f"Some error occurred while profiling {colored(input, 'magenta')}\n{e}")
+        exit(1)
+
+
+def _parse_quantiles(value):
+    try:
+        quantiles = [float(q) for q in value.split(",") if q.strip()]
+    except ValueError:
+        quantiles = None
+    if not quantiles or any(not 0 <= q <= 1 for q in quantiles):
+        error(
+            f"Invalid quantiles {colored(value, 'yellow')}, please use comma separated numbers between 0 and 1 eg. 0.5,0.9"
+        )
+        exit(1)
+    return quantiles
+
+
+@data.group(
+    short_help="Cached columnar copies of CSV / JSON files",
+    context_settings={"help_option_names": ["-h", "--help"]},
+)
+def cache():
+    """
+    Data cache is disabled by default, once it's enabled using ``HCKR_DATA_CACHE=on`` environment variable or
+    ``data_cache`` in ``DEFAULT`` config, first read of a whole CSV / JSON file ( of at least 1 MB ) stores a columnar
+    ( Feather ) copy of it in ``~/.cache/hckr/data``, later reads of the file read the copy instead. Reading only first
+    rows ( eg. ``data peek``) uses an existing copy but doesn't create one.
+    A copy is used only if path, size, modification time and first bytes of the file are unchanged ( and file is read
+    with same format and delimiter ), files larger than ``data_cache_max_size_mb`` ( 4096 MB by default ) are not
+    cached, and least recently used copies are removed when cache grows larger than it.
+
+    **Example Usage**:
+
+    .. code-block:: shell
+
+        $ hckr config set data_cache on
+        $ hckr data convert -i incident.csv -o incident.parquet
+        $ hckr data peek -i incident.csv
+    """
+    pass
+
+
+@cache.command("ls")
+def cache_ls():
+    """
+    This command lists cached copies of files, most recently used first
+
+    **Example Usage**:
+
+    .. code-block:: shell
+
+        $ hckr data cache ls
+
+    **Command Reference**:
+    """
+    entries = CacheUtils.entries()
+    if not entries:
+        info(f"Data cache {colored(CacheUtils.CACHE_DIR, 'yellow')} is empty")
+        return
+    df = pd.DataFrame(
+        [
+            {
+                "file": entry["source"],
+                "format": entry["format"],
+                "rows": entry["rows"],
+                "file size": human_readable_size(entry["size"]),
+                "cache size": human_readable_size(entry["cache_size"]),
+                "last used": CacheUtils.last_used(entry),
+            }
+            for entry in entries
+        ]
+    )
+    total = sum(entry["cache_size"] for entry in entries)
+    print_df_as_table(
+        df,
+        title=f"Data Cache ( {human_readable_size(total)} of {human_readable_size(CacheUtils.cache_max_size())} )",
+        count=df.shape[0],
+        col_count=df.shape[1],
+    )
+    if not CacheUtils.cache_enabled():
+        warning(
+            "Data cache is disabled, please enable it using `hckr config set data_cache on`"
+        )
+
+
+@cache.command("clear")
+def cache_clear():
+    """
+    This command removes all cached copies of files
+
+    **Example Usage**:
+
+    .. code-block:: shell
+
+        $ hckr data cache clear
+
+    **Command Reference**:
+    """
+    removed, freed = CacheUtils.clear()
+    success(
+        f"Removed {colored(removed, 'yellow')} cached files, freed {colored(human_readable_size(freed), 'yellow')}"
+    )
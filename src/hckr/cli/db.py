@@ -2,11 +2,10 @@ import warnings
 
 import click
 from sqlalchemy.exc import SAWarning
-from yaspin import yaspin  # type: ignore
 
 from hckr.cli.config import common_config_options
 from hckr.utils.DbUtils import get_db_url, execute_query
-from hckr.utils.MessageUtils import PError
+from hckr.utils.MessageUtils import PError, spinner
 
 # Suppress the specific SQLAlchemy warning
 warnings.filterwarnings("ignore", category=SAWarning, message=".*flatten.*")
@@ -79,6 +78,6 @@ def query(ctx, config, config_path, query, num_rows=None, num_cols=None):
     db_url = get_db_url(section=config, config_path=config_path)
     if not db_url:
         PError("Database credentials are not properly configured.")
-    with yaspin(text="Running query...", color="green", timer=True) as spinner:
+    with spinner("Running query...") as _spinner:
         execute_query(db_url, query, num_rows, num_cols)
-        spinner.ok("✔")
+        _spinner.ok("✔")
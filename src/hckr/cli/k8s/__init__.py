@@ -1,5 +1,7 @@
 import click
 
+from ...utils.CliUtils import LazyGroup
+
 
 def common_k8s_options(func):
     func = click.option(
@@ -11,6 +13,12 @@ def common_k8s_options(func):
 
 
 @click.group(
+    cls=LazyGroup,
+    lazy_subcommands={
+        "context": "hckr.cli.k8s.context.context",
+        "namespace": "hckr.cli.k8s.namespace.namespace",
+        "pod": "hckr.cli.k8s.pod.pod",
+    },
     help="Kubernetes commands",
     context_settings={"help_option_names": ["-h", "--help"]},
 )
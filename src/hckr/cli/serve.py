@@ -0,0 +1,55 @@
+import socket
+
+import click
+
+from ..utils.MessageUtils import PError, PInfo
+from ..utils.ServeUtils import socket_path, serve as serve_forever
+
+
+@click.command(short_help="Run hckr server for the thin client hckrc")
+@click.option(
+    "-s",
+    "--socket",
+    "socket_file",
+    help="Unix socket path, [default: ``$HCKR_SOCKET`` or ``~/.cache/hckr/hckr.sock``]",
+)
+def serve(socket_file):
+    """
+    This command starts a long living hckr server, which keeps all commands loaded and runs commands sent by
+    the thin client ``hckrc``. This makes repeated invocations of hckr ( eg. in scripts ) much faster.
+
+    **Example Usage**:
+
+    * Start the server in background
+
+    .. code-block:: shell
+
+        $ hckr serve &
+
+    * Now use ``hckrc`` in place of ``hckr``, it accepts the same commands and options
+
+    .. code-block:: shell
+
+        $ hckrc hash md5 -s hckr
+
+    .. tip::
+       If server is not running ``hckrc`` runs the command itself, same as ``hckr``.
+       Use ``HCKR_SOCKET`` environment variable or ``-s/--socket`` option to use a different socket.
+
+    **Command Reference**:
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        PError(
+            "hckr serve needs unix sockets, which are not supported on this platform"
+        )
+    from hckr.cli import cli
+
+    path = socket_file or socket_path()
+    PInfo(f"hckr server listening on [magenta]{path}", title="[blue]hckr serve")
+    try:
+        serve_forever(path, cli)
+    except RuntimeError as e:
+        PError(str(e))
+    except KeyboardInterrupt:
+        pass
+    PInfo("hckr server stopped", title="[blue]hckr serve")
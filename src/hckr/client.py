@@ -0,0 +1,23 @@
+# SPDX-FileCopyrightText: 2024-present Ashish Patel <ashishpatel0720@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+import sys
+
+from hckr.utils.ServeUtils import run_remote
+
+
+def main():
+    """
+    Thin client ``hckrc`` for ``hckr serve``, runs a command on the server if it is running,
+    otherwise falls back to running it in this process ( same as ``hckr`` ).
+    """
+    exit_code = run_remote(sys.argv[1:])
+    if exit_code is None:
+        from hckr.cli import cli
+
+        return cli(prog_name="hckr")
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
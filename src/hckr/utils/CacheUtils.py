@@ -0,0 +1,202 @@
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+
+from hckr.utils.config.ConfigUtils import get_default_setting
+from hckr.utils.config.Constants import (
+    DATA_CACHE,
+    DATA_CACHE_DEFAULT_MAX_SIZE_MB,
+    DATA_CACHE_DIR,
+    DATA_CACHE_ENV,
+    DATA_CACHE_MAX_SIZE_MB,
+    DATA_CACHE_MAX_SIZE_MB_ENV,
+)
+
+CACHE_DIR = DATA_CACHE_DIR
+# smaller files are parsed fast enough, caching them only churns the cache
+MIN_CACHED_FILE_SIZE = 1024 * 1024
+HASH_PREFIX_SIZE = 64 * 1024
+CACHE_EXTENSION = ".arrow"
+METADATA_EXTENSION = ".json"
+
+
+def cache_enabled():
+    enabled = get_default_setting(DATA_CACHE, DATA_CACHE_ENV, "off")
+    return str(enabled).strip().lower() in ("on", "true", "yes", "1")
+
+
+def cache_max_size():
+    """Maximum size of the cache in bytes"""
+    size = get_default_setting(
+        DATA_CACHE_MAX_SIZE_MB,
+        DATA_CACHE_MAX_SIZE_MB_ENV,
+        DATA_CACHE_DEFAULT_MAX_SIZE_MB,
+    )
+    try:
+        return float(size) * 1024 * 1024
+    except ValueError:
+        logging.debug(f"Invalid {DATA_CACHE_MAX_SIZE_MB}={size}, using default")
+        return DATA_CACHE_DEFAULT_MAX_SIZE_MB * 1024 * 1024
+
+
+def cache_source(FILE):
+    """
+    Path of a file which can be cached, a path or an open file ( its name ) of at least ``MIN_CACHED_FILE_SIZE`` bytes,
+    ``None`` if cache is disabled or the file is larger than the cache ( its copy would be evicted right away )
+    """
+    if not cache_enabled():
+        return None
+    path = FILE if isinstance(FILE, (str, os.PathLike)) else getattr(FILE, "name", None)
+    if not isinstance(path, (str, os.PathLike)) or not os.path.isfile(path):
+        return None
+    size = os.path.getsize(path)
+    if size < MIN_CACHED_FILE_SIZE or size > cache_max_size():
+        return None
+    return os.path.abspath(path)
+
+
+def cache_key(path, options=()):
+    """
+    Key of a file version read with ``options`` ( eg. format and delimiter ): path, size, modification time and
+    hash of its first bytes
+    """
+    stat = os.stat(path)
+    digest = hashlib.sha256(
+        f"{os.path.abspath(path)}\0{stat.st_size}\0{stat.st_mtime_ns}\0{list(options)}\0".encode()
+    )
+    with open(path, "rb") as f:
+        digest.update(f.read(HASH_PREFIX_SIZE))
+    return digest.hexdigest()[:32]
+
+
+def _cache_path(key):
+    return Path(CACHE_DIR) / f"{key}{CACHE_EXTENSION}"
+
+
+def _metadata_path(key):
+    return Path(CACHE_DIR) / f"{key}{METADATA_EXTENSION}"
+
+
+def cached_file(path, options=()):
+    """Columnar ( Feather ) copy of current version of a file read with ``options``, ``None`` if it's not cached"""
+    cached = _cache_path(cache_key(path, options))
+    if not cached.exists():
+        return None
+    try:
+        os.utime(cached)  # last used, for LRU eviction
+    except OSError as e:
+        logging.debug(f"Unable to update last used time of {cached}\n{e}")
+    return cached
+
+
+def store(path, _format, write, options=()):
+    """
+    Store columnar ( Feather ) copy of a file read with ``options``, ``write(output)`` writes the copy and returns
+    its number of rows. Older copies of the file are removed and least recently used copies are evicted to keep the
+    cache under its maximum size. Returns path of the copy, ``None`` if it can't be written ( eg. mixed types in a
+    column ) or is larger than the cache.
+    """
+    key = cache_key(path, options)
+    cached = _cache_path(key)
+    cached.parent.mkdir(parents=True, exist_ok=True)
+    # write and rename, so a concurrent hckr never reads a partial file
+    tmp_path = cached.with_name(f"{cached.name}.{os.getpid()}.tmp")
+    try:
+        rows = write(tmp_path)
+        if not tmp_path.exists():
+            return None  # no rows
+        if tmp_path.stat().st_size > cache_max_size():
+            logging.debug(f"Columnar copy of {path} is larger than the cache")
+            tmp_path.unlink()
+            return None
+        os.replace(tmp_path, cached)
+    except Exception as e:
+        logging.debug(f"Unable to cache {path}\n{e}")
+        tmp_path.unlink(missing_ok=True)
+        return None
+    options = list(options)
+    _remove_entries(
+        lambda entry: entry["source"] == path and entry.get("options") == options
+    )
+    stat = os.stat(path)
+    metadata = {
+        "source": path,
+        "format": str(_format),
+        "options": options,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "rows": rows,
+    }
+    with open(_metadata_path(key), "w") as metadata_file:
+        json.dump(metadata, metadata_file)
+    evict(cache_max_size())
+    return cached if cached.exists() else None
+
+
+def entries():
+    """Cached copies with their source file, format, rows, size and last used time, most recently used first"""
+    cached = []
+    for cache_path in Path(CACHE_DIR).glob(f"*{CACHE_EXTENSION}"):
+        metadata_path = cache_path.with_suffix(METADATA_EXTENSION)
+        try:
+            with open(metadata_path) as metadata_file:
+                entry = json.load(metadata_file)
+            stat = cache_path.stat()
+        except (OSError, ValueError) as e:
+            logging.debug(f"Invalid cache entry {cache_path}\n{e}")
+            continue
+        entry.update(
+            key=cache_path.stem,
+            cache_size=stat.st_size,
+            last_used=stat.st_mtime,
+        )
+        cached.append(entry)
+    return sorted(cached, key=lambda entry: entry["last_used"], reverse=True)
+
+
+def _remove(key):
+    removed = 0
+    for path in (_cache_path(key), _metadata_path(key)):
+        try:
+            removed += path.stat().st_size
+            path.unlink()
+        except FileNotFoundError:
+            pass
+    return removed
+
+
+def _remove_entries(matches):
+    for entry in entries():
+        if matches(entry):
+            _remove(entry["key"])
+
+
+def evict(max_size):
+    """Remove least recently used copies till cache is at most ``max_size`` bytes, returns number of removed copies"""
+    cached = entries()
+    total = sum(entry["cache_size"] for entry in cached)
+    removed = 0
+    while cached and total > max_size:
+        entry = cached.pop()  # least recently used
+        logging.debug(f"Evicting cached copy of {entry['source']}")
+        _remove(entry["key"])
+        total -= entry["cache_size"]
+        removed += 1
+    return removed
+
+
+def clear():
+    """Remove all cached copies, returns number of removed copies and bytes freed"""
+    cached = entries()
+    freed = sum(_remove(entry["key"]) for entry in cached)
+    for tmp_path in Path(CACHE_DIR).glob("*.tmp"):  # left by an interrupted write
+        freed += tmp_path.stat().st_size
+        tmp_path.unlink()
+    return len(cached), freed
+
+
+def last_used(entry):
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(entry["last_used"]))
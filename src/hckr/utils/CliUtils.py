@@ -1,15 +1,37 @@
+import importlib
+import json
 import logging
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
 
-import requests
-import rich
+import click
 from packaging import version
-from rich.panel import Panel
 
-from .MessageUtils import colored, success, warning
-from .config.Constants import SENTRY_DSN
+from .MessageUtils import colored, success, warning, PInfo
+from .config.ConfigUtils import get_default_setting
+from .config.Constants import (
+    SENTRY_DSN,
+    SENTRY_FLUSH_TIMEOUT,
+    SENTRY_PROFILES_SAMPLE_RATE,
+    SENTRY_PROFILES_SAMPLE_RATE_ENV,
+    SENTRY_TRACES_SAMPLE_RATE,
+    SENTRY_TRACES_SAMPLE_RATE_ENV,
+    TELEMETRY,
+    TELEMETRY_ENV,
+    UPDATE_CHECK_STATE_PATH,
+    UPDATE_CHECK_TTL,
+    UPDATE_CHECK_TTL_ENV,
+    UPDATE_CHECK_DEFAULT_TTL,
+    UPDATE_CHECK_TIMEOUT,
+)
 from ..__about__ import __version__
 import platform
 
+PYPI_URL = "https://pypi.org/pypi/hckr/json"
+
 
 LOGGING_LEVELS = {
     0: logging.NOTSET,
@@ -29,14 +51,122 @@ class Info:
         self.verbose = 0
 
 
-def check_latest_version():
-    current_version = __version__
+class LazyGroup(click.Group):
+    """
+    A click group which registers subcommands by name and imports their modules only when they are invoked,
+    ``lazy_subcommands`` maps a command name to the ``module.path.command_object`` implementing it.
+    """
+
+    def __init__(self, *args, lazy_subcommands=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = lazy_subcommands or {}
+
+    def list_commands(self, ctx):
+        base = super().list_commands(ctx)
+        return sorted(set(base) | set(self.lazy_subcommands))
+
+    def get_command(self, ctx, cmd_name):
+        if cmd_name in self.lazy_subcommands and cmd_name not in self.commands:
+            self.add_command(self._lazy_load(cmd_name), cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def _lazy_load(self, cmd_name):
+        import_path = self.lazy_subcommands[cmd_name]
+        module_name, cmd_object_name = import_path.rsplit(".", 1)
+        logging.debug(f"Lazy loading command '{cmd_name}' from {import_path}")
+        module = importlib.import_module(module_name)
+        cmd_object = getattr(module, cmd_object_name)
+        if not isinstance(cmd_object, click.Command):
+            raise ValueError(
+                f"Lazy loading of {import_path} failed, it is not a click command"
+            )
+        return cmd_object
+
+
+def _read_update_state(state_path=UPDATE_CHECK_STATE_PATH):
+    try:
+        with open(state_path, "r") as state_file:
+            return json.load(state_file)
+    except (OSError, ValueError) as e:
+        logging.debug(f"Unable to read update check state {state_path}\n{e}")
+        return {}
+
+
+def _write_update_state(state, state_path=UPDATE_CHECK_STATE_PATH):
     try:
-        # latest stable version
-        response = requests.get("https://pypi.org/pypi/hckr/json")
+        state_path.parent.mkdir(parents=True, exist_ok=True)
+        # write and rename, so a concurrent hckr never reads a partial file
+        tmp_path = state_path.with_name(f"{state_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w") as state_file:
+            json.dump(state, state_file)
+        os.replace(tmp_path, state_path)
+    except OSError as e:
+        logging.debug(f"Unable to write update check state {state_path}\n{e}")
+
+
+def _update_check_ttl():
+    ttl = get_default_setting(
+        UPDATE_CHECK_TTL, UPDATE_CHECK_TTL_ENV, UPDATE_CHECK_DEFAULT_TTL
+    )
+    try:
+        return float(ttl)
+    except ValueError:
+        logging.debug(f"Invalid {UPDATE_CHECK_TTL}={ttl}, using default")
+        return UPDATE_CHECK_DEFAULT_TTL
+
+
+def fetch_latest_version(state_path=UPDATE_CHECK_STATE_PATH, url=PYPI_URL):
+    """Fetch latest stable version from PyPi and save it in update check state."""
+    import requests
+
+    try:
+        response = requests.get(url, timeout=UPDATE_CHECK_TIMEOUT)
         latest_version = response.json()["info"]["version"]
+        _write_update_state(
+            {"last_checked": time.time(), "latest_version": latest_version},
+            Path(state_path),
+        )
+    except (requests.RequestException, ValueError, KeyError) as e:
+        logging.debug(f"Unable to fetch latest version from {url}\n{e}")
+
+
+_FETCH_LATEST_VERSION = (
+    "import sys; from hckr.utils.CliUtils import fetch_latest_version; "
+    "fetch_latest_version(sys.argv[1], sys.argv[2])"
+)
+
+
+def _refresh_in_background(state_path):
+    # a detached process outlives hckr, a short command exits long before the fetch finishes
+    return subprocess.Popen(
+        [sys.executable, "-c", _FETCH_LATEST_VERSION, str(state_path), PYPI_URL],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+def check_latest_version(state_path=UPDATE_CHECK_STATE_PATH):
+    """
+    Returns whether a new version is available using the cached latest version,
+    cache is refreshed in background if it is older than the TTL, at most once per TTL.
+    """
+    current_version = __version__
+    ttl = _update_check_ttl()
+    if ttl <= 0:
+        return False, current_version
+    state = _read_update_state(state_path)
+    if time.time() - state.get("last_checked", 0) >= ttl:
+        # attempt is recorded before fetching, so unreachable PyPi (air-gapped machines) is retried only after TTL
+        _write_update_state({**state, "last_checked": time.time()}, state_path)
+        _refresh_in_background(state_path)
+    latest_version = state.get("latest_version")
+    if not latest_version:
+        return False, current_version
+    try:
         return is_new_version_available(current_version, latest_version), latest_version
-    except requests.RequestException:
+    except version.InvalidVersion:
         return False, current_version
 
 
@@ -56,21 +186,15 @@ def check_update(show_no_update=False):
         warning(
             f"Info: Update available {colored(__version__, 'magenta')} ->  {colored(latest_version, 'green')}"
         )
-        rich.print(
-            Panel(
-                "pip install --upgrade hckr",
-                expand=False,
-                title="Run to upgrade using Pip",
-            )
+        PInfo(
+            "pip install --upgrade hckr", title="Run to upgrade using Pip", expand=False
         )
         # only show this on MacOs
         if platform.system() == "Darwin":
-            rich.print(
-                Panel(
-                    "brew update && brew upgrade hckr",
-                    expand=False,
-                    title="Run to upgrade using Homebrew",
-                )
+            PInfo(
+                "brew update && brew upgrade hckr",
+                title="Run to upgrade using Homebrew",
+                expand=False,
             )
     elif show_no_update:
         success(
@@ -78,16 +202,60 @@ def check_update(show_no_update=False):
         )
 
 
-def sentry_init():
+def telemetry_enabled():
+    telemetry = get_default_setting(TELEMETRY, TELEMETRY_ENV, "on")
+    return str(telemetry).strip().lower() not in ("off", "false", "no", "0")
+
+
+def _sample_rate(key, env_var):
+    rate = get_default_setting(key, env_var, 0.0)
+    try:
+        return min(max(float(rate), 0.0), 1.0)
+    except ValueError:
+        logging.debug(f"Invalid {key}={rate}, disabling it")
+        return 0.0
+
+
+def _sentry_sdk_init(traces_sample_rate, profiles_sample_rate):
     import sentry_sdk
 
     sentry_sdk.init(
         dsn=SENTRY_DSN,
-        # Set traces_sample_rate to 1.0 to capture 100%
-        # of transactions for tracing.
-        traces_sample_rate=1.0,
-        # Set profiles_sample_rate to 1.0 to profile 100%
-        # of sampled transactions.
-        # We recommend adjusting this value in production.
-        profiles_sample_rate=1.0,
+        traces_sample_rate=traces_sample_rate,
+        profiles_sample_rate=profiles_sample_rate,
+    )
+    return sentry_sdk
+
+
+def _sentry_excepthook(previous_hook):
+    def hook(exc_type, exc_value, exc_traceback):
+        if not issubclass(exc_type, KeyboardInterrupt):
+            try:
+                sentry_sdk = _sentry_sdk_init(0.0, 0.0)
+                sentry_sdk.capture_exception((exc_type, exc_value, exc_traceback))
+                sentry_sdk.flush(timeout=SENTRY_FLUSH_TIMEOUT)
+            except Exception as e:
+                logging.debug(f"Unable to report error to sentry\n{e}")
+        previous_hook(exc_type, exc_value, exc_traceback)
+
+    return hook
+
+
+def sentry_init():
+    """
+    Sentry is initialised at start only when tracing or profiling is sampled,
+    otherwise it is initialised lazily to report an unhandled exception.
+    """
+    if not telemetry_enabled():
+        logging.debug("Telemetry is disabled")
+        return
+    traces_sample_rate = _sample_rate(
+        SENTRY_TRACES_SAMPLE_RATE, SENTRY_TRACES_SAMPLE_RATE_ENV
+    )
+    profiles_sample_rate = _sample_rate(
+        SENTRY_PROFILES_SAMPLE_RATE, SENTRY_PROFILES_SAMPLE_RATE_ENV
     )
+    if traces_sample_rate > 0 or profiles_sample_rate > 0:
+        _sentry_sdk_init(traces_sample_rate, profiles_sample_rate)
+    else:
+        sys.excepthook = _sentry_excepthook(sys.excepthook)
@@ -1,27 +1,67 @@
+import contextlib
+import datetime
+import decimal
+import io
+import itertools
+import json
 import logging
+import multiprocessing
+import os
+import re
+import shutil
+import sys
 
+import click
 import fastavro
+import numpy as np
 import pandas as pd
+import pyarrow as pa  # type: ignore
 import rich
 from pyarrow import parquet as pq  # type: ignore
 from rich.table import Table
 import csv
-from hckr.utils.FileUtils import FileFormat
-from hckr.utils.MessageUtils import error, colored, warning, info
+from hckr.utils.FileUtils import (
+    FileFormat,
+    validate_file_extension,
+    DETECT_SIZE,
+    split_compression,
+    open_compressed,
+)
+from hckr.utils.MessageUtils import error, colored, warning, info, output_format
+from hckr.utils import CacheUtils
 
 COMMA = ","
+DEFAULT_BATCH_SIZE = 50_000
+DEFAULT_COL_COUNT = 10  # columns shown by print_df_as_table
+MAX_CELL_LENGTH = 256  # longer cells are truncated by print_df_as_table
+DEFAULT_PARQUET_COMPRESSION = "snappy"
+PARQUET_COMPRESSIONS = ["none", "snappy", "gzip", "brotli", "lz4", "zstd"]
+DEFAULT_AVRO_CODEC = "null"
+AVRO_CODECS = ["null", "deflate", "bzip2", "xz", "snappy", "zstandard", "lz4"]
 
 
-def safe_faker_method(faker_instance, method_name, *args):
-    """Safely get the Faker method by name and execute it with arguments."""
-    if hasattr(faker_instance, method_name):
-        method = getattr(faker_instance, method_name)
-        return method(*args)
-    else:
-        raise ValueError(f"No such Faker method: {method_name}")
-
-
-def print_df_as_table(df, title="Data Sample", count=3, col_count=10):
+def print_df_as_table(
+    df,
+    title="Data Sample",
+    count=3,
+    col_count=DEFAULT_COL_COUNT,
+    total_rows=None,
+    truncated=False,
+    total_columns=None,
+):
+    """
+    Print top ``count`` rows of a DataFrame, ``total_rows`` is shown as row count if only a sample is passed,
+    or ``truncated`` if DataFrame is only first rows of the data and total is unknown.
+    Similarly ``total_columns`` is shown as column count if only some columns are passed.
+    With global ``--output`` option the same rows and columns are printed as records.
+    """
+    if output_format():
+        print_df(df.iloc[:count, :col_count], output_format())
+        return
+    if total_rows is None:
+        total_rows = df.shape[0]
+    if total_columns is None:
+        total_columns = df.shape[1]
     ROWS_TO_SHOW = min(count, df.shape[0])
     COLS_TO_SHOW = min(col_count, df.shape[1])
     table = Table(
@@ -34,26 +74,123 @@ def print_df_as_table(df, title="Data Sample", count=3, col_count=10):
     table.border_style = "yellow"
     for column in df.columns[:COLS_TO_SHOW]:
         table.add_column(column, no_wrap=False, overflow="fold")
-    msg = f"Data has total {colored(df.shape[0], 'yellow')} rows and {colored(df.shape[1], 'yellow')} columns, showing first {colored(ROWS_TO_SHOW, 'yellow')} rows"
-    if len(df.columns) > col_count:
+    if truncated:
+        rows_msg = f"more than {colored(count, 'yellow')} rows"
+    else:
+        rows_msg = f"total {colored(total_rows, 'yellow')} rows"
+    msg = f"Data has {rows_msg} and {colored(total_columns, 'yellow')} columns, showing first {colored(ROWS_TO_SHOW, 'yellow')} rows"
+    if total_columns > col_count:
         warning(f"{msg} and {colored(COLS_TO_SHOW, 'yellow')} columns")
     else:
         info(msg)
-    # Add rows to the table
-    for index, row in df.head(count).iterrows():
-        # Convert each row to string format, necessary to handle different data types
-        table.add_row(*[str(item) for item in row.values[:col_count]])
+    for row in _format_cells(df.iloc[:count, :col_count]):
+        table.add_row(*row)
     rich.print(table)
 
 
+def _json_value(value):
+    # values json can't serialise, dates and times are written in ISO format
+    if isinstance(value, (datetime.date, datetime.time, pd.Timedelta)):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (np.ndarray, tuple)):
+        return list(value)
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+    return str(value)
+
+
+def _json_records(df):
+    """
+    Rows of a DataFrame as JSON objects, floats are written with all their digits ( pandas ``to_json`` keeps
+    only 10 ) and missing or infinite values are null
+    """
+    missing = df.isna()
+    for column in df.columns[[pd.api.types.is_float_dtype(t) for t in df.dtypes]]:
+        missing[column] |= df[column].isin([np.inf, -np.inf]).fillna(False)
+    df = df.astype(object).where(~missing, None)
+    for record in df.to_dict(orient="records"):
+        yield json.dumps(record, default=_json_value, separators=(",", ":"))
+
+
+def print_df(df, _format, header=True):
+    """
+    Print a DataFrame to stdout as records, used for global ``--output`` option. A stream of DataFrames
+    ( eg. rows of a followed file ) has CSV ``header`` only before its first DataFrame.
+    """
+    if _format == "json":
+        click.echo("[" + ",".join(_json_records(df)) + "]")
+    elif _format == "jsonl":
+        for record in _json_records(df):
+            click.echo(record)
+    elif _format == "csv":
+        df.to_csv(sys.stdout, index=False, header=header)
+    else:
+        df.to_csv(
+            sys.stdout,
+            sep="\t",
+            header=False,
+            index=False,
+            quoting=csv.QUOTE_NONE,
+            escapechar="\\",
+        )
+
+
+def _format_cells(df):
+    """Visible block of a DataFrame as rows of strings, converted column-wise with long cells truncated"""
+    columns = []
+    for index in range(df.shape[1]):
+        column = df.iloc[:, index]
+        values = column.astype(str)
+        # string dtype keeps missing values, show them as str() would
+        missing = values.isna()
+        if missing.any():
+            values = values.where(~missing, column[missing].map(str))
+        too_long = values.str.len() > MAX_CELL_LENGTH
+        if too_long.any():
+            values = values.where(
+                ~too_long, values.str.slice(0, MAX_CELL_LENGTH - 1) + "…"
+            )
+        columns.append(values.to_numpy(dtype=object))
+    return list(zip(*columns))
+
+
+def _rewind(FILE):
+    # readers accept a path or an open binary file, which could have been read already
+    if hasattr(FILE, "seek"):
+        FILE.seek(0)
+
+
+@contextlib.contextmanager
+def _open_binary(FILE):
+    """Open a file path, or rewind an already open binary file which is left open"""
+    if hasattr(FILE, "read"):
+        FILE.seek(0)
+        yield FILE
+    else:
+        with open(FILE, "rb") as f:
+            yield f
+
+
+def _head(FILE, size):
+    # peek doesn't move file position, so an open file can be passed to a reader as it is
+    with _open_binary(FILE) as f:
+        return f.peek(size)[:size] if hasattr(f, "peek") else f.read(size)
+
+
 # Try to read as simple JSON if there is an Error then tries as json lines
 def readJSON(_file):
     try:
+        _rewind(_file)
         return pd.read_json(_file)
     except Exception as e:
         logging.debug(
             f"Error occurred while reading as JSON Object\n{e}\nTrying as JSON Lines"
         )
+        _rewind(_file)
         df = pd.read_json(_file, lines=True)
         info(f"Data is in {colored('JSON Lines', 'yellow')} format")
         return df
@@ -61,41 +198,1097 @@ def readJSON(_file):
 
 def sniffCsvDelimiter(path):
     try:
-        with open(path, mode="r") as csvfile:
-            # Sniff the first 1024 bytes to find the dialect
-            sample = csvfile.read(2048)
-            dialect = csv.Sniffer().sniff(sample)
-            logging.debug(f"Delimiter => [{dialect.delimiter}]")
-            return dialect.delimiter
+        # Sniff the first 2048 bytes to find the dialect
+        sample = _head(path, 2048).decode("utf-8", errors="ignore")
+        dialect = csv.Sniffer().sniff(sample)
+        logging.debug(f"Delimiter => [{dialect.delimiter}]")
+        return dialect.delimiter
     except Exception as e:
         logging.debug(f"Error occured while sniffing delimiter\n{e}")
         return COMMA
 
 
-def readFile(_format, FILE):
+def is_json_array(path):
+    """JSON file is an array of records, otherwise it's read as JSON lines"""
+    return _head(path, DETECT_SIZE).lstrip().startswith(b"[")
+
+
+def _readJSONHead(_file, nrows):
+    # a JSON array can only be parsed as a whole, JSON lines are read till first nrows lines
+    if is_json_array(_file):
+        _rewind(_file)
+        return pd.read_json(_file).head(nrows)
+    _rewind(_file)
+    df = pd.read_json(_file, lines=True, nrows=nrows)
+    info(f"Data is in {colored('JSON Lines', 'yellow')} format")
+    return df
+
+
+def _arrowHead(batches, schema, nrows, columns=None):
+    # batches are read lazily, so only batches needed for first nrows rows are read
+    if columns is not None:
+        schema = pa.schema([schema.field(column) for column in columns])
+    selected, rows = [], 0
+    for batch in batches:
+        selected.append(batch)
+        rows += batch.num_rows
+        if nrows is not None and rows >= nrows:
+            break
+    table = pa.Table.from_batches(selected, schema=schema)
+    return (table if nrows is None else table.slice(0, nrows)).to_pandas()
+
+
+def _readParquetHead(path, nrows, columns=None):
+    parquet_file = pq.ParquetFile(path)
+    batches = parquet_file.iter_batches(batch_size=nrows, columns=columns)
+    return _arrowHead(batches, parquet_file.schema_arrow, nrows, columns)
+
+
+@contextlib.contextmanager
+def _arrow_source(FILE):
+    """
+    Memory map a file path, so Arrow IPC ( Feather ) batches are read without copying, and only pages
+    of batches / columns which are used are read from disk. An open binary file is used as it is.
+    Data must be converted ( eg. to pandas ) before the map is closed.
+    """
+    if hasattr(FILE, "read"):
+        FILE.seek(0)
+        yield FILE
+    else:
+        with pa.memory_map(str(FILE), "r") as source:
+            yield source
+
+
+def _feather_batches(reader, columns=None):
+    for index in range(reader.num_record_batches):
+        batch = reader.get_batch(index)
+        yield batch if columns is None else batch.select(columns)
+
+
+def _readFeather(FILE, nrows=None, columns=None):
+    with _arrow_source(FILE) as source:
+        reader = pa.ipc.open_file(source)
+        return _arrowHead(
+            _feather_batches(reader, columns), reader.schema, nrows, columns
+        )
+
+
+def _orc_file(FILE):
+    from pyarrow import orc  # type: ignore
+
+    _rewind(FILE)
+    return orc.ORCFile(FILE)
+
+
+def _orc_batches(orc_file, columns=None):
+    for index in range(orc_file.nstripes):
+        stripe = orc_file.read_stripe(index, columns=columns)
+        yield stripe if columns is None else stripe.select(columns)  # in given order
+
+
+def _readOrc(FILE, nrows=None, columns=None):
+    # ORC is read stripe by stripe, so only stripes needed for first nrows rows are read
+    orc_file = _orc_file(FILE)
+    return _arrowHead(_orc_batches(orc_file, columns), orc_file.schema, nrows, columns)
+
+
+def _rebatch(batches, batch_size):
+    # record batches / stripes of a file can be of any size, so they are sliced to batch_size rows
+    for batch in batches:
+        for offset in range(0, batch.num_rows, batch_size):
+            yield batch.slice(offset, batch_size).to_pandas()
+
+
+def _avro_reader(f, columns=None):
+    # reader schema with only given fields, so fastavro skips decoding the rest
+    if columns is None:
+        return fastavro.reader(f)
+    writer_schema = fastavro.reader(f).writer_schema
+    f.seek(0)
+    fields = {field["name"]: field for field in writer_schema["fields"]}
+    missing = [column for column in columns if column not in fields]
+    if missing:
+        raise ValueError(f"Columns {missing} not found in Avro schema")
+    reader_schema = dict(writer_schema, fields=[fields[column] for column in columns])
+    return fastavro.reader(f, reader_schema=reader_schema)
+
+
+def readColumns(_format, FILE):
+    """
+    Column names of a file read from its header / schema only, ``None`` for formats which need data
+    to be parsed to know columns eg. JSON
+    """
+    _rewind(FILE)
+    if _format == FileFormat.TXT:
+        return list(pd.read_csv(FILE, nrows=0).columns)
+    elif _format == FileFormat.CSV:
+        return list(pd.read_csv(FILE, sep=sniffCsvDelimiter(FILE), nrows=0).columns)
+    elif _format == FileFormat.EXCEL:
+        return list(pd.read_excel(FILE, engine="openpyxl", nrows=0).columns)
+    elif _format == FileFormat.PARQUET:
+        return pq.read_schema(FILE).names
+    elif _format == FileFormat.AVRO:
+        with _open_binary(FILE) as f:
+            return [
+                field["name"] for field in fastavro.reader(f).writer_schema["fields"]
+            ]
+    elif _format == FileFormat.FEATHER:
+        with _arrow_source(FILE) as source:
+            return pa.ipc.open_file(source).schema.names
+    elif _format == FileFormat.ORC:
+        return _orc_file(FILE).schema.names
+    return None
+
+
+# text formats are parsed on every read, so a columnar copy of them can be cached ( see CacheUtils )
+CACHED_FORMATS = (FileFormat.TXT, FileFormat.CSV, FileFormat.JSON, FileFormat.JSONL)
+
+
+def _cached_copy(_format, FILE, fill=True):
+    """
+    Path of cached columnar ( Feather ) copy of a text file if data cache is enabled, copy is written on first read
+    of the whole file ( with ``fill`` ), reading first rows of a file only uses an existing copy.
+    ``None`` if the file is not cached, eg. a small file or a file which can't be stored in a columnar format.
+    """
+    if _format not in CACHED_FORMATS:
+        return None
+    path = CacheUtils.cache_source(FILE)
+    if path is None:
+        return None
+    # same file read as another format or with another delimiter is another copy
+    options = [str(_format)]
+    if _format == FileFormat.CSV:
+        options.append(sniffCsvDelimiter(FILE))
+    cached = CacheUtils.cached_file(path, options)
+    if cached is None and fill:
+        info(f"Caching columnar copy of {colored(path, 'yellow')}")
+
+        def write(output):
+            with BatchWriter(FileFormat.FEATHER, output) as writer:
+                for df in _readFileBatches(_format, FILE, DEFAULT_BATCH_SIZE):
+                    writer.write(df)
+            return writer.rows
+
+        cached = CacheUtils.store(path, _format, write, options)
+    elif cached is not None:
+        info(f"Reading cached columnar copy of {colored(path, 'yellow')}")
+    return cached
+
+
+def readFile(_format, FILE, nrows=None, columns=None):
+    """
+    Read a file as DataFrame, if ``nrows`` is given only first ``nrows`` rows are read from the file,
+    and if ``columns`` are given only these columns are decoded ( where format allows it )
+    """
     try:
+        # first rows are read without parsing whole file, so they never fill the cache
+        cached = _cached_copy(_format, FILE, fill=nrows is None)
+        if cached is not None:
+            return _readFeather(cached, nrows, columns)
+        _rewind(FILE)
         if _format == FileFormat.TXT:
-            df = pd.read_csv(FILE)
+            df = pd.read_csv(FILE, nrows=nrows, usecols=columns)
         elif _format == FileFormat.CSV:
             delimiter = sniffCsvDelimiter(FILE)
-            df = pd.read_csv(FILE, sep=delimiter)
+            df = pd.read_csv(FILE, sep=delimiter, nrows=nrows, usecols=columns)
         elif _format == FileFormat.JSON:
-            df = readJSON(FILE)
+            df = readJSON(FILE) if nrows is None else _readJSONHead(FILE, nrows)
+        elif _format == FileFormat.JSONL:
+            df = pd.read_json(FILE, lines=True, nrows=nrows)
         elif _format == FileFormat.EXCEL:
-            df = pd.read_excel(FILE, engine="openpyxl")
+            # openpyxl reads sheet in read only mode, and stops after nrows
+            df = pd.read_excel(FILE, engine="openpyxl", nrows=nrows, usecols=columns)
         elif _format == FileFormat.PARQUET:
-            df = pq.read_table(FILE).to_pandas()
+            if nrows is None:
+                df = pq.read_table(FILE, columns=columns).to_pandas()
+            else:
+                df = _readParquetHead(FILE, nrows, columns)
         elif _format == FileFormat.AVRO:
-            with open(FILE, "rb") as f:
-                avro_reader = fastavro.reader(f)
-                records = [record for record in avro_reader]
-            df = pd.DataFrame(records)
+            with _open_binary(FILE) as f:
+                avro_reader = _avro_reader(f, columns)
+                records = list(itertools.islice(avro_reader, nrows))
+            df = pd.DataFrame(records, columns=columns)
+        elif _format == FileFormat.FEATHER:
+            df = _readFeather(FILE, nrows, columns)
+        elif _format == FileFormat.ORC:
+            df = _readOrc(FILE, nrows, columns)
         else:
             error(
                 f"Invalid file format {colored(str(_format), 'bold yellow')}, Available formats: {colored(FileFormat.validFormats(), 'magenta')}"
             )
             exit(1)
-        # print_df_as_table(df, title="Test Read Sample")
+        if columns is not None:
+            df = df[columns]  # in given order, usecols keeps file order
         return df
     except Exception as e:
         raise e
+
+
+def _batched(records, batch_size):
+    records = iter(records)
+    while batch := list(itertools.islice(records, batch_size)):
+        yield batch
+
+
+def _readExcelBatches(path, batch_size):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        for batch in _batched(rows, batch_size):
+            yield pd.DataFrame(batch, columns=header)
+    finally:
+        workbook.close()
+
+
+def readFileBatches(_format, FILE, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Read a file as DataFrames of ``batch_size`` rows, so a file of any size can be processed in bounded memory.
+    JSON arrays are the exception, they can only be parsed as a whole.
+    """
+    cached = _cached_copy(_format, FILE)
+    if cached is not None:
+        yield from readFileBatches(FileFormat.FEATHER, cached, batch_size)
+        return
+    yield from _readFileBatches(_format, FILE, batch_size)
+
+
+def _readFileBatches(_format, FILE, batch_size):
+    _rewind(FILE)
+    if _format == FileFormat.TXT:
+        yield from pd.read_csv(FILE, chunksize=batch_size)
+    elif _format == FileFormat.CSV:
+        yield from pd.read_csv(FILE, sep=sniffCsvDelimiter(FILE), chunksize=batch_size)
+    elif _format == FileFormat.JSON and is_json_array(FILE):
+        _rewind(FILE)
+        df = pd.read_json(FILE)
+        for start in range(0, df.shape[0], batch_size):
+            yield df.iloc[start : start + batch_size]
+    elif _format == FileFormat.JSON or _format == FileFormat.JSONL:
+        with pd.read_json(FILE, lines=True, chunksize=batch_size) as reader:
+            yield from reader
+    elif _format == FileFormat.EXCEL:
+        yield from _readExcelBatches(FILE, batch_size)
+    elif _format == FileFormat.PARQUET:
+        for batch in pq.ParquetFile(FILE).iter_batches(batch_size=batch_size):
+            yield batch.to_pandas()
+    elif _format == FileFormat.AVRO:
+        with _open_binary(FILE) as f:
+            for records in _batched(fastavro.reader(f), batch_size):
+                yield pd.DataFrame(records)
+    elif _format == FileFormat.FEATHER:
+        with _arrow_source(FILE) as source:
+            reader = pa.ipc.open_file(source)
+            yield from _rebatch(_feather_batches(reader), batch_size)
+    elif _format == FileFormat.ORC:
+        yield from _rebatch(_orc_batches(_orc_file(FILE)), batch_size)
+    else:
+        error(
+            f"Invalid file format {colored(str(_format), 'bold yellow')}, Available formats: {colored(FileFormat.validFormats(), 'magenta')}"
+        )
+        exit(1)
+
+
+# formats stored in blocks which can be read independently, Parquet row groups, Avro blocks, Feather record batches and ORC stripes
+BLOCK_FORMATS = (
+    FileFormat.PARQUET,
+    FileFormat.AVRO,
+    FileFormat.FEATHER,
+    FileFormat.ORC,
+)
+
+
+def _avro_blocks(FILE, select, columns=None):
+    # every selected block is decoded as a small Avro file of its own ( header + block ), others are skipped
+    with _open_binary(FILE) as f:
+        _skip_avro_header(f, FILE)
+        header_size = f.tell()
+        f.seek(0)
+        header = f.read(header_size)
+        index = 0
+        while byte := f.read(1):
+            rows = _read_avro_long(f, byte)
+            size = _read_avro_long(f)
+            if select(index, None):
+                block = _encode_avro_long(rows) + _encode_avro_long(size)
+                block += f.read(size + 16)  # data and sync marker
+                records = list(_avro_reader(io.BytesIO(header + block), columns))
+                yield pd.DataFrame(records, columns=columns)
+            else:
+                f.seek(size + 16, os.SEEK_CUR)
+            index += 1
+
+
+def readFileBlocks(_format, FILE, select, columns=None):
+    """
+    Read blocks of a file for which ``select(index, blocks)`` is true as DataFrames, blocks which are not selected are
+    skipped without reading ( or decoding ) them. Blocks are Parquet row groups, Avro blocks, Feather record batches
+    and ORC stripes, ``blocks`` is number of blocks in the file, ``None`` for Avro as it's only known at the end.
+    """
+    _rewind(FILE)
+    if _format == FileFormat.PARQUET:
+        parquet_file = pq.ParquetFile(FILE)
+        blocks = parquet_file.num_row_groups
+        for index in range(blocks):
+            if select(index, blocks):
+                yield parquet_file.read_row_group(index, columns=columns).to_pandas()
+    elif _format == FileFormat.AVRO:
+        yield from _avro_blocks(FILE, select, columns)
+    elif _format == FileFormat.FEATHER:
+        with _arrow_source(FILE) as source:
+            reader = pa.ipc.open_file(source)
+            blocks = reader.num_record_batches
+            for index in range(blocks):
+                if select(index, blocks):
+                    batch = reader.get_batch(index)
+                    yield (
+                        batch if columns is None else batch.select(columns)
+                    ).to_pandas()
+    elif _format == FileFormat.ORC:
+        orc_file = _orc_file(FILE)
+        blocks = orc_file.nstripes
+        for index in range(blocks):
+            if select(index, blocks):
+                stripe = orc_file.read_stripe(index, columns=columns)
+                yield (
+                    stripe if columns is None else stripe.select(columns)
+                ).to_pandas()
+    else:
+        raise ValueError(f"{_format} files are not stored in blocks")
+
+
+TAIL_CHUNK_SIZE = 64 * 1024
+
+
+def _record_ends(data, quoted):
+    # positions of newlines which end a record, as a file ends outside quotes, a newline inside
+    # a quoted value is followed by an odd number of quotes till the end of the file
+    if not quoted:
+        return [match.start() for match in re.finditer(b"\n", data)]
+    ends, quotes = [], 0
+    for match in reversed(list(re.finditer(b'[\n"]', data))):
+        if match.group() == b'"':
+            quotes += 1
+        elif quotes % 2 == 0:
+            ends.append(match.start())
+    return ends[::-1]
+
+
+def _tail_lines(f, nrows, header=False, quoted=False, end=None):
+    """
+    Last ``nrows`` non empty records ( lines ) of a file, read in chunks backwards from the end of the file ( or from
+    offset ``end`` ) till enough newlines are found. With ``header`` first line of the file is never returned, and with
+    ``quoted`` newlines inside quoted values ( CSV ) don't end a record.
+    """
+    f.seek(0, os.SEEK_END)
+    position, data, ends = f.tell() if end is None else end, b"", []
+    # one more newline for the partial first record, and one for the last record's newline
+    while position > 0 and len(ends) < nrows + 2:
+        size = min(TAIL_CHUNK_SIZE, position)
+        position -= size
+        f.seek(position)
+        data = f.read(size) + data
+        ends = _record_ends(data, quoted)
+    starts = [0] + [end + 1 for end in ends]
+    records = [data[a:b] for a, b in zip(starts, starts[1:] + [len(data)])]
+    if position > 0:
+        records = records[1:]  # partial record
+    elif header:
+        records = records[1:]
+    records = [record for record in records if record.strip()][-nrows:]
+    if records and not records[-1].endswith(b"\n"):
+        records[-1] += b"\n"
+    return b"".join(records)
+
+
+def _last_blocks(block_rows, nrows):
+    # blocks from the end which have last nrows rows
+    selected, rows = set(), 0
+    for index in reversed(range(len(block_rows))):
+        if rows >= nrows:
+            break
+        selected.add(index)
+        rows += block_rows[index]
+    return selected
+
+
+def _block_rows(_format, FILE):
+    # rows of every block from metadata / block headers, without reading data
+    if _format == FileFormat.PARQUET:
+        metadata = pq.ParquetFile(FILE).metadata
+        return [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)]
+    elif _format == FileFormat.FEATHER:
+        with _arrow_source(FILE) as source:
+            reader = pa.ipc.open_file(source)
+            return [
+                reader.get_batch(i).num_rows for i in range(reader.num_record_batches)
+            ]
+    return _avro_block_rows(FILE)
+
+
+def _tail_of_batches(batches, nrows):
+    # last nrows rows while streaming, only batches which can have last rows are kept
+    kept, rows = [], 0
+    for df in batches:
+        kept.append(df)
+        rows += df.shape[0]
+        while kept and rows - kept[0].shape[0] >= nrows:
+            rows -= kept.pop(0).shape[0]
+    if not kept:
+        return pd.DataFrame()
+    return pd.concat(kept, ignore_index=True).tail(nrows).reset_index(drop=True)
+
+
+def readFileTail(_format, FILE, nrows, columns=None, streamed=False, end=None):
+    """
+    Read last ``nrows`` rows of a file without reading the whole file: CSV/TXT and JSON lines are scanned backwards
+    from the end ( or from offset ``end`` ) for newlines, only last blocks of Parquet, Avro, Feather and ORC files are
+    read. Excel and JSON arrays are read as a whole. A ``streamed`` file ( eg. decompressed while reading ) can't seek
+    from the end, so it's read till the end keeping only last rows.
+    """
+    _rewind(FILE)
+    if _format in BLOCK_FORMATS:
+        if _format == FileFormat.ORC:
+            # stripe row counts are not in metadata, stripes are read backwards till there are enough rows
+            orc_file = _orc_file(FILE)
+            stripes, rows = [], 0
+            for index in reversed(range(orc_file.nstripes)):
+                if rows >= nrows:
+                    break
+                stripe = orc_file.read_stripe(index, columns=columns)
+                stripes.insert(0, stripe if columns is None else stripe.select(columns))
+                rows += stripe.num_rows
+            table = (
+                pa.Table.from_batches(stripes, schema=stripes[0].schema)
+                if stripes
+                else None
+            )
+            df = pd.DataFrame(columns=columns) if table is None else table.to_pandas()
+        else:
+            selected = _last_blocks(_block_rows(_format, FILE), nrows)
+            blocks = list(
+                readFileBlocks(
+                    _format, FILE, lambda index, _: index in selected, columns
+                )
+            )
+            df = (
+                pd.concat(blocks, ignore_index=True)
+                if blocks
+                else pd.DataFrame(columns=columns)
+            )
+        return df.tail(nrows).reset_index(drop=True)
+    lines = _format in (FileFormat.TXT, FileFormat.CSV, FileFormat.JSONL) or (
+        _format == FileFormat.JSON and not is_json_array(FILE)
+    )
+    if not lines or streamed:
+        batches = readFileBatches(_format, FILE)
+        df = _tail_of_batches(batches, nrows)
+        return df if columns is None else df[columns]
+    with _open_binary(FILE) as f:
+        if _format == FileFormat.JSONL or _format == FileFormat.JSON:
+            tail = _tail_lines(f, nrows, end=end)
+            df = pd.read_json(io.BytesIO(tail), lines=True) if tail else pd.DataFrame()
+            return df if columns is None else df[columns]
+        delimiter = COMMA if _format == FileFormat.TXT else sniffCsvDelimiter(f)
+        f.seek(0)
+        header = f.readline()
+        tail = _tail_lines(f, nrows, header=True, quoted=True, end=end)
+    df = pd.read_csv(io.BytesIO(header + tail), sep=delimiter, usecols=columns)
+    return df if columns is None else df[columns]
+
+
+COUNT_CHUNK_SIZE = 1024 * 1024
+
+
+def _read_chunks(f, remaining=None):
+    while remaining is None or remaining > 0:
+        chunk = f.read(
+            COUNT_CHUNK_SIZE if remaining is None else min(COUNT_CHUNK_SIZE, remaining)
+        )
+        if not chunk:
+            break
+        if remaining is not None:
+            remaining -= len(chunk)
+        yield chunk
+
+
+def _count_chunk_newlines(chunks, quoted):
+    outside, inside, parity = 0, 0, 0
+    for chunk in chunks:
+        if not quoted or b'"' not in chunk:
+            counts = chunk.count(b"\n")
+            if parity:
+                inside += counts
+            else:
+                outside += counts
+            continue
+        # text between quotes alternates outside / inside, escaped quotes ( "" ) keep parity
+        for index, segment in enumerate(chunk.split(b'"')):
+            if (index + parity) % 2:
+                inside += segment.count(b"\n")
+            else:
+                outside += segment.count(b"\n")
+        parity = (parity + chunk.count(b'"')) % 2
+    return outside, inside, parity
+
+
+def _count_newlines(args):
+    """
+    Count newlines of a byte range ``[start, end)`` as ``(outside quotes, inside quotes, quote parity)``,
+    counts are relative to range start, so ranges can be counted in parallel and combined in order
+    """
+    path, start, end, quoted = args
+    with open(path, "rb") as f:
+        f.seek(start)
+        return _count_chunk_newlines(_read_chunks(f, end - start), quoted)
+
+
+def _count_stream_lines(FILE, quoted):
+    # an open file ( eg. decompressed while reading ) can't be split in ranges, so it is scanned sequentially
+    last = b"\n"
+
+    def chunks():
+        nonlocal last
+        for chunk in _read_chunks(FILE):
+            last = chunk[-1:]
+            yield chunk
+
+    _rewind(FILE)
+    outside, _, _ = _count_chunk_newlines(chunks(), quoted)
+    return outside + (last != b"\n")  # last line without newline
+
+
+def _count_lines(path, quoted, workers=1):
+    # lines of a text file, newlines inside quoted values are not counted if `quoted`
+    if hasattr(path, "read"):
+        return _count_stream_lines(path, quoted)
+    size = os.path.getsize(path)
+    if size == 0:
+        return 0
+    step = -(-size // workers)
+    ranges = [
+        (path, start, min(start + step, size), quoted) for start in range(0, size, step)
+    ]
+    if workers > 1:
+        with multiprocessing.Pool(workers) as pool:
+            counts = pool.map(_count_newlines, ranges)
+    else:
+        counts = map(_count_newlines, ranges)
+    lines, parity = 0, 0
+    for outside, inside, range_parity in counts:
+        lines += inside if parity else outside
+        parity = (parity + range_parity) % 2
+    with open(path, "rb") as f:
+        f.seek(size - 1)
+        if f.read(1) != b"\n":
+            lines += 1  # last line without newline
+    return lines
+
+
+def _read_avro_long(f, byte=None):
+    # zigzag encoded variable length long, see avro specification
+    shift, value = 0, 0
+    while True:
+        byte = byte or f.read(1)
+        if not byte:
+            raise EOFError("Unexpected end of Avro file")
+        value |= (byte[0] & 0x7F) << shift
+        if not byte[0] & 0x80:
+            return (value >> 1) ^ -(value & 1)
+        shift += 7
+        byte = None
+
+
+def _encode_avro_long(value):
+    value = (value << 1) ^ (value >> 63)  # zigzag
+    encoded = bytearray()
+    while value & ~0x7F:
+        encoded.append((value & 0x7F) | 0x80)
+        value >>= 7
+    encoded.append(value)
+    return bytes(encoded)
+
+
+def _skip_avro_header(f, path):
+    # moves to first block, after header metadata and sync marker
+    if f.read(4) != b"Obj\x01":
+        raise ValueError(f"{path} is not an Avro file")
+    while True:  # header metadata map
+        entries = _read_avro_long(f)
+        if entries == 0:
+            break
+        if entries < 0:
+            entries = -entries
+            _read_avro_long(f)  # size of block in bytes
+        for _ in range(entries * 2):  # key and value
+            f.seek(_read_avro_long(f), os.SEEK_CUR)
+    f.seek(16, os.SEEK_CUR)  # sync marker
+
+
+def _avro_block_rows(path):
+    """Record counts of Avro blocks from their headers, block data is skipped without decompressing or decoding"""
+    with _open_binary(path) as f:
+        _skip_avro_header(f, path)
+        rows = []
+        # only forward seeks, so a file decompressed while reading can be scanned as well
+        while byte := f.read(1):
+            rows.append(_read_avro_long(f, byte))
+            f.seek(_read_avro_long(f) + 16, os.SEEK_CUR)  # data and sync marker
+        return rows
+
+
+def _count_avro_rows(path):
+    return sum(_avro_block_rows(path))
+
+
+def _count_excel_rows(path):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True)
+    try:
+        sheet = workbook.active
+        sheet.reset_dimensions()  # dimension in file can be wrong, count rows while streaming
+        rows = sum(1 for _ in sheet.iter_rows(values_only=True))
+    finally:
+        workbook.close()
+    return max(rows - 1, 0)  # header
+
+
+def countRows(_format, FILE, workers=1):
+    """
+    Count rows of a file without reading data where possible, Parquet / ORC row count is read from footer metadata,
+    Feather from record batch headers, Avro from block headers and CSV/TXT/JSON lines are counted by scanning newlines using ``workers`` processes
+    ( an open file is scanned by a single process )
+    """
+    if _format == FileFormat.PARQUET:
+        return pq.ParquetFile(FILE).metadata.num_rows
+    elif _format == FileFormat.AVRO:
+        return _count_avro_rows(FILE)
+    elif _format == FileFormat.TXT or _format == FileFormat.CSV:
+        return max(_count_lines(FILE, quoted=True, workers=workers) - 1, 0)  # header
+    elif _format == FileFormat.JSONL:
+        return _count_lines(FILE, quoted=False, workers=workers)
+    elif _format == FileFormat.JSON:
+        if is_json_array(FILE):
+            return readJSON(FILE).shape[0]
+        return _count_lines(FILE, quoted=False, workers=workers)
+    elif _format == FileFormat.EXCEL:
+        return _count_excel_rows(FILE)
+    elif _format == FileFormat.FEATHER:
+        with _arrow_source(FILE) as source:
+            return pa.ipc.open_file(source).count_rows()
+    elif _format == FileFormat.ORC:
+        return _orc_file(FILE).nrows
+    error(
+        f"Invalid file format {colored(str(_format), 'bold yellow')}, Available formats: {colored(FileFormat.validFormats(), 'magenta')}"
+    )
+    exit(1)
+
+
+def _avro_type(dtype):
+    arrow_type = getattr(dtype, "pyarrow_dtype", None)
+    if arrow_type is not None and pa.types.is_date(arrow_type):
+        return {"type": "int", "logicalType": "date"}
+    elif arrow_type is not None and pa.types.is_time(arrow_type):
+        return {"type": "long", "logicalType": "time-micros"}
+    elif pd.api.types.is_bool_dtype(dtype):
+        return "boolean"
+    elif pd.api.types.is_integer_dtype(dtype):
+        return "long"
+    elif pd.api.types.is_float_dtype(dtype):
+        return "double"
+    elif pd.api.types.is_datetime64_any_dtype(dtype):
+        return {"type": "long", "logicalType": "timestamp-micros"}
+    return "string"  # anything else is written as its string value
+
+
+def _avro_schema(df):
+    return fastavro.parse_schema(
+        {
+            "doc": "Avro schema for generated data",
+            "name": "Root",
+            "type": "record",
+            "fields": [
+                {
+                    "name": str(column),
+                    "type": ["null", _avro_type(dtype)],
+                    "default": None,
+                }
+                for column, dtype in df.dtypes.items()
+            ],
+        }
+    )
+
+
+def _avro_records(df, schema):
+    df = df.astype(object).where(df.notna(), None)  # NaN, NaT -> null
+    for field in schema["fields"]:
+        if field["type"][1] == "string":
+            column = df[field["name"]]
+            df[field["name"]] = column.where(column.isna(), column.astype(str))
+    return df.to_dict(orient="records")
+
+
+# formats written with a schema, see BatchWriter
+TYPED_FORMATS = (
+    FileFormat.PARQUET,
+    FileFormat.AVRO,
+    FileFormat.FEATHER,
+    FileFormat.ORC,
+)
+
+
+def _conform(table, schema):
+    # columns of a batch in order and types of schema, missing columns are nulls
+    columns = [
+        (
+            table.column(field.name).cast(field.type)
+            if field.name in table.column_names
+            else pa.nulls(table.num_rows, field.type)
+        )
+        for field in schema
+    ]
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+def validate_format(_format):
+    if _format not in FileFormat.validFormats():
+        error(
+            f"Invalid file format {str(_format)}, Available {FileFormat.validFormats()}"
+        )
+        exit(1)
+
+
+class BatchWriter:
+    """
+    Writes DataFrame batches incrementally to a file ( or a binary stream eg. stdout ), so data never needs to
+    be in memory at once. File is created on first write, schema ( columns ) is inferred from first batch.
+
+    * CSV/TXT and JSON lines are appended, JSON is written as an array one batch at a time
+    * Parquet batches are written as row groups ( of ``row_group_size`` rows if given ), Avro batches as blocks,
+      Feather ( Arrow IPC ) batches as record batches and ORC batches as stripes
+    * Excel can't be appended, so batches are kept in memory and written on close
+    * Output path ending with ``.gz``, ``.bz2``, ``.xz`` or ``.zst`` is compressed while writing, Parquet, Avro,
+      Feather and ORC files are written uncompressed next to it first and compressed on close
+    * Types of Parquet, Avro, Feather and ORC columns are promoted when a later batch needs it, eg. a column which
+      is empty in first batches takes type of its first values and integers are widened to floats. File written so
+      far is then read and written again with promoted types, which isn't possible for a stream
+    * If an error is raised inside ``with BatchWriter(...)``, output written so far is removed, see ``discard``
+    """
+
+    def __init__(
+        self,
+        _format,
+        output,
+        row_group_size=None,
+        compression=DEFAULT_PARQUET_COMPRESSION,
+        avro_codec=DEFAULT_AVRO_CODEC,
+    ):
+        validate_format(_format)
+        self.to_stream = hasattr(output, "write")
+        self.file_compression = None if self.to_stream else split_compression(output)[1]
+        if _format == FileFormat.EXCEL:
+            if self.to_stream:
+                error("Excel format can't be written to a stream, please use a file")
+                exit(1)
+            if self.file_compression:
+                error(
+                    "Excel files are already compressed, please remove compression extension"
+                )
+                exit(1)
+            validate_file_extension(output, [".xlsx", ".xls"])
+        self.format = _format
+        self.output = output
+        self.row_group_size = row_group_size
+        self.compression = compression
+        self.avro_codec = avro_codec
+        self.rows = 0
+        self.written = False  # output is created on first write, even of an empty batch
+        self._header_written = (
+            False  # CSV header, written with first batch even if it's empty
+        )
+        self._file = None
+        self._raw = None  # compressed output file
+        self._writer = None
+        self._schema = None  # arrow schema of columnar formats
+        self._null_columns = (
+            set()
+        )  # columns with only nulls so far, they take type of their first values
+        self._batches = []
+        # uncompressed file ( or stream ) written by arrow and avro writers
+        self._target = output
+        if self.file_compression and _format in TYPED_FORMATS:
+            self._target = f"{output}.{os.getpid()}.tmp"
+
+    def _open(self, text=True):
+        if self.file_compression:
+            self._raw = open(self.output, "wb")
+            stream = open_compressed(self._raw, "wb", self.file_compression)
+            return (
+                io.TextIOWrapper(stream, encoding="utf-8", newline="")
+                if text
+                else stream
+            )
+        if not self.to_stream:
+            return (
+                open(self.output, "w", newline="") if text else open(self.output, "wb")
+            )
+        if text:
+            return io.TextIOWrapper(
+                self.output, encoding="utf-8", newline="", write_through=True
+            )
+        return self.output
+
+    def write(self, df):
+        self.written = True
+        if self.format == FileFormat.TXT or self.format == FileFormat.CSV:
+            if self._file is None:
+                self._file = self._open()
+            df.to_csv(
+                self._file,
+                index=False,
+                header=not self._header_written,
+                quotechar='"',
+                escapechar="\\",
+            )
+            self._header_written = True
+        elif self.format == FileFormat.JSON:
+            if self._file is None:
+                self._file = self._open()
+                self._file.write("[")
+            records = ",".join(_json_records(df))
+            if records:
+                self._file.write(("," if self.rows else "") + records)
+        elif self.format == FileFormat.JSONL:
+            if self._file is None:
+                self._file = self._open()
+            for record in _json_records(df):
+                self._file.write(record + "\n")
+        elif self.format == FileFormat.EXCEL:
+            self._batches.append(df)
+        else:
+            self._write_table(self._table(df))
+        self.rows += df.shape[0]
+
+    def _sink(self):
+        # arrow writers open ( and close ) a path themselves
+        return self.output if self.to_stream else str(self._target)
+
+    def _open_writer(self):
+        if self.format == FileFormat.PARQUET:
+            self._writer = pq.ParquetWriter(
+                self._sink(), self._schema, compression=self.compression
+            )
+        elif self.format == FileFormat.FEATHER:
+            # uncompressed, so record batches can be memory mapped while reading
+            self._writer = pa.ipc.new_file(self._sink(), self._schema)
+        elif self.format == FileFormat.ORC:
+            from pyarrow import orc  # type: ignore
+
+            self._writer = orc.ORCWriter(self._sink())
+        else:
+            self._file = self.output if self.to_stream else open(self._target, "wb")
+            dtypes = self._schema.empty_table().to_pandas(types_mapper=pd.ArrowDtype)
+            self._writer = fastavro.write.Writer(
+                self._file, _avro_schema(dtypes), codec=self.avro_codec
+            )
+
+    def _write_table(self, table):
+        if self.format == FileFormat.PARQUET:
+            self._batches.append(table)
+            self._write_row_groups()
+        elif self.format == FileFormat.FEATHER:
+            self._writer.write_table(table)
+        elif self.format == FileFormat.ORC:
+            self._writer.write(table)
+        else:
+            df = table.to_pandas(types_mapper=pd.ArrowDtype)
+            for record in _avro_records(df, self._writer.schema):
+                self._writer.write(record)
+            self._writer.flush()  # one block per batch
+
+    def _table(self, df):
+        """
+        Arrow table of a batch with types of all batches so far, writer is created on first batch.
+        If the batch needs promoted types, batches written so far are written again with them.
+        """
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if self._schema is None:
+            self._schema = table.schema
+            self._null_columns = {
+                name
+                for name in table.column_names
+                if table.column(name).null_count == table.num_rows
+            }
+            self._open_writer()
+            return table
+        schema = self._promoted_schema(table.schema)
+        for name in table.column_names:
+            if table.column(name).null_count < table.num_rows:
+                self._null_columns.discard(name)
+            elif name not in self._schema.names:
+                self._null_columns.add(name)
+        if schema != self._schema:
+            self._rewrite(schema.remove_metadata())
+        return _conform(table, self._schema)
+
+    def _promoted_schema(self, schema):
+        # columns with only nulls so far take type of the batch, others are promoted eg. int64 to double
+        current = pa.schema(
+            [
+                (
+                    field.with_type(pa.null())
+                    if field.name in self._null_columns
+                    else field
+                )
+                for field in self._schema
+            ]
+        )
+        try:
+            promoted = pa.unify_schemas([current, schema], promote_options="permissive")
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            raise ValueError(
+                f"Column types of a batch don't match types of earlier batches\n{e}"
+            ) from e
+        return pa.schema(
+            [
+                (
+                    self._schema.field(field.name)
+                    if field.type == pa.null() and field.name in self._schema.names
+                    else field
+                )
+                for field in promoted
+            ]
+        )
+
+    def _close_writer(self):
+        if self._writer is None:
+            return
+        if self.format == FileFormat.PARQUET:
+            self._write_row_groups(final=True)
+            self._writer.close()
+        elif self.format in (FileFormat.FEATHER, FileFormat.ORC):
+            self._writer.close()
+        else:
+            self._writer.flush()
+        self._writer = None
+
+    def _rewrite(self, schema):
+        """Read back the file written so far and write it again with promoted ``schema``"""
+        changed = [
+            f"{field.name}: {self._schema.field(field.name).type} -> {field.type}"
+            for field in schema
+            if field.name in self._schema.names
+            and self._schema.field(field.name).type != field.type
+        ]
+        if self.to_stream:
+            raise ValueError(
+                f"Column types changed after first batch ( {', '.join(changed)} ), a stream can't be written "
+                f"again with promoted types, please use a larger batch size"
+            )
+        logging.debug(f"Promoting column types {changed}, writing {self.output} again")
+        pending, self._batches = self._batches, []
+        self._close_writer()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        written = f"{self._target}.{os.getpid()}.old"
+        os.replace(self._target, written)
+        try:
+            self._schema = schema
+            self._open_writer()
+            for df in readFileBatches(self.format, written):
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                self._write_table(_conform(table, schema))
+            for table in pending:
+                self._write_table(_conform(table, schema))
+        finally:
+            os.remove(written)
+
+    def _write_row_groups(self, final=False):
+        # batches are buffered till a row group is full, rest of the rows are written on close
+        if not self._batches:
+            return
+        table = pa.concat_tables(self._batches)
+        rows = table.num_rows
+        if self.row_group_size and not final:
+            rows -= rows % self.row_group_size
+        if rows:
+            self._writer.write_table(
+                table.slice(0, rows), row_group_size=self.row_group_size
+            )
+        self._batches = [table.slice(rows)] if rows < table.num_rows else []
+
+    def close(self):
+        if not self.written and not self.to_stream:
+            warning(
+                f"No data to write, {colored(self.output, 'magenta')} is not created"
+            )
+        if self.format == FileFormat.JSON and self._file is not None:
+            self._file.write("]")
+        elif self.format == FileFormat.EXCEL and self._batches:
+            pd.concat(self._batches, ignore_index=True).to_excel(
+                self.output, index=False, engine="openpyxl"
+            )
+            self._batches = []
+        elif self.format in TYPED_FORMATS:
+            self._close_writer()
+        if self._file is not None:
+            if not self.to_stream:
+                self._file.close()
+            elif isinstance(self._file, io.TextIOWrapper):
+                self._file.flush()
+                self._file.detach()  # keep the stream open, eg. stdout
+            else:
+                self._file.flush()
+            self._file = None
+        if self._target != self.output and os.path.exists(self._target):
+            with open(self._target, "rb") as source, self._open(text=False) as stream:
+                shutil.copyfileobj(source, stream)
+            os.remove(self._target)
+        if self._raw is not None:
+            self._raw.close()
+            self._raw = None
+
+    def discard(self):
+        """
+        Stop writing after an error, output written so far is removed instead of being finished ( eg. JSON ``]``
+        or Parquet footer ), so a failed write never leaves a truncated file which looks valid
+        """
+        writer, self._writer = self._writer, None
+        if writer is not None and self.format in (
+            FileFormat.PARQUET,
+            FileFormat.FEATHER,
+            FileFormat.ORC,
+        ):
+            with contextlib.suppress(Exception):
+                writer.close()  # only to release the file, it's removed below
+        if self._file is not None:
+            if not self.to_stream:
+                self._file.close()
+            elif isinstance(self._file, io.TextIOWrapper):
+                self._file.detach()  # keep the stream open, eg. stdout
+            self._file = None
+        if self._raw is not None:
+            self._raw.close()
+            self._raw = None
+        self._batches = []
+        if self.to_stream or not self.written:
+            return  # output is created on first write, an existing file wasn't touched
+        for path in {str(self.output), str(self._target)}:
+            if os.path.exists(path):
+                os.remove(path)
+        warning(f"Removed partially written {colored(self.output, 'magenta')}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
@@ -0,0 +1,414 @@
+import contextlib
+import glob
+import logging
+import os
+import re
+from pathlib import Path
+from urllib.parse import unquote
+
+import pandas as pd
+import pyarrow as pa  # type: ignore
+import pyarrow.dataset as ds  # type: ignore
+from pyarrow import csv as pcsv  # type: ignore
+
+from hckr.utils.DataUtils import (
+    DEFAULT_BATCH_SIZE,
+    countRows,
+    readColumns,
+    readFile,
+    readFileBatches,
+    sniffCsvDelimiter,
+)
+from hckr.utils.FileUtils import (
+    FILE_EXTENSION_FORMATS,
+    RANDOM_ACCESS_FORMATS,
+    FileFormat,
+    detect_file_format,
+    open_input,
+    spooled_copy,
+    split_compression,
+)
+from hckr.utils.MessageUtils import colored, error, warning
+
+GLOB_CHARS = "*?["
+# files written next to data by spark, hadoop etc. eg. _SUCCESS, .part-0.crc
+IGNORED_PREFIXES = (".", "_")
+# formats scanned by pyarrow.dataset, others are read file by file
+ARROW_FORMATS = {
+    FileFormat.PARQUET: "parquet",
+    FileFormat.FEATHER: "ipc",
+    FileFormat.ORC: "orc",
+    FileFormat.JSONL: "json",
+}
+_CSV_FORMATS = (FileFormat.CSV, FileFormat.TXT)  # scanned by pyarrow.dataset as well
+SCHEMA_INFER_ROWS = 1000
+# value of a null partition written by hive / spark
+HIVE_NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+
+
+def _has_glob(path):
+    return any(char in str(path) for char in GLOB_CHARS)
+
+
+def is_dataset(path):
+    """A directory or a glob pattern eg. ``data/year=*/*.parquet`` is read as a dataset of its files"""
+    return os.path.isdir(path) or (not os.path.exists(path) and _has_glob(path))
+
+
+def _ignored(path, base):
+    relative = Path(os.path.relpath(path, base))
+    return any(part.startswith(IGNORED_PREFIXES) for part in relative.parts)
+
+
+def _base_dir(path):
+    # directory before first glob pattern, partitions are parsed from paths relative to it
+    if os.path.isdir(path):
+        return os.path.normpath(path)
+    if os.path.isfile(path):
+        return os.path.dirname(os.path.normpath(path)) or "."
+    prefix = []
+    for part in Path(path).parts:
+        if _has_glob(part):
+            break
+        prefix.append(part)
+    return os.path.normpath(os.path.join(*prefix)) if prefix else "."
+
+
+def dataset_files(path):
+    """Files of a directory ( recursively ) or matching a glob pattern, in sorted order"""
+    if os.path.isfile(path):
+        return [path]
+    base = _base_dir(path)
+    if os.path.isdir(path):
+        files = [
+            os.path.join(root, name)
+            for root, _, names in os.walk(path)
+            for name in names
+        ]
+    else:
+        files = glob.glob(path, recursive=True)
+    files = sorted(
+        os.path.normpath(file)
+        for file in files
+        if os.path.isfile(file) and not _ignored(file, base)
+    )
+    if not files:
+        error(f"No files found for dataset {colored(path, 'magenta')}")
+        exit(1)
+    return files
+
+
+def _file_format(path):
+    _, extension = os.path.splitext(split_compression(path)[0])
+    return FILE_EXTENSION_FORMATS.get(extension.lower())
+
+
+def hive_partitions(path, base):
+    """Partition values of a file from its ``key=value`` directories eg. ``year=2024/month=10/part-0.avro``"""
+    partitions = {}
+    for part in Path(os.path.relpath(path, base)).parts[:-1]:
+        key, separator, value = part.partition("=")
+        if separator:
+            partitions[unquote(key)] = unquote(value)
+    return partitions
+
+
+def partition_schema(files, base):
+    """
+    Types of hive partitions of all files, integer partitions are ``int32`` ( as inferred by ``pyarrow.dataset`` )
+    and others are strings. All files share it, so partitions have same type whichever format a file is of.
+    """
+    values = {}
+    for file in files:
+        for key, value in hive_partitions(file, base).items():
+            values.setdefault(key, set()).add(value)
+    return pa.schema(
+        [
+            (
+                key,
+                (
+                    pa.int32()
+                    if all(
+                        re.fullmatch(r"-?\d{1,9}", value)
+                        for value in key_values - {HIVE_NULL_PARTITION}
+                    )
+                    else pa.string()
+                ),
+            )
+            for key, key_values in values.items()
+        ]
+    )
+
+
+def _scanned(file, _format):
+    # pyarrow.dataset decompresses text files from their extension, so compression ( detected from magic bytes )
+    # must match the extension and be supported by pyarrow ( eg. not xz ). Other compressed files, and compressed
+    # Parquet, Feather and ORC files are read file by file
+    if _format not in ARROW_FORMATS and _format not in _CSV_FORMATS:
+        return False
+    with open(file, "rb") as handle:
+        _, compression = detect_file_format(handle)
+    if compression is None:
+        return split_compression(file)[1] is None
+    if _format in RANDOM_ACCESS_FORMATS:
+        return False
+    return split_compression(file)[1] == compression and _arrow_codec(compression)
+
+
+def _arrow_codec(compression):
+    try:
+        return pa.Codec.is_available(compression)
+    except ValueError:
+        return False  # unknown to pyarrow eg. xz
+
+
+@contextlib.contextmanager
+def _open_file(file, _format):
+    # like open_input, compressed files which need random access are decompressed to a temporary file first
+    with open_input(file) as (handle, compression):
+        if compression and _format in RANDOM_ACCESS_FORMATS:
+            with spooled_copy(handle) as spooled:
+                yield spooled, compression
+        else:
+            yield handle, compression
+
+
+def _csv_format(files, _format):
+    if _format == FileFormat.TXT:
+        return ds.CsvFileFormat()
+    with open_input(files[0]) as (handle, _):
+        delimiter = sniffCsvDelimiter(handle)
+    return ds.CsvFileFormat(parse_options=pcsv.ParseOptions(delimiter=delimiter))
+
+
+class Dataset:
+    """
+    Files of a directory or glob pattern read as one table, files can be of mixed formats. Hive partitions
+    ( ``key=value`` directories ) are read as columns, and ``partitions`` filter prunes files of other partitions
+    before reading them.
+
+    Parquet, Feather, ORC, CSV/TXT and JSON lines files are scanned by ``pyarrow.dataset`` using multiple threads,
+    other formats ( Avro, JSON, Excel ), compressed Parquet, Feather and ORC files and compressed files pyarrow can't
+    decompress ( eg. xz or without a compression extension ) are read file by file.
+    """
+
+    def __init__(self, path, _format=None, partitions=None):
+        self.path = path
+        self.base = _base_dir(path)
+        self.files = dataset_files(path)
+        groups = {}
+        for file in self.files:
+            file_format = FileFormat(_format) if _format else _file_format(file)
+            if file_format is None:
+                warning(f"Skipping file {colored(file, 'magenta')} of unknown format")
+                continue
+            groups.setdefault(file_format, []).append(file)
+        self.formats = sorted(str(file_format) for file_format in groups)
+        self.partition_schema = partition_schema(self.files, self.base)
+        partitions = partitions or {}
+        arrow_groups, others = [], []
+        for file_format, files in groups.items():
+            scanned = []
+            for file in files:
+                if _scanned(file, file_format):
+                    scanned.append(file)
+                else:
+                    others.append((file, file_format))
+            if scanned:
+                arrow_groups.append((self._arrow_format(file_format, scanned), scanned))
+        children = [self._arrow_dataset(*group) for group in arrow_groups]
+        self.arrow = None
+        if len(children) == 1:
+            self.arrow = children[0]
+        elif children:
+            # every format is scanned with common schema eg. string columns of csv as large_string of parquet
+            schema = pa.unify_schemas(
+                [child.schema for child in children], promote_options="permissive"
+            )
+            children = [self._arrow_dataset(*group, schema) for group in arrow_groups]
+            self.arrow = ds.dataset(children, schema=schema)
+        self.others = [
+            (file, file_format)
+            for file, file_format in others
+            if self._matches(file, partitions)
+        ]
+        self.filter = self._partition_filter(partitions)
+        logging.debug(
+            f"Dataset {path} has {len(self.files)} files in formats {self.formats}"
+        )
+
+    def _arrow_dataset(self, arrow_format, files, schema=None):
+        return ds.dataset(
+            files,
+            schema=schema,
+            format=arrow_format,
+            partitioning=ds.partitioning(self.partition_schema, flavor="hive"),
+            partition_base_dir=self.base,
+        )
+
+    @staticmethod
+    def _arrow_format(_format, files):
+        if _format in _CSV_FORMATS:
+            return _csv_format(files, _format)
+        return ARROW_FORMATS[_format]
+
+    def _matches(self, file, partitions):
+        values = hive_partitions(file, self.base)
+        return all(values.get(key) == value for key, value in partitions.items())
+
+    def _partition_filter(self, partitions):
+        # partition expressions are matched with fragment paths, so files of other partitions are never opened
+        names = (
+            self.partition_schema.names
+            if self.arrow is None
+            else self.arrow.schema.names
+        )
+        for key in partitions:
+            if key not in names:
+                error(
+                    f"Partition {colored(key, 'yellow')} not found, available columns: {colored(names, 'magenta')}"
+                )
+                exit(1)
+        if self.arrow is None:
+            return None
+        expression = None
+        for key, value in partitions.items():
+            field_type = self.arrow.schema.field(key).type
+            condition = ds.field(key) == pa.scalar(value).cast(field_type)
+            expression = condition if expression is None else expression & condition
+        return expression
+
+    def _partitions(self, file):
+        # partition values of a file with their types in partition schema
+        partitions = {}
+        for key, value in hive_partitions(file, self.base).items():
+            if value == HIVE_NULL_PARTITION:
+                value = None
+            field_type = self.partition_schema.field(key).type
+            partitions[key] = pa.scalar(value, pa.string()).cast(field_type)
+        return partitions
+
+    def _add_partitions(self, df, partitions):
+        for key, value in partitions.items():
+            df[key] = pa.repeat(value, df.shape[0]).to_pandas()
+        return df
+
+    def _read_other(self, file, _format, nrows=None, columns=None):
+        partitions = self._partitions(file)
+        file_columns = columns and [c for c in columns if c not in partitions]
+        with _open_file(file, _format) as (handle, _):
+            df = readFile(_format, handle, nrows=nrows, columns=file_columns)
+        df = self._add_partitions(df, partitions)
+        return df if columns is None else df[columns]
+
+    def columns(self):
+        """Column names from schemas of files, ``None`` if a file's columns can't be known without parsing it"""
+        names = [] if self.arrow is None else list(self.arrow.schema.names)
+        for file, _format in self.others:
+            with _open_file(file, _format) as (handle, _):
+                file_columns = readColumns(_format, handle)
+            if file_columns is None:
+                return None
+            file_columns += list(hive_partitions(file, self.base))
+            names += [column for column in file_columns if column not in names]
+        return names
+
+    def head(self, nrows, columns=None):
+        """
+        First ``nrows`` rows, fragments are scanned in parallel and scan stops as soon as ``nrows`` rows are read
+        """
+        frames, rows = [], 0
+        if self.arrow is not None:
+            table = self.arrow.head(nrows, columns=columns, filter=self.filter)
+            frames.append(table.to_pandas())
+            rows += table.num_rows
+        for file, _format in self.others:
+            if rows >= nrows:
+                break
+            df = self._read_other(file, _format, nrows - rows, columns)
+            frames.append(df)
+            rows += df.shape[0]
+        return pd.concat(frames, ignore_index=True)
+
+    def count(self, workers=1):
+        """Rows in all files, Parquet / ORC row counts are read from metadata without reading data"""
+        rows = 0
+        if self.arrow is not None:
+            rows += self.arrow.count_rows(filter=self.filter)
+        for file, _format in self.others:
+            with _open_file(file, _format) as (handle, compression):
+                rows += countRows(_format, handle if compression else file, workers)
+        return rows
+
+    def schema(self):
+        """Arrow schema, inferred from first rows if files are read by pandas"""
+        if self.arrow is not None:
+            return self.arrow.schema
+        return pa.Table.from_pandas(
+            self.head(SCHEMA_INFER_ROWS), preserve_index=False
+        ).schema
+
+    def _scan_filter(self, filter=None):
+        if filter is None or self.filter is None:
+            return self.filter if filter is None else filter
+        return self.filter & filter
+
+    def tables(self, batch_size=DEFAULT_BATCH_SIZE, filter=None, columns=None):
+        """
+        All rows as arrow tables of up to ``batch_size`` rows. ``filter`` expression is pushed down to the scan,
+        eg. Parquet row groups are skipped using their statistics, and only ``columns`` are read
+        """
+        if self.arrow is not None:
+            for batch in self.arrow.to_batches(
+                columns=columns,
+                filter=self._scan_filter(filter),
+                batch_size=batch_size,
+            ):
+                if batch.num_rows:
+                    yield pa.Table.from_batches([batch])
+        for df in self._other_batches(batch_size):
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            for field in self.partition_schema:
+                # pandas has no int32 of nullable partitions, so partitions are cast back to their types
+                if field.name in table.column_names:
+                    index = table.schema.get_field_index(field.name)
+                    table = table.set_column(
+                        index, field, table.column(index).cast(field.type)
+                    )
+            if filter is not None:
+                table = table.filter(filter)
+            if columns is not None:
+                table = table.select(columns)
+            if table.num_rows:
+                yield table
+
+    def batches(self, batch_size=DEFAULT_BATCH_SIZE):
+        """All rows as DataFrames of up to ``batch_size`` rows, files are read one batch at a time"""
+        if self.arrow is not None:
+            for batch in self.arrow.to_batches(
+                filter=self.filter, batch_size=batch_size
+            ):
+                if batch.num_rows:
+                    yield batch.to_pandas()
+        yield from self._other_batches(batch_size)
+
+    def _other_batches(self, batch_size):
+        for file, _format in self.others:
+            partitions = self._partitions(file)
+            with _open_file(file, _format) as (handle, _):
+                for df in readFileBatches(_format, handle, batch_size):
+                    yield self._add_partitions(df, partitions)
+
+
+def parse_partitions(values):
+    """Parse ``--partition`` option values ``key=value`` into a dict"""
+    partitions = {}
+    for value in values:
+        key, separator, partition_value = value.partition("=")
+        if not separator or not key:
+            error(
+                f"Invalid partition {colored(value, 'yellow')}, please use KEY=VALUE eg. year=2024"
+            )
+            exit(1)
+        partitions[key.strip()] = partition_value.strip()
+    return partitions
@@ -1,5 +1,7 @@
+import configparser
 import logging
 from configparser import NoOptionError
+from functools import lru_cache
 
 import click
 import pandas as pd
@@ -11,7 +13,7 @@ from hckr.utils import MessageUtils
 from hckr.utils.DataUtils import print_df_as_table
 from hckr.utils.MessageUtils import PError, PInfo
 from hckr.utils.config import ConfigUtils
-from hckr.utils.config.ConfigUtils import list_config, load_config
+from hckr.utils.config.ConfigUtils import config_exists, list_config, load_config
 from hckr.utils.config.Constants import (
     ConfigType,
     DBType,
@@ -27,6 +29,7 @@ from hckr.utils.config.Constants import (
     DB_ROLE,
     DB_SCHEMA,
     DEFAULT_CONFIG,
+    DEFAULT_CONFIG_PATH,
 )
 
 
@@ -75,19 +78,22 @@ def get_db_url(section, config_path):
                 f"The configuration [yellow]{section}[/yellow] is not database type\n"
                 " Please use [magenta]hckr configure db[/magenta] to configure database."
             )
-        db_type = config.get(section, DB_TYPE)
-        if db_type == DBType.SQLite:
-            database_name = config.get(section, DB_NAME)
-            return f"sqlite:///{database_name}"
+        return _db_url(config, section)
+    except NoOptionError as e:
+        PError(f"Config {section} is not configured correctly\n {e}")
 
-        elif db_type in [DBType.PostgreSQL, DBType.MySQL]:
-            return _get_jdbc_url(config, section, db_type)
 
-        elif db_type == DBType.Snowflake:
-            return _get_snowflake_url(config, section)
+def _db_url(config, section):
+    db_type = config.get(section, DB_TYPE)
+    if db_type == DBType.SQLite:
+        database_name = config.get(section, DB_NAME)
+        return f"sqlite:///{database_name}"
 
-    except NoOptionError as e:
-        PError(f"Config {section} is not configured correctly\n {e}")
+    elif db_type in [DBType.PostgreSQL, DBType.MySQL]:
+        return _get_jdbc_url(config, section, db_type)
+
+    elif db_type == DBType.Snowflake:
+        return _get_snowflake_url(config, section)
 
 
 def _get_jdbc_url(config, section, db_type):
@@ -119,10 +125,33 @@ def _get_snowflake_url(config, section):
     )
 
 
+@lru_cache(maxsize=None)
+def _get_engine(db_url):
+    # engines are reused across commands of a long living process eg. `hckr serve`
+    return create_engine(db_url)
+
+
+def warm_engines(config_path=DEFAULT_CONFIG_PATH):
+    """
+    Create engines of all configured databases without connecting, so commands forked by ``hckr serve``
+    inherit them ( and loaded dialects ) instead of creating their own. Config errors are left to the commands.
+    """
+    if not config_exists(config_path):
+        return
+    config = configparser.ConfigParser()
+    config.read(config_path)
+    for section in config.sections():
+        try:
+            if config.get(section, CONFIG_TYPE) == ConfigType.DATABASE:
+                _get_engine(_db_url(config, section))
+        except Exception as e:
+            logging.debug(f"Unable to create engine for config {section}\n{e}")
+
+
 def execute_query(db_url, query, num_rows, num_cols):
     try:
         query = query.strip()
-        engine = create_engine(db_url)
+        engine = _get_engine(db_url)
         with engine.connect() as connection:
             # Normalize and determine the type of query
             normalized_query = query.lower()
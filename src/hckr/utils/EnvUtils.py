@@ -3,7 +3,7 @@ import os
 import re
 
 from . import MessageUtils
-from .MessageUtils import PError, PSuccess, PWarn
+from .MessageUtils import PError, PSuccess, PWarn, output_format, print_records
 
 DEFAULT_PATTERN = ".*"
 
@@ -18,6 +18,10 @@ def list_env(pattern, ignore_case):
     # Retrieve and filter environment variables
     env_vars = {k: v for k, v in os.environ.items() if regex.search(f"{k}={v}")}
 
+    if output_format():
+        records = [{"name": key, "value": value} for key, value in env_vars.items()]
+        print_records(records, ["name", "value"])
+        return
     if not env_vars:
         PWarn("No matching environment variables found.")
         exit(0)
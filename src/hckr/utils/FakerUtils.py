@@ -0,0 +1,161 @@
+import ast
+import collections
+import inspect
+import itertools
+import logging
+import multiprocessing
+import random
+from pathlib import Path
+
+import pandas as pd
+from faker import Faker
+
+from hckr.utils.DataUtils import BatchWriter, DEFAULT_BATCH_SIZE
+from hckr.utils.FileUtils import FileFormat
+
+IN_FLIGHT_PER_WORKER = 2
+
+
+def _takes_string(parameter):
+    # parameter without annotation and default can be anything, it gets a string as before
+    if parameter is None or isinstance(parameter.default, str):
+        return True
+    annotation = parameter.annotation
+    if annotation is inspect.Parameter.empty:
+        return parameter.default in (inspect.Parameter.empty, None)
+    return annotation is str or "str" in str(annotation)
+
+
+def _parameter(parameters, index):
+    # parameter receiving positional argument at index, None if it's unknown
+    positional = [
+        p for p in parameters if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD)
+    ]
+    if index < len(positional):
+        return positional[index]
+    return next((p for p in parameters if p.kind == p.VAR_POSITIONAL), None)
+
+
+def _parse_argument(argument, parameter=None):
+    # arguments are strings eg. "numerify:123" calls numerify("123"), literals are parsed only for parameters which
+    # don't take strings eg. "pyint:1:10" calls pyint(1, 10)
+    if _takes_string(parameter):
+        return argument
+    try:
+        return ast.literal_eval(argument)
+    except (ValueError, SyntaxError):
+        return argument
+
+
+def compile_schema(schema):
+    """
+    Compile schema ``{"column": "provider[:arg...]"}`` into a plan ``[(column, provider, args)]``,
+    every provider is called once here, so an invalid provider or arguments fail before generating any data.
+    """
+    fake = Faker()
+    plan = []
+    for column, value in schema.items():
+        provider, *arguments = value.split(":")
+        method = getattr(fake, provider, None)
+        if not callable(method):
+            raise ValueError(f"No such Faker method: {provider}")
+        try:
+            parameters = list(inspect.signature(method).parameters.values())
+        except (TypeError, ValueError):
+            parameters = []
+        args = tuple(
+            _parse_argument(argument, _parameter(parameters, index))
+            for index, argument in enumerate(arguments)
+        )
+        try:
+            method(*args)
+        except Exception as e:
+            raise ValueError(
+                f"Invalid arguments {list(args)} for Faker method {provider}: {e}"
+            )
+        plan.append((column, provider, args))
+    return plan
+
+
+def _shards(plan, count, batch_size, seed):
+    # shards are fixed row ranges with their own seed, so seeded data is same for any number of workers
+    for index, start in enumerate(range(0, count, batch_size)):
+        yield index, plan, min(batch_size, count - start), (
+            None if seed is None else seed + index
+        )
+
+
+def _fake_shard(shard):
+    _, plan, rows, seed = shard
+    fake = Faker()
+    # unseeded shards still get their own seed, forked workers share the state of Faker's module level random
+    fake.seed_instance(random.SystemRandom().getrandbits(64) if seed is None else seed)
+    columns = {}
+    for column, provider, args in plan:
+        # provider is resolved once per column, and whole column is generated in one pass with no per row loop.
+        # Faker has no batch providers, so it's still called once per value
+        method = getattr(fake, provider)
+        columns[column] = list(itertools.starmap(method, itertools.repeat(args, rows)))
+    return pd.DataFrame(columns)
+
+
+def _map(func, items, workers):
+    """
+    Apply ``func`` on ``items`` in order, using a pool of ``workers`` processes if more than one.
+    At most ``IN_FLIGHT_PER_WORKER`` items per worker are submitted ahead of the consumer, so a slow consumer
+    ( eg. a compressed writer ) keeps memory bounded instead of finished results piling up.
+    """
+    if workers <= 1:
+        yield from map(func, items)
+        return
+    with multiprocessing.Pool(workers) as pool:
+        pending = collections.deque()
+        for item in items:
+            if len(pending) >= workers * IN_FLIGHT_PER_WORKER:
+                yield pending.popleft().get()
+            pending.append(pool.apply_async(func, (item,)))
+        while pending:
+            yield pending.popleft().get()
+
+
+def fake_batches(schema, count, batch_size=DEFAULT_BATCH_SIZE, seed=None, workers=1):
+    """
+    Generate ``count`` fake rows for schema ``{"column": "provider[:arg...]"}`` as DataFrames of ``batch_size`` rows,
+    batches are generated by ``workers`` processes and returned in order.
+    """
+    plan = compile_schema(schema)
+    yield from _map(_fake_shard, _shards(plan, count, batch_size, seed), workers)
+
+
+def part_file_path(output, index, _format):
+    return Path(output) / f"part-{index:05d}{FileFormat(_format).extension()}"
+
+
+def _fake_part(args):
+    shard, _format, output = args
+    df = _fake_shard(shard)
+    path = part_file_path(output, shard[0], _format)
+    with BatchWriter(_format, path) as writer:
+        writer.write(df)
+    logging.debug(f"{df.shape[0]} rows written to {path}")
+    return df.head(3), df.shape[0]
+
+
+def fake_part_files(
+    schema, count, _format, output, batch_size=DEFAULT_BATCH_SIZE, seed=None, workers=1
+):
+    """
+    Generate ``count`` fake rows as part files ``part-NNNNN.<ext>`` of ``batch_size`` rows inside ``output`` directory,
+    every worker writes its own parts. Returns sample of first part and total rows written.
+    """
+    plan = compile_schema(schema)
+    Path(output).mkdir(parents=True, exist_ok=True)
+    parts = (
+        (shard, _format, output) for shard in _shards(plan, count, batch_size, seed)
+    )
+    sample, rows = None, 0
+    for part_sample, part_rows in _map(_fake_part, parts, workers):
+        if sample is None:
+            sample = part_sample
+        rows += part_rows
+    return sample, rows
@@ -1,5 +1,15 @@
+import bz2
+import contextlib
+import csv
+import gzip
+import io
+import json
 import logging
+import lzma
 import os
+import re
+import shutil
+import tempfile
 from pathlib import Path
 
 from hckr.utils.MessageUtils import error, info, colored, warning
@@ -12,23 +22,16 @@ class FileFormat(str, Enum):
     CSV = "csv"
     AVRO = "avro"
     JSON = "json"
+    JSONL = "jsonl"
     EXCEL = "excel"
     PARQUET = "parquet"
+    FEATHER = "feather"
+    ORC = "orc"
     INVALID = "invalid"
 
     @staticmethod
     def fileExtToFormat(file_path, file_extension):
-        file_type_extension_map = {
-            ".txt": FileFormat.TXT,
-            ".text": FileFormat.TXT,
-            ".csv": FileFormat.CSV,
-            ".tsv": FileFormat.CSV,
-            ".json": FileFormat.JSON,
-            ".xlsx": FileFormat.EXCEL,
-            ".xls": FileFormat.EXCEL,
-            ".parquet": FileFormat.PARQUET,
-            ".avro": FileFormat.AVRO,
-        }
+        file_type_extension_map = FILE_EXTENSION_FORMATS
 
         _format = file_type_extension_map.get(
             file_extension.lower(), FileFormat.INVALID
@@ -42,6 +45,10 @@ class FileFormat(str, Enum):
             exit(1)
         return _format
 
+    def extension(self):
+        """Default file extension of a format, used when file path is generated"""
+        return {FileFormat.EXCEL: ".xlsx"}.get(self, f".{self.value}")
+
     @staticmethod
     def validFormats():
         return [str(x) for x in FileFormat if str(x) != str(FileFormat.INVALID)]
@@ -50,6 +57,51 @@ class FileFormat(str, Enum):
         return self.value
 
 
+FILE_EXTENSION_FORMATS = {
+    ".txt": FileFormat.TXT,
+    ".text": FileFormat.TXT,
+    ".csv": FileFormat.CSV,
+    ".tsv": FileFormat.CSV,
+    ".json": FileFormat.JSON,
+    ".jsonl": FileFormat.JSONL,
+    ".ndjson": FileFormat.JSONL,
+    ".xlsx": FileFormat.EXCEL,
+    ".xls": FileFormat.EXCEL,
+    ".parquet": FileFormat.PARQUET,
+    ".avro": FileFormat.AVRO,
+    ".feather": FileFormat.FEATHER,
+    ".arrow": FileFormat.FEATHER,
+    ".ipc": FileFormat.FEATHER,
+    ".orc": FileFormat.ORC,
+}
+
+DETECT_SIZE = 8 * 1024  # bytes read from start of a file to detect its format
+MAGIC_BYTES = {
+    b"PAR1": FileFormat.PARQUET,
+    b"Obj\x01": FileFormat.AVRO,
+    b"PK\x03\x04": FileFormat.EXCEL,  # xlsx is a zip archive
+    b"ARROW1\x00\x00": FileFormat.FEATHER,  # Arrow IPC file ( Feather v2 )
+}
+# "ORC" alone is a common start of text eg. an ORCID column, so an ORC file is also checked for its postscript
+ORC_MAGIC = b"ORC"
+COMPRESSION_MAGIC_BYTES = {
+    b"\x1f\x8b": "gzip",
+    b"\x28\xb5\x2f\xfd": "zstd",
+    b"\xfd7zXZ\x00": "xz",
+}
+# "BZh" alone is a common start of text, so bzip2 is matched with its block size and magic of the first block
+# ( or end of stream for an empty stream )
+BZIP2_HEADER = re.compile(rb"BZh[1-9](1AY&SY|\x17rE8P\x90)")
+COMPRESSION_EXTENSIONS = {".gz": "gzip", ".bz2": "bz2", ".xz": "xz", ".zst": "zstd"}
+# formats which are read by same reader, so extension is preferred over content
+COMPATIBLE_FORMATS = {
+    FileFormat.TXT: {FileFormat.TXT, FileFormat.CSV},
+    FileFormat.CSV: {FileFormat.TXT, FileFormat.CSV},
+    FileFormat.JSONL: {FileFormat.JSON, FileFormat.JSONL},
+}
+TEXT_FORMATS = {FileFormat.TXT, FileFormat.CSV, FileFormat.JSON, FileFormat.JSONL}
+
+
 # Save the key to a file
 def save_file(content, file_path):
     try:
@@ -125,6 +177,241 @@ def get_file_format_from_extension(file_path) -> FileFormat:
         return FileFormat.INVALID
     # Extract the extension from the file path
     # path = Path(file_path)
-    _, file_extension = os.path.splitext(file_path)
+    _, file_extension = os.path.splitext(split_compression(file_path)[0])
     logging.info(f"file extension from file {file_path} is {file_extension}")
     return FileFormat.fileExtToFormat(file_path, file_extension)
+
+
+def split_compression(file_path):
+    """Split compression extension from a file path eg. ``data.csv.gz`` -> ``("data.csv", "gzip")``"""
+    root, extension = os.path.splitext(str(file_path))
+    compression = COMPRESSION_EXTENSIONS.get(extension.lower())
+    return (root, compression) if compression else (str(file_path), None)
+
+
+class _KeepOpen:
+    """File proxy which pyarrow streams can close, without closing the wrapped file"""
+
+    closed = False
+
+    def __init__(self, fileobj):
+        self._fileobj = fileobj
+
+    def __getattr__(self, name):
+        return getattr(self._fileobj, name)
+
+    def close(self):
+        if not self._fileobj.closed:
+            self._fileobj.flush()
+
+
+class _ZstdReader(io.RawIOBase):
+    """
+    zstd decompressing reader over a binary file, seeking backwards restarts decompression ( like gzip ),
+    uses `zstandard <https://pypi.org/project/zstandard/>`_ if installed, otherwise pyarrow
+    """
+
+    def __init__(self, fileobj):
+        self._fileobj = fileobj
+        self._open()
+
+    def _open(self):
+        self._fileobj.seek(0)
+        try:
+            import zstandard  # type: ignore
+
+            self._stream = zstandard.ZstdDecompressor().stream_reader(
+                self._fileobj, read_across_frames=True, closefd=False
+            )
+        except ImportError:
+            import pyarrow as pa  # type: ignore
+
+            self._stream = pa.CompressedInputStream(_KeepOpen(self._fileobj), "zstd")
+        self._position = 0
+
+    def close(self):
+        if not self.closed:
+            self._stream.close()
+        super().close()
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self._stream.read(len(buffer))
+        buffer[: len(data)] = data
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence != io.SEEK_SET:
+            raise io.UnsupportedOperation("Seek from end is not supported for zstd")
+        if offset < self._position:
+            self._open()
+        while self._position < offset:
+            if not self.read(min(offset - self._position, io.DEFAULT_BUFFER_SIZE)):
+                break
+        return self._position
+
+
+def _zstd_writer(fileobj):
+    # zstandard compresses using all cores, pyarrow uses a single thread
+    try:
+        import zstandard  # type: ignore
+
+        return zstandard.ZstdCompressor(threads=-1).stream_writer(
+            fileobj, closefd=False
+        )
+    except ImportError:
+        import pyarrow as pa  # type: ignore
+
+        return pa.CompressedOutputStream(_KeepOpen(fileobj), "zstd")
+
+
+def open_compressed(fileobj, mode, compression):
+    """Compress ( mode ``wb`` ) or decompress ( mode ``rb`` ) an open binary file while it is written / read"""
+    if compression == "gzip":
+        return gzip.GzipFile(fileobj=fileobj, mode=mode)
+    elif compression == "bz2":
+        return bz2.BZ2File(fileobj, mode)
+    elif compression == "xz":
+        return lzma.LZMAFile(fileobj, mode)
+    elif compression == "zstd":
+        return _ZstdReader(fileobj) if mode == "rb" else _zstd_writer(fileobj)
+    raise ValueError(
+        f"Invalid compression {compression}, Available {sorted(set(COMPRESSION_EXTENSIONS.values()))}"
+    )
+
+
+# formats read with random access ( seeks ), so compressed files of these formats are decompressed before reading
+RANDOM_ACCESS_FORMATS = (
+    FileFormat.PARQUET,
+    FileFormat.EXCEL,
+    FileFormat.FEATHER,
+    FileFormat.ORC,
+)
+SPOOL_MEMORY_SIZE = 64 * 1024 * 1024  # larger decompressed files are spooled to disk
+
+
+@contextlib.contextmanager
+def spooled_copy(handle):
+    """Seekable copy of a ( decompressed ) stream in a temporary file, kept in memory up to ``SPOOL_MEMORY_SIZE``"""
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MEMORY_SIZE) as spooled:
+        shutil.copyfileobj(handle, spooled)
+        spooled.seek(0)
+        yield spooled
+
+
+@contextlib.contextmanager
+def open_input(file_path):
+    """
+    Open an input file as a buffered binary file, compressed files ( detected from magic bytes ) are
+    decompressed while reading. Yields ``(handle, compression)``.
+    """
+    with open(file_path, "rb") as raw:
+        _, compression = detect_file_format(raw)
+        if compression is None:
+            yield raw, None
+            return
+        with io.BufferedReader(open_compressed(raw, "rb", compression)) as handle:
+            yield handle, compression
+
+
+def _detect_text_format(head):
+    if b"\x00" in head:
+        return None  # binary data of an unknown format
+    text = head.decode("utf-8", errors="ignore").lstrip("\ufeff").lstrip()
+    if not text:
+        return None
+    if text.startswith("["):
+        return FileFormat.JSON
+    if text.startswith("{"):
+        if "\n" not in text.rstrip():
+            # a single line, if it is cut off we can't tell JSON from JSON lines
+            return FileFormat.JSONL if len(head) < DETECT_SIZE else None
+        try:
+            json.loads(text.split("\n", 1)[0])
+            return FileFormat.JSONL
+        except ValueError:
+            return FileFormat.JSON  # a JSON object spanning multiple lines
+    try:
+        csv.Sniffer().sniff(text[:2048])
+        return FileFormat.CSV
+    except csv.Error:
+        return FileFormat.TXT
+
+
+def detect_file_format(handle):
+    """
+    Detect format of a file from its first few KB, returns ``(format, compression)`` where format is ``None``
+    if it can't be detected. ``handle`` is a buffered binary file, it is peeked so its position doesn't change.
+    """
+    head = handle.peek(DETECT_SIZE)[:DETECT_SIZE]
+    for magic, compression in COMPRESSION_MAGIC_BYTES.items():
+        if head.startswith(magic):
+            return None, compression
+    if BZIP2_HEADER.match(head):
+        return None, "bz2"
+    for magic, _format in MAGIC_BYTES.items():
+        if head.startswith(magic):
+            return _format, None
+    if head.startswith(ORC_MAGIC) and has_orc_postscript(handle) is not False:
+        return FileFormat.ORC, None
+    return _detect_text_format(head), None
+
+
+def has_orc_postscript(handle):
+    """
+    ORC file ends with its postscript ( ending with magic ``ORC`` ) and length of the postscript, checked without
+    moving file position. ``None`` if it can't be checked without reading the whole file eg. a decompressed stream
+    """
+    if not isinstance(getattr(handle, "raw", None), io.FileIO):
+        return None
+    position = handle.tell()
+    try:
+        handle.seek(-len(ORC_MAGIC) - 1, os.SEEK_END)
+        return handle.read(len(ORC_MAGIC)) == ORC_MAGIC
+    except OSError:
+        return False  # too short to have a postscript
+    finally:
+        handle.seek(position)
+
+
+def infer_input_format(handle, file_path) -> FileFormat:
+    """
+    Format of an input file from its content, falling back to its extension if content is not conclusive.
+    Extension is kept if it is read the same way as content eg. ``.txt`` containing CSV.
+    """
+    detected, compression = detect_file_format(handle)
+    if compression:
+        error(
+            f"File {colored(file_path, 'magenta')} has nested {colored(compression, 'yellow')} compression, please decompress it first"
+        )
+        exit(1)
+    _, file_extension = os.path.splitext(split_compression(file_path)[0])
+    from_extension = FILE_EXTENSION_FORMATS.get(file_extension.lower())
+    if detected is None:
+        return FileFormat.fileExtToFormat(file_path, file_extension)
+    if from_extension is None:
+        return detected
+    if from_extension in COMPATIBLE_FORMATS.get(detected, {detected}):
+        return from_extension
+    if (
+        detected == FileFormat.ORC
+        and from_extension in TEXT_FORMATS
+        and not has_orc_postscript(handle)
+    ):
+        # magic "ORC" alone doesn't override a text extension
+        return from_extension
+    warning(
+        f"File extension {colored(file_extension, 'yellow')} doesn't match its content, reading as {colored(detected, 'magenta')}"
+    )
+    return detected
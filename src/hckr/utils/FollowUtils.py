@@ -0,0 +1,167 @@
+import ctypes
+import ctypes.util
+import io
+import logging
+import os
+import re
+import select
+import sys
+import time
+
+import pandas as pd
+
+from hckr.utils.DataUtils import COMMA
+from hckr.utils.FileUtils import FileFormat
+
+# seconds, also how often a replaced ( rotated ) file is checked when using inotify
+POLL_INTERVAL = 1.0
+# inotify events, see inotify(7)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+WATCH_EVENTS = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_DELETE_SELF | IN_MOVE_SELF
+
+
+class _Inotify:
+    """Wait for changes of a file using Linux inotify, through libc so no extra dependency is needed"""
+
+    def __init__(self, path):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_EVENTS) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed for {path}")
+
+    def wait(self, timeout):
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if readable:
+            # drain events, changes are read using size of the file
+            try:
+                while os.read(self.fd, 4096):
+                    pass
+            except BlockingIOError:
+                pass
+
+    def close(self):
+        os.close(self.fd)
+
+
+class _Poller:
+    """Fallback where inotify is not available, file size is checked every ``timeout`` seconds"""
+
+    def wait(self, timeout):
+        time.sleep(timeout)
+
+    def close(self):
+        pass
+
+
+def file_watcher(path):
+    if sys.platform.startswith("linux"):
+        try:
+            return _Inotify(path)
+        except (OSError, AttributeError, TypeError) as e:
+            logging.debug(f"inotify is not available, polling {path} instead\n{e}")
+    return _Poller()
+
+
+def _complete_records(data, quoted):
+    # length of data which has complete records, data starts at a record boundary so
+    # a newline ends a record only if quotes before it are balanced
+    if not quoted:
+        return data.rfind(b"\n") + 1
+    end, quotes = 0, 0
+    for match in re.finditer(b'[\n"]', data):
+        if match.group() == b'"':
+            quotes += 1
+        elif quotes % 2 == 0:
+            end = match.start() + 1
+    return end
+
+
+def _last_record_end(f, size):
+    start = max(0, size - 64 * 1024)
+    f.seek(start)
+    data = f.read(size - start)
+    index = data.rfind(b"\n")
+    return start + index + 1 if index >= 0 else (0 if start == 0 else size)
+
+
+def end_offset(path):
+    """Offset after last newline of a file, following from it reads a partially written last line once it's complete"""
+    with open(path, "rb") as f:
+        return _last_record_end(f, os.fstat(f.fileno()).st_size)
+
+
+def follow_records(
+    path,
+    offset=None,
+    quoted=False,
+    header=False,
+    idle_timeout=None,
+    interval=POLL_INTERVAL,
+):
+    """
+    Yield complete records ( bytes ) appended to a file after ``offset`` ( end of the file by default ), as they are
+    appended. Only new bytes are read, and a partially written record is kept until rest of it is appended.
+    A truncated or replaced ( rotated ) file is read again from its start, skipping its ``header`` line.
+    Stops after ``idle_timeout`` seconds without new records, otherwise follows the file forever.
+    """
+    f = open(path, "rb")
+    watcher = file_watcher(path)
+    try:
+        size = os.fstat(f.fileno()).st_size
+        offset = _last_record_end(f, size) if offset is None else offset
+        buffer, skip_header, last = b"", False, time.monotonic()
+        while True:
+            try:
+                replaced = os.stat(path).st_ino != os.fstat(f.fileno()).st_ino
+            except FileNotFoundError:
+                replaced = False  # rotated, new file is not created yet
+            if replaced:
+                logging.debug(f"{path} is replaced, reading new file")
+                f.close()
+                watcher.close()
+                f, watcher = open(path, "rb"), file_watcher(path)
+                offset, buffer, skip_header = 0, b"", header
+            size = os.fstat(f.fileno()).st_size
+            if size < offset:
+                logging.debug(f"{path} is truncated, reading from its start")
+                offset, buffer, skip_header = 0, b"", header
+            if size > offset:
+                f.seek(offset)
+                buffer += f.read(size - offset)
+                offset = size
+                if skip_header and b"\n" in buffer:
+                    buffer = buffer[buffer.index(b"\n") + 1 :]
+                    skip_header = False
+                # a partially written header is waited for, like a partially written record
+                if not skip_header:
+                    end = _complete_records(buffer, quoted)
+                    if end:
+                        records, buffer = buffer[:end], buffer[end:]
+                        last = time.monotonic()
+                        if records.strip():
+                            yield records
+                    continue
+            remaining = None
+            if idle_timeout is not None:
+                remaining = idle_timeout - (time.monotonic() - last)
+                if remaining <= 0:
+                    return
+            watcher.wait(interval if remaining is None else min(interval, remaining))
+    finally:
+        watcher.close()
+        f.close()
+
+
+def parse_records(_format, records, header=b"", delimiter=COMMA):
+    """Parse records ( bytes ) of a CSV / TXT file with its ``header`` line, or of a JSON lines file as a DataFrame"""
+    if _format in (FileFormat.CSV, FileFormat.TXT):
+        return pd.read_csv(io.BytesIO(header + records), sep=delimiter)
+    return pd.read_json(io.BytesIO(records), lines=True)
@@ -2,7 +2,15 @@ import hashlib
 import os
 from enum import Enum
 
-from hckr.utils.MessageUtils import colored, info, checkOnlyOnePassed, error, success
+from hckr.utils.MessageUtils import (
+    colored,
+    info,
+    checkOnlyOnePassed,
+    error,
+    success,
+    output_format,
+    print_records,
+)
 
 
 class HashType(str, Enum):
@@ -53,5 +61,8 @@ def hashStringOrFile(_str, _file, _method, _chunk_size):
             error("Invalid option")
     except Exception as e:
         error(f"Some error occurred\n {e}")
-    if digest:
+    if digest and output_format():
+        record = {"digest": digest, "input": _str or _file, "algorithm": _method.value}
+        print_records([record], ["digest", "input", "algorithm"])
+    elif digest:
         success(f"{_method.upper()}: {digest}")
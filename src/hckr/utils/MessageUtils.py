@@ -1,4 +1,7 @@
+import csv
+import json
 import logging
+import sys
 
 import click
 import rich
@@ -6,6 +9,62 @@ from rich import print
 import random
 
 from rich.panel import Panel
+from rich.text import Text
+
+# global --output option, results are printed as records instead of rich tables / panels
+OUTPUT_FORMATS = ["json", "jsonl", "csv", "plain"]
+OUTPUT_FORMAT_KEY = "hckr.output"
+
+
+def output_format():
+    """Output format passed with global ``--output`` option, ``None`` for rich output"""
+    ctx = click.get_current_context(silent=True)
+    return ctx.meta.get(OUTPUT_FORMAT_KEY) if ctx else None
+
+
+def _plain(msg):
+    # with --output, stdout only has results, so messages are written to stderr without emoji and colors
+    click.echo(Text.from_markup(str(msg)).plain, err=True)
+
+
+def print_records(records, fields):
+    """Print records ( dicts with ``fields`` as keys ) to stdout in the format passed with ``--output``"""
+    _format = output_format()
+    if _format == "json":
+        click.echo(json.dumps(records, default=str))
+    elif _format == "jsonl":
+        for record in records:
+            click.echo(json.dumps(record, default=str))
+    elif _format == "csv":
+        writer = csv.DictWriter(sys.stdout, fieldnames=fields, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(records)
+    else:
+        for record in records:
+            click.echo("\t".join(str(record.get(field, "")) for field in fields))
+
+
+class _NoSpinner:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def ok(self, text=None):
+        pass
+
+    def fail(self, text=None):
+        pass
+
+
+def spinner(text):
+    """Spinner while waiting for results, disabled with ``--output`` so stdout only has results"""
+    if output_format():
+        return _NoSpinner()
+    from yaspin import yaspin  # type: ignore
+
+    return yaspin(text=text, color="green", timer=True)
 
 
 def colored(msg, color, bold=True):
@@ -16,10 +75,14 @@ def colored(msg, color, bold=True):
 
 
 def success(msg):
+    if output_format():
+        return _plain(msg)
     print(f"{success_emoji()} [bold green] {msg}[/bold green]")
 
 
 def error(msg, color=None):
+    if output_format():
+        return _plain(msg)
     if color:
         print(f"{error_emoji()} [bold {color}] {msg}[/bold {color}]")
     else:
@@ -27,21 +90,25 @@ def error(msg, color=None):
 
 
 def warning(msg, color=None):
+    if output_format():
+        return _plain(msg)
     if color:
         print(f"{warn_emoji()} [bold {color}] {msg}[/bold {color}]")
     else:
         print(f"{warn_emoji()} [bold yellow]{msg}[/bold yellow]")
 
 
-def _PMsg(msg, title, desc=None):
+def _PMsg(msg, title, desc=None, expand=True):
     if desc:
         title = f"{title}: {desc}"
+    if output_format():
+        return _plain(f"{title}\n{msg}")
 
     # click.echo("\n")
     rich.print(
         Panel(
             msg,
-            expand=True,
+            expand=expand,
             title=title,
         )
     )
@@ -55,8 +122,8 @@ def PSuccess(msg, desc=None, title="[green]Success[/green]"):
     _PMsg(msg, title, desc)
 
 
-def PInfo(msg, desc=None, title="[blue]Info"):
-    _PMsg(msg, title, desc)
+def PInfo(msg, desc=None, title="[blue]Info", expand=True):
+    _PMsg(msg, title, desc, expand)
 
 
 def PError(msg, desc=None, title="[red]Error"):
@@ -65,6 +132,8 @@ def PError(msg, desc=None, title="[red]Error"):
 
 
 def info(msg, color=None):
+    if output_format():
+        return _plain(msg)
     if color:
         print(f"{info_emoji()} [bold {color}] {msg}[/bold {color}]")
     else:
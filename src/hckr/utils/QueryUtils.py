@@ -0,0 +1,452 @@
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+import pyarrow as pa  # type: ignore
+import pyarrow.compute as pc  # type: ignore
+import pyarrow.dataset as ds  # type: ignore
+
+from hckr.utils.DataUtils import DEFAULT_BATCH_SIZE
+
+_TOKEN = re.compile(
+    r"""\s*(?:
+        (?P<number>\d+\.\d*|\.\d+|\d+)
+        |(?P<string>'(?:[^']|'')*')
+        |(?P<quoted>"(?:[^"]|"")*"|`[^`]*`)
+        |(?P<op><=|>=|<>|!=|==|=|<|>|\(|\)|,|\*|-)
+        |(?P<name>[A-Za-z_][\w.]*)
+    )""",
+    re.VERBOSE,
+)
+KEYWORDS = {
+    "select",
+    "from",
+    "where",
+    "group",
+    "order",
+    "by",
+    "limit",
+    "and",
+    "or",
+    "not",
+    "in",
+    "is",
+    "null",
+    "like",
+    "between",
+    "as",
+    "asc",
+    "desc",
+    "true",
+    "false",
+}
+# aggregate function -> partial aggregates computed per batch
+AGGREGATES = {
+    "count": ["count"],
+    "sum": ["sum"],
+    "min": ["min"],
+    "max": ["max"],
+    "avg": ["sum", "count"],
+    "mean": ["sum", "count"],
+}
+# partial aggregates of batches are combined using
+_MERGE = {"count_all": "sum", "count": "sum", "sum": "sum", "min": "min", "max": "max"}
+_COMPARISONS = {
+    "=": lambda a, b: a == b,
+    "==": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+    "<>": lambda a, b: a != b,
+    "<": lambda a, b: a < b,
+    "<=": lambda a, b: a <= b,
+    ">": lambda a, b: a > b,
+    ">=": lambda a, b: a >= b,
+}
+
+
+class QueryError(ValueError):
+    pass
+
+
+@dataclass
+class Aggregate:
+    function: str
+    column: Optional[str]  # None for count(*)
+    name: str
+
+
+@dataclass
+class Query:
+    """Parsed ``select ... where ... group by ... order by ... limit ...`` query"""
+
+    columns: Optional[List[Tuple[str, str]]] = None  # (column, name), None for *
+    aggregates: List[Aggregate] = field(default_factory=list)
+    where: Optional[ds.Expression] = None
+    group_by: List[str] = field(default_factory=list)
+    order_by: List[Tuple[str, str]] = field(default_factory=list)
+    limit: Optional[int] = None
+
+
+def _tokenize(text):
+    tokens, position = [], 0
+    text = text.strip()
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        if not match or match.end() == position:
+            raise QueryError(f"Invalid syntax at: {text[position:position + 20]}")
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == "name" and value.lower() in KEYWORDS:
+            kind, value = "keyword", value.lower()
+        elif kind == "string":
+            value = value[1:-1].replace("''", "'")
+        elif kind == "quoted":
+            kind, value = "name", value[1:-1].replace('""', '"')
+        tokens.append((kind, value))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    def __init__(self, text, schema=None):
+        self.tokens = _tokenize(text)
+        self.position = 0
+        self.schema = schema
+
+    def peek(self, kind=None, value=None):
+        if self.position >= len(self.tokens):
+            return None
+        token = self.tokens[self.position]
+        if (kind and token[0] != kind) or (value and token[1] != value):
+            return None
+        return token
+
+    def accept(self, kind=None, value=None):
+        token = self.peek(kind, value)
+        if token:
+            self.position += 1
+        return token
+
+    def expect(self, kind=None, value=None):
+        token = self.accept(kind, value)
+        if not token:
+            found = self.peek()
+            raise QueryError(
+                f"Expected {value or kind}, found {found[1] if found else 'end of query'}"
+            )
+        return token
+
+    def done(self):
+        if self.peek():
+            raise QueryError(f"Unexpected {self.peek()[1]}")
+
+    def column(self):
+        name = self.expect("name")[1]
+        if self.schema is not None and name not in self.schema.names:
+            raise QueryError(
+                f"Column {name} not found, available columns: {self.schema.names}"
+            )
+        return name
+
+    # where expression
+    def expression(self):
+        expression = self.conjunction()
+        while self.accept("keyword", "or"):
+            expression = expression | self.conjunction()
+        return expression
+
+    def conjunction(self):
+        expression = self.negation()
+        while self.accept("keyword", "and"):
+            expression = expression & self.negation()
+        return expression
+
+    def negation(self):
+        if self.accept("keyword", "not"):
+            return ~self.negation()
+        return self.predicate()
+
+    def predicate(self):
+        if self.accept("op", "("):
+            expression = self.expression()
+            self.expect("op", ")")
+            return expression
+        name = self.column()
+        column = ds.field(name)
+        if self.accept("keyword", "is"):
+            negate = self.accept("keyword", "not")
+            self.expect("keyword", "null")
+            return column.is_valid() if negate else column.is_null()
+        negate = bool(self.accept("keyword", "not"))
+        if self.accept("keyword", "in"):
+            self.expect("op", "(")
+            values = [self.literal(name)]
+            while self.accept("op", ","):
+                values.append(self.literal(name))
+            self.expect("op", ")")
+            expression = column.isin(values)
+        elif self.accept("keyword", "like"):
+            expression = pc.match_like(column, self.expect("string")[1])
+        elif self.accept("keyword", "between"):
+            low = self.literal(name)
+            self.expect("keyword", "and")
+            expression = (column >= low) & (column <= self.literal(name))
+        elif not negate and self.peek("op") and self.peek()[1] in _COMPARISONS:
+            operator = self.accept("op")[1]
+            return _COMPARISONS[operator](column, self.literal(name))
+        elif not negate:
+            return column  # boolean column
+        else:
+            raise QueryError("Expected IN, LIKE or BETWEEN after NOT")
+        return ~expression if negate else expression
+
+    def literal(self, name):
+        sign = -1 if self.accept("op", "-") else 1
+        token = self.accept("number") or self.accept("string") or self.accept("keyword")
+        if not token:
+            raise QueryError(f"Expected a value for {name}")
+        kind, value = token
+        if kind == "number":
+            value = sign * (float(value) if "." in value else int(value))
+        elif kind == "keyword" and value in ("true", "false", "null"):
+            value = {"true": True, "false": False, "null": None}[value]
+        elif kind == "keyword":
+            raise QueryError(f"Expected a value for {name}, found {value}")
+        return self.cast(name, value)
+
+    def cast(self, name, value):
+        # literal as type of its column eg. '2024-01-01' for a timestamp column
+        if self.schema is None or value is None:
+            return value
+        try:
+            return pa.scalar(value).cast(self.schema.field(name).type)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError):
+            return value
+
+    # select query
+    def query(self):
+        query = Query()
+        self.expect("keyword", "select")
+        self.select_list(query)
+        if self.accept("keyword", "from"):
+            self.expect("name")  # input is given with -i, table name is ignored
+        if self.accept("keyword", "where"):
+            query.where = self.expression()
+        if self.accept("keyword", "group"):
+            self.expect("keyword", "by")
+            query.group_by = self.column_list()
+        if self.accept("keyword", "order"):
+            self.expect("keyword", "by")
+            query.order_by = self.order_list(query)
+        if self.accept("keyword", "limit"):
+            query.limit = int(self.expect("number")[1])
+        self.done()
+        if query.aggregates:
+            plain = [column for column, _ in query.columns or []]
+            extra = [column for column in plain if column not in query.group_by]
+            if query.columns is None or extra:
+                raise QueryError(
+                    f"Columns {extra or '*'} must be in GROUP BY or an aggregate function"
+                )
+        elif query.group_by:
+            raise QueryError("GROUP BY needs an aggregate function eg. count(*)")
+        return query
+
+    def select_list(self, query):
+        if self.accept("op", "*"):
+            return
+        query.columns = []
+        while True:
+            following = self.tokens[self.position + 1 : self.position + 2]
+            if self.peek("name") and following == [("op", "(")]:
+                query.aggregates.append(self.aggregate())
+            else:
+                column = self.column()
+                alias = self.expect("name")[1] if self.accept("keyword", "as") else None
+                query.columns.append((column, alias or column))
+            if not self.accept("op", ","):
+                break
+
+    def aggregate(self):
+        function = self.expect("name")[1].lower()
+        if function not in AGGREGATES:
+            raise QueryError(
+                f"Invalid function {function}, available: {list(AGGREGATES)}"
+            )
+        self.expect("op", "(")
+        if function == "count" and self.accept("op", "*"):
+            column = None
+        else:
+            column = self.column()
+        self.expect("op", ")")
+        name = f"{function}({column or '*'})"
+        if self.accept("keyword", "as"):
+            name = self.expect("name")[1]
+        return Aggregate(function, column, name)
+
+    def column_list(self):
+        columns = [self.column()]
+        while self.accept("op", ","):
+            columns.append(self.column())
+        return columns
+
+    def order_list(self, query):
+        # result columns ( including aliases and aggregates ) or input columns can be ordered by
+        names = [name for _, name in query.columns or []] + [
+            aggregate.name for aggregate in query.aggregates
+        ]
+        order_by = []
+        while True:
+            token = self.expect("name")
+            if token[1] not in names and self.schema is not None:
+                self.position -= 1
+                self.column()
+            if self.accept("keyword", "desc"):
+                order_by.append((token[1], "descending"))
+            else:
+                self.accept("keyword", "asc")
+                order_by.append((token[1], "ascending"))
+            if not self.accept("op", ","):
+                return order_by
+
+
+def parse_where(text, schema=None):
+    """
+    Parse a SQL like filter eg. ``age >= 18 and country in ('IN', 'US')`` into a ``pyarrow.dataset`` expression,
+    literals are cast to type of their column if ``schema`` is given
+    """
+    parser = _Parser(text, schema)
+    expression = parser.expression()
+    parser.done()
+    return expression
+
+
+def parse_query(text, schema=None):
+    """Parse ``select <columns | aggregates> [from t] [where ..] [group by ..] [order by ..] [limit n]``"""
+    return _Parser(text, schema).query()
+
+
+def _partials(query):
+    partials = (
+        {("count_all", None)}
+        if any(a.column is None for a in query.aggregates)
+        else set()
+    )
+    for aggregate in query.aggregates:
+        if aggregate.column is not None:
+            for function in AGGREGATES[aggregate.function]:
+                partials.add((function, aggregate.column))
+    return sorted(partials, key=lambda partial: (partial[1] or "", partial[0]))
+
+
+def _partial_name(function, column):
+    return "count_all" if column is None else f"{column}_{function}"
+
+
+def _aggregate(table, keys, partials, merge=False):
+    # partial aggregates of a batch, or merged partial aggregates of batches
+    names = [_partial_name(function, column) for function, column in partials]
+    if merge:
+        specs = [(name, _MERGE[f]) for name, (f, _) in zip(names, partials)]
+        outputs = [f"{name}_{_MERGE[f]}" for name, (f, _) in zip(names, partials)]
+    else:
+        specs = [([] if column is None else column, f) for f, column in partials]
+        outputs = names
+    aggregated = table.group_by(keys).aggregate(specs)
+    return aggregated.select(keys + outputs).rename_columns(keys + names)
+
+
+def _final(table, query):
+    columns = {name: table[column] for column, name in query.columns or []}
+    for aggregate in query.aggregates:
+        if aggregate.column is None:
+            values = table["count_all"]
+        elif aggregate.function in ("avg", "mean"):
+            values = pc.divide(
+                pc.cast(table[_partial_name("sum", aggregate.column)], pa.float64()),
+                table[_partial_name("count", aggregate.column)],
+            )
+        else:
+            values = table[_partial_name(aggregate.function, aggregate.column)]
+        columns[aggregate.name] = values
+    return pa.table(columns)
+
+
+def _sort(table, query):
+    return table.sort_by(query.order_by) if query.order_by else table
+
+
+def run_query(dataset, query, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Run a query over a :class:`~hckr.utils.DatasetUtils.Dataset` as a single streaming pass, yields result as
+    DataFrames. Filter is pushed down to the scan ( Parquet row groups are skipped using their statistics ),
+    aggregates are computed per batch and combined, so memory depends on number of groups not rows.
+    ORDER BY with LIMIT keeps only top rows while scanning.
+    """
+    if query.aggregates:
+        partials, keys = _partials(query), query.group_by
+        needed = keys + sorted({column for _, column in partials if column})
+        combined = None
+        for table in dataset.tables(batch_size, query.where, needed or None):
+            partial = _aggregate(table, keys, partials)
+            if combined is not None:
+                partial = _aggregate(
+                    pa.concat_tables([combined, partial]), keys, partials, merge=True
+                )
+            combined = partial
+        if combined is None:  # no rows, aggregate over an empty table
+            empty = dataset.schema().empty_table()
+            combined = _aggregate(empty.select(needed), keys, partials)
+        result = _sort(_final(combined, query), query)
+        if query.limit is not None:
+            result = result.slice(0, query.limit)
+        yield result.to_pandas()
+        return
+
+    selected = (
+        None if query.columns is None else [column for column, _ in query.columns]
+    )
+    # renames are applied on result, so ORDER BY an alias is ordered by its column
+    aliases = {name: column for column, name in query.columns or []}
+    order_by = [
+        (aliases.get(column, column), order) for column, order in query.order_by
+    ]
+    extra = [
+        column
+        for column, _ in order_by
+        if selected is not None and column not in selected
+    ]
+    tables = dataset.tables(
+        batch_size, query.where, None if selected is None else selected + extra
+    )
+
+    def result(table):
+        if selected is not None:
+            table = table.select(selected).rename_columns(
+                [name for _, name in query.columns]
+            )
+        return table.to_pandas()
+
+    if order_by:
+        top = None
+        for table in tables:
+            top = table if top is None else pa.concat_tables([top, table])
+            if query.limit is not None and top.num_rows > query.limit:
+                top = top.take(pc.select_k_unstable(top, query.limit, order_by))
+        if top is None:
+            top = dataset.schema().empty_table()
+        top = top.sort_by(order_by)
+        yield result(top if query.limit is None else top.slice(0, query.limit))
+        return
+
+    rows, empty = 0, True
+    for table in tables:
+        if query.limit is not None:
+            table = table.slice(0, query.limit - rows)
+        rows += table.num_rows
+        empty = False
+        yield result(table)
+        if query.limit is not None and rows >= query.limit:
+            return
+    if empty:
+        # no rows, an empty result still has columns eg. so an output file is written with its schema
+        yield result(dataset.schema().empty_table())
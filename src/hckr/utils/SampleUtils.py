@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+
+from hckr.utils.DataUtils import (
+    BLOCK_FORMATS,
+    DEFAULT_BATCH_SIZE,
+    readFileBatches,
+    readFileBlocks,
+)
+
+
+def reservoir_sample(batches, size, seed=None):
+    """
+    Uniform random sample of ``size`` rows from DataFrame ``batches`` in a single pass, every row gets a random key
+    and rows with the smallest keys are kept, so memory is bounded by ``size`` rows for any number of batches.
+    Returns sampled rows in their original order and number of rows read.
+    """
+    rng = np.random.default_rng(seed)
+    sample, keys, rows = None, np.empty(0), 0
+    for df in batches:
+        batch_keys = rng.random(df.shape[0])
+        df = df.set_axis(pd.RangeIndex(rows, rows + df.shape[0]))  # original positions
+        rows += df.shape[0]
+        if len(keys) == size:
+            # only rows which can replace a sampled row are kept, usually a few per batch
+            selected = batch_keys < keys.max()
+            df, batch_keys = df[selected], batch_keys[selected]
+        sample = df if sample is None else pd.concat([sample, df])
+        keys = np.concatenate([keys, batch_keys])
+        if len(keys) > size:
+            kept = np.argpartition(keys, size)[:size]
+            sample, keys = sample.iloc[kept], keys[kept]
+    if sample is None:
+        return pd.DataFrame(), rows
+    return sample.sort_index().reset_index(drop=True), rows
+
+
+def bernoulli_sample(batches, fraction, seed=None):
+    """Every row of DataFrame ``batches`` is kept with probability ``fraction``"""
+    rng = np.random.default_rng(seed)
+    for df in batches:
+        yield df[rng.random(df.shape[0]) < fraction]
+
+
+def sampled_batches(
+    _format, FILE, fraction=None, seed=None, columns=None, batch_size=DEFAULT_BATCH_SIZE
+):
+    """
+    Batches of a file to sample rows from, with a ``fraction`` only that fraction of the file is read: blocks of
+    block formats ( Parquet row groups, Avro blocks, Feather record batches, ORC stripes ) are picked at random
+    and others are skipped, rows of other formats are picked at random while streaming.
+    Blocks of a file are of similar size, so picked blocks are a random ( cluster ) sample of rows.
+    """
+    if _format in BLOCK_FORMATS:
+        rng = np.random.default_rng(seed)
+        selected = None
+
+        def select(index, blocks):
+            nonlocal selected
+            if fraction is None:
+                return True
+            if blocks is None:  # Avro, number of blocks is not known
+                return rng.random() < fraction
+            if selected is None:
+                # at least one block, so a small fraction of a file with few blocks isn't empty
+                size = max(1, round(fraction * blocks))
+                selected = set(rng.choice(blocks, size, replace=False).tolist())
+            return index in selected
+
+        yield from readFileBlocks(_format, FILE, select, columns)
+        return
+    batches = readFileBatches(_format, FILE, batch_size)
+    if fraction is not None:
+        batches = bernoulli_sample(batches, fraction, seed)
+    for df in batches:
+        yield df if columns is None else df[columns]
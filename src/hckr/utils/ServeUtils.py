@@ -0,0 +1,285 @@
+import array
+import json
+import logging
+import os
+import select
+import signal
+import socket
+import struct
+import sys
+import threading
+
+from .config.Constants import HCKR_CACHE_DIR
+
+# NOTE: keep only standard library imports at module level, thin client ( hckrc ) imports this module
+
+SERVE_SOCKET_ENV = "HCKR_SOCKET"
+DEFAULT_SOCKET_PATH = HCKR_CACHE_DIR / "hckr.sock"
+STD_FDS = (0, 1, 2)  # stdin, stdout, stderr of the client, passed to server
+_LENGTH = struct.Struct("!I")
+
+
+def socket_path():
+    return os.environ.get(SERVE_SOCKET_ENV, str(DEFAULT_SOCKET_PATH))
+
+
+def send_message(conn, message, fds=()):
+    """Send a length prefixed JSON message, ``fds`` are passed along using SCM_RIGHTS"""
+    payload = json.dumps(message).encode()
+    data = _LENGTH.pack(len(payload)) + payload
+    ancillary = []
+    if fds:
+        ancillary = [
+            (socket.SOL_SOCKET, socket.SCM_RIGHTS, array.array("i", fds).tobytes())
+        ]
+    sent = conn.sendmsg([data], ancillary)
+    if sent < len(data):
+        conn.sendall(data[sent:])
+
+
+def receive_message(conn, max_fds=0):
+    """Receive a message sent by :func:`send_message`, returns ``(message, fds)``"""
+    fds = array.array("i")
+    data, ancillary, _, _ = conn.recvmsg(
+        64 * 1024, socket.CMSG_SPACE(max_fds * fds.itemsize) if max_fds else 0
+    )
+    for level, _type, cmsg_data in ancillary:
+        if level == socket.SOL_SOCKET and _type == socket.SCM_RIGHTS:
+            fds.frombytes(cmsg_data[: len(cmsg_data) - (len(cmsg_data) % fds.itemsize)])
+    if len(data) < _LENGTH.size:
+        raise ConnectionError("Connection closed before receiving a message")
+    (length,) = _LENGTH.unpack(data[: _LENGTH.size])
+    payload = data[_LENGTH.size :]
+    while len(payload) < length:
+        chunk = conn.recv(length - len(payload))
+        if not chunk:
+            raise ConnectionError("Connection closed while receiving a message")
+        payload += chunk
+    return json.loads(payload), list(fds)
+
+
+def server_running(path):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        try:
+            conn.connect(path)
+            return True
+        except OSError:
+            return False
+
+
+def run_remote(argv, path=None):
+    """
+    Run hckr command ``argv`` on a running ``hckr serve``, output is written by the server directly
+    to our stdout/stderr. Returns exit code, or ``None`` if server is not running.
+    """
+    path = path or socket_path()
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        conn.connect(path)
+    except OSError as e:
+        logging.debug(f"hckr server is not running at {path}\n{e}")
+        conn.close()
+        return None
+    with conn:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        request = {"argv": list(argv), "cwd": os.getcwd(), "env": dict(os.environ)}
+        send_message(conn, request, STD_FDS)
+        response, _ = receive_message(conn)
+        return response["exit_code"]
+
+
+def _exit_code(code):
+    if code is None:
+        return 0
+    return code if isinstance(code, int) else 1
+
+
+def _open_std_streams():
+    # new python streams for client's fds, so buffering ( eg. line buffering for terminals ) matches the client
+    return (
+        open(0, "r", encoding=sys.__stdin__.encoding, closefd=False),
+        open(1, "w", encoding=sys.__stdout__.encoding, closefd=False),
+        open(2, "w", encoding=sys.__stderr__.encoding, closefd=False),
+    )
+
+
+def _close_quietly(stream):
+    try:
+        stream.close()
+    except OSError as e:  # eg. client output piped to `head` which exited already
+        logging.debug(f"Unable to flush client stream\n{e}")
+
+
+def _run_command(cli, request, fds):
+    """
+    Run a request with client's stdin, stdout, stderr, working directory and environment in place of ours,
+    it runs in a forked child which exits after it, so nothing is restored
+    """
+    for stream in (sys.stdout, sys.stderr):
+        stream.flush()
+    for fd, client_fd in zip(STD_FDS, fds):
+        os.dup2(client_fd, fd)
+        os.close(client_fd)
+    sys.stdin, sys.stdout, sys.stderr = _open_std_streams()
+    os.chdir(request["cwd"])
+    os.environ.clear()
+    os.environ.update(request["env"])
+    _reset_console()
+    try:
+        cli.main(args=request["argv"], prog_name="hckr")
+        return 0
+    except SystemExit as e:
+        return _exit_code(e.code)
+    except Exception as e:
+        logging.exception(e)
+        return 1
+    finally:
+        # output is flushed before client gets the exit code
+        for stream in (sys.stdin, sys.stdout, sys.stderr):
+            _close_quietly(stream)
+
+
+def _reset_console():
+    # rich detects terminal capabilities ( colors, width ) once per console, so every client gets a new one
+    import rich
+
+    rich._console = None
+
+
+def _warm_up(group):
+    """Import all (lazy) subcommands, so they are loaded once for all the requests"""
+    import click
+
+    ctx = click.Context(group)
+    for name in group.list_commands(ctx):
+        command = group.get_command(ctx, name)
+        if isinstance(command, click.Group):
+            _warm_up(command)
+
+
+def _watch_disconnect(conn):
+    """
+    Exit once client disconnects ( eg. a killed ``hckrc data peek --follow`` ), cancelling its running command.
+    Client sends nothing after its request, so the socket becomes readable only on EOF / hang up
+    """
+    poller = select.poll()
+    poller.register(conn, select.POLLIN | select.POLLHUP | select.POLLERR)
+    poller.poll()
+    try:
+        disconnected = not conn.recv(1, socket.MSG_PEEK | socket.MSG_DONTWAIT)
+    except BlockingIOError:
+        disconnected = False
+    except OSError:
+        disconnected = True
+    if disconnected:
+        logging.debug("Client disconnected, cancelling its command")
+        os._exit(1)
+
+
+def _handle_request(cli, conn):
+    """Handle a request in a forked child, returns exit code of the child"""
+    try:
+        request, fds = receive_message(conn, max_fds=len(STD_FDS))
+        if len(fds) != len(STD_FDS):
+            for fd in fds:
+                os.close(fd)
+            raise ConnectionError(
+                f"Expected {len(STD_FDS)} file descriptors, got {len(fds)}"
+            )
+        threading.Thread(target=_watch_disconnect, args=(conn,), daemon=True).start()
+        exit_code = _run_command(cli, request, fds)
+        send_message(conn, {"exit_code": exit_code})
+        return exit_code
+    except (OSError, ValueError) as e:
+        logging.warning(f"Invalid request, ignoring\n{e}")
+        return 1
+
+
+def _serve_child(cli, server, conn):
+    # a child never returns to the accept loop, it only runs its request
+    try:
+        server.close()
+        signal.set_wakeup_fd(-1)
+        for signum in (signal.SIGTERM, signal.SIGCHLD):
+            signal.signal(signum, signal.SIG_DFL)
+        exit_code = _handle_request(cli, conn)
+    except BaseException as e:
+        logging.debug(f"Request failed\n{e}")
+        exit_code = 1
+    os._exit(exit_code)
+
+
+def _warm_caches():
+    """
+    Database engines and kubernetes api client are created in the server, so every forked command inherits them
+    instead of creating its own. Caches are only filled again once configs change.
+    """
+    from hckr.utils.DbUtils import warm_engines
+    from hckr.utils.k8s.K8sUtils import warm_api
+
+    for warm in (warm_engines, warm_api):
+        try:
+            warm()
+        except Exception as e:
+            logging.debug(f"Unable to warm up {warm.__name__}\n{e}")
+
+
+def _reap_children():
+    while True:
+        try:
+            pid, _ = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            return
+        if pid == 0:
+            return
+
+
+def serve(path, cli):
+    """
+    Serve hckr commands on a unix socket using ``cli`` as dispatcher, every request runs in a forked child so
+    requests run concurrently and a running command doesn't block the server. Returns on SIGTERM.
+    """
+    if server_running(path):
+        raise RuntimeError(f"hckr server is already running at {path}")
+    _warm_up(cli)
+    _warm_caches()
+    if os.path.exists(path):
+        os.unlink(path)  # stale socket from a previous server
+    # signals only wake up the accept loop, `kill` stops it gracefully so socket file is removed
+    stopping = threading.Event()
+    wakeup_read, wakeup_write = os.pipe()
+    os.set_blocking(wakeup_write, False)
+    signal.set_wakeup_fd(wakeup_write)
+    signal.signal(signal.SIGTERM, lambda *_: stopping.set())
+    signal.signal(signal.SIGCHLD, lambda *_: None)  # finished children are reaped
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        # only current user can run commands, socket is created with owner-only permissions
+        previous_umask = os.umask(0o177)
+        try:
+            server.bind(path)
+        finally:
+            os.umask(previous_umask)
+        server.listen()
+        logging.info(f"hckr server listening on {path}")
+        while not stopping.is_set():
+            ready, _, _ = select.select([server, wakeup_read], [], [])
+            if wakeup_read in ready:
+                os.read(wakeup_read, 1024)
+            _reap_children()
+            if server not in ready or stopping.is_set():
+                continue
+            conn, _ = server.accept()
+            _warm_caches()
+            with conn:
+                if os.fork() == 0:
+                    _serve_child(cli, server, conn)
+    finally:
+        signal.set_wakeup_fd(-1)
+        os.close(wakeup_read)
+        os.close(wakeup_write)
+        server.close()
+        if os.path.exists(path):
+            os.unlink(path)
@@ -0,0 +1,234 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa  # type: ignore
+import pyarrow.compute as pc  # type: ignore
+from pyarrow import parquet as pq  # type: ignore
+
+DEFAULT_QUANTILES = [0.25, 0.5, 0.75]
+HLL_PRECISION = 14  # 16384 registers, ~0.8% standard error
+TDIGEST_COMPRESSION = 200
+
+
+def _bit_length(values):
+    # bit length of uint64 values, halves are exact as float64 so frexp gives their bit length
+    high = (values >> np.uint64(32)).astype(np.float64)
+    low = (values & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    return np.where(high > 0, 32 + np.frexp(high)[1], np.frexp(low)[1])
+
+
+class HyperLogLog:
+    """Approximate distinct count of hashed values using fixed memory ( ``2 ** precision`` registers )"""
+
+    def __init__(self, precision=HLL_PRECISION):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add_hashes(self, hashes):
+        shift = np.uint64(64 - self.precision)
+        index = (hashes >> shift).astype(np.int64)
+        # guard bit keeps rank bounded when rest of the hash is zero
+        rest = (hashes << np.uint64(self.precision)) | np.uint64(
+            1 << (self.precision - 1)
+        )
+        rank = (65 - _bit_length(rest)).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def count(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.exp2(-self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(
+                m / zeros
+            )  # linear counting for small cardinalities
+        return int(round(estimate))
+
+
+class TDigest:
+    """
+    Approximate quantiles using a merging t-digest, values are merged into centroids which are small near
+    the tails and larger in the middle, so memory is bounded by ``compression``
+    """
+
+    def __init__(self, compression=TDIGEST_COMPRESSION):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, values):
+        if not len(values):
+            return
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        means = np.concatenate([self.means, values])
+        weights = np.concatenate([self.weights, np.ones(len(values))])
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order], weights[order]
+        cumulative = np.cumsum(weights)
+        q = (cumulative - weights / 2) / cumulative[-1]
+        # k1 scale function, centroids sharing integer part of k are merged
+        k = self.compression / (2 * math.pi) * np.arcsin(np.clip(2 * q - 1, -1, 1))
+        clusters = np.floor(k)
+        starts = np.flatnonzero(np.r_[True, np.diff(clusters) != 0])
+        self.weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / self.weights
+
+    def quantile(self, q):
+        if not len(self.weights):
+            return None
+        cumulative = np.cumsum(self.weights)
+        centers = (cumulative - self.weights / 2) / cumulative[-1]
+        x = np.concatenate([[0.0], centers, [1.0]])
+        y = np.concatenate([[self.min], self.means, [self.max]])
+        return float(np.interp(q, x, y))
+
+
+def _supports_min_max(_type):
+    return (
+        pa.types.is_integer(_type)
+        or pa.types.is_floating(_type)
+        or pa.types.is_temporal(_type)
+        or pa.types.is_string(_type)
+        or pa.types.is_large_string(_type)
+        or pa.types.is_boolean(_type)
+        or pa.types.is_decimal(_type)
+    )
+
+
+def _is_numeric(_type):
+    return pa.types.is_integer(_type) or pa.types.is_floating(_type)
+
+
+class ColumnStats:
+    """Single pass aggregates of a column, updated one batch at a time"""
+
+    def __init__(self, field, known=None):
+        self.field = field
+        self.known = known or {}  # nulls, min, max read from file metadata
+        self.rows = 0
+        self.nulls = 0
+        self.min = None
+        self.max = None
+        # mean and variance are combined across batches ( Chan et al. )
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.distinct = HyperLogLog()
+        self.digest = TDigest() if _is_numeric(field.type) else None
+
+    def update(self, array):
+        self.rows += len(array)
+        if "nulls" not in self.known:
+            self.nulls += array.null_count
+        if "min" not in self.known and _supports_min_max(array.type):
+            _min, _max = pc.min_max(array).values()
+            if _min.is_valid:
+                self.min = (
+                    _min.as_py() if self.min is None else min(self.min, _min.as_py())
+                )
+                self.max = (
+                    _max.as_py() if self.max is None else max(self.max, _max.as_py())
+                )
+        values = pc.drop_null(array)
+        if not len(values):
+            return
+        if self.digest is not None:
+            numbers = values.to_numpy().astype(np.float64)
+            numbers = numbers[~np.isnan(numbers)]
+            self._update_moments(numbers)
+            self.digest.add(numbers)
+        try:
+            hashes = pd.util.hash_array(values.to_numpy(zero_copy_only=False))
+            self.distinct.add_hashes(hashes)
+        except TypeError:  # unhashable values eg. lists
+            self.distinct = None
+
+    def _update_moments(self, numbers):
+        n = len(numbers)
+        if not n:
+            return
+        mean = float(numbers.mean())
+        m2 = float(((numbers - mean) ** 2).sum())
+        total = self.n + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta * delta * self.n * n / total
+        self.n = total
+
+    def result(self, quantiles=DEFAULT_QUANTILES):
+        nulls = self.known.get("nulls", self.nulls)
+        stats = {
+            "column": self.field.name,
+            "type": str(self.field.type),
+            "count": self.rows - nulls,
+            "nulls": nulls,
+            "distinct": None if self.distinct is None else self.distinct.count(),
+            "min": self.known.get("min", self.min),
+            "max": self.known.get("max", self.max),
+            "mean": _round(self.mean) if self.n else None,
+            "std": _round(math.sqrt(self.m2 / (self.n - 1))) if self.n > 1 else None,
+        }
+        for q in quantiles:
+            stats[quantile_name(q)] = (
+                None if self.digest is None else _round(self.digest.quantile(q))
+            )
+        return stats
+
+
+def _round(value, digits=6):
+    # approximate stats are shown with significant digits only
+    return None if value is None else float(f"{value:.{digits}g}")
+
+
+def quantile_name(q):
+    return f"p{q * 100:g}"
+
+
+def parquet_statistics(FILE):
+    """
+    Null count, min and max of columns from Parquet column chunk statistics, only columns which have
+    statistics in every row group are returned. Returns ``(rows, {column: {"nulls", "min", "max"}})``
+    """
+    metadata = pq.ParquetFile(FILE).metadata
+    columns = {}
+    for index in range(metadata.num_columns):
+        name = metadata.schema.column(index).path
+        if "." in name:
+            continue  # nested column
+        nulls, _min, _max, complete = 0, None, None, True
+        for group in range(metadata.num_row_groups):
+            row_group = metadata.row_group(group)
+            statistics = row_group.column(index).statistics
+            if statistics is None or not statistics.has_null_count:
+                complete = False
+                break
+            nulls += statistics.null_count
+            if statistics.has_min_max:
+                _min = statistics.min if _min is None else min(_min, statistics.min)
+                _max = statistics.max if _max is None else max(_max, statistics.max)
+            elif statistics.null_count < row_group.num_rows:
+                complete = False
+                break
+        if complete:
+            columns[name] = {"nulls": nulls, "min": _min, "max": _max}
+    return metadata.num_rows, columns
+
+
+def column_stats(tables, schema, quantiles=DEFAULT_QUANTILES, known=None):
+    """
+    Per column stats of arrow ``tables`` in a single pass: null count, min/max, mean/std, approximate distinct
+    count ( HyperLogLog ) and approximate ``quantiles`` ( t-digest ). ``known`` stats eg. from Parquet metadata
+    are not computed again.
+    """
+    known = known or {}
+    stats = [ColumnStats(field, known.get(field.name)) for field in schema]
+    for table in tables:
+        for column in stats:
+            if column.field.name in table.column_names:
+                column.update(table[column.field.name])
+    return pd.DataFrame([column.result(quantiles) for column in stats])
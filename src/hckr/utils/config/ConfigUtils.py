@@ -1,5 +1,6 @@
 import configparser
 import logging
+import os
 from pathlib import Path
 
 import click
@@ -43,6 +44,24 @@ def load_config(config_path: str):
     return config
 
 
+def get_default_setting(
+    key, env_var=None, default=None, config_path=DEFAULT_CONFIG_PATH
+):
+    """
+    Get a global hckr setting, environment variable ``env_var`` takes precedence over ``key`` in [DEFAULT] config.
+    Unlike :func:`get_config_value` this never fails, as it is used before running any command.
+    """
+    if env_var and os.environ.get(env_var) is not None:
+        return os.environ[env_var]
+    config = configparser.ConfigParser()
+    try:
+        config.read(config_path)
+    except configparser.Error as e:
+        logging.debug(f"Unable to read config {config_path} for setting {key}\n{e}")
+        return default
+    return config.get(DEFAULT_CONFIG, key, fallback=default)
+
+
 def config_exists(config_path) -> bool:
     """
     Check if config file exists and is not empty.
@@ -161,9 +180,24 @@ def _list_config_util(config, section):
         )
 
 
+def _print_config_records(config, sections):
+    records = []
+    for section in sections:
+        if section != DEFAULT_CONFIG and not config.has_section(section):
+            PError(
+                f"Config [yellow]\\[{section}][/yellow] not found\nAvailable configs: [yellow]{config.sections()}"
+            )
+        for key, value in config.items(section):
+            records.append({"section": section, "key": key, "value": value})
+    MessageUtils.print_records(records, ["section", "key", "value"])
+
+
 def list_config(config_path, section=DEFAULT_CONFIG, _all=False):
     config = load_config(config_path)
-    if _all:
+    if MessageUtils.output_format():
+        sections = [DEFAULT_CONFIG] + config.sections() if _all else [section]
+        _print_config_records(config, sections)
+    elif _all:
         MessageUtils.info("Listing all config")
         _list_config_util(config, DEFAULT_CONFIG)
         for section in config.sections():
@@ -4,6 +4,9 @@ from pathlib import Path
 DEFAULT_CONFIG_PATH = Path.home() / ".hckrcfg"
 DEFAULT_CONFIG = "DEFAULT"
 
+# local state of hckr, eg. last update check
+HCKR_CACHE_DIR = Path.home() / ".cache" / "hckr"
+
 
 class DBType(str, Enum):
     PostgreSQL = ("PostgreSQL",)
@@ -50,3 +53,28 @@ DB_WAREHOUSE = "warehouse"
 
 # SENTRY
 SENTRY_DSN = "https://b549c324ba6054fc68c4e3cd3bb146e4@o4507910058213376.ingest.us.sentry.io/4507910060572672"
+# settings are read from environment variable first and then [DEFAULT] config
+TELEMETRY = "telemetry"  # off/false/no/0 disables sentry completely
+TELEMETRY_ENV = "HCKR_TELEMETRY"
+SENTRY_TRACES_SAMPLE_RATE = "sentry_traces_sample_rate"
+SENTRY_TRACES_SAMPLE_RATE_ENV = "HCKR_SENTRY_TRACES_SAMPLE_RATE"
+SENTRY_PROFILES_SAMPLE_RATE = "sentry_profiles_sample_rate"
+SENTRY_PROFILES_SAMPLE_RATE_ENV = "HCKR_SENTRY_PROFILES_SAMPLE_RATE"
+SENTRY_FLUSH_TIMEOUT = 2  # seconds to wait for an error report to be sent
+
+# UPDATE CHECK, settings are read from environment variable first and then [DEFAULT] config
+UPDATE_CHECK_STATE_PATH = HCKR_CACHE_DIR / "update_check.json"
+# seconds between two checks, 0 disables the check
+UPDATE_CHECK_TTL = "update_check_ttl"
+UPDATE_CHECK_TTL_ENV = "HCKR_UPDATE_CHECK_TTL"
+UPDATE_CHECK_DEFAULT_TTL = 24 * 60 * 60
+UPDATE_CHECK_TIMEOUT = 1  # hard deadline (seconds) for a version check
+
+# DATA CACHE, columnar copies of parsed text data files, settings are read from environment variable first and then [DEFAULT] config
+DATA_CACHE_DIR = HCKR_CACHE_DIR / "data"
+DATA_CACHE = "data_cache"  # on/true/yes/1 enables the cache, it's off by default
+DATA_CACHE_ENV = "HCKR_DATA_CACHE"
+# least recently used copies are removed above this size
+DATA_CACHE_MAX_SIZE_MB = "data_cache_max_size_mb"
+DATA_CACHE_MAX_SIZE_MB_ENV = "HCKR_DATA_CACHE_MAX_SIZE_MB"
+DATA_CACHE_DEFAULT_MAX_SIZE_MB = 4 * 1024
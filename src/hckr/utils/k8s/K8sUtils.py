@@ -1,3 +1,5 @@
+import logging
+import os
 from datetime import datetime, timezone
 
 import rich
@@ -6,21 +8,61 @@ from rich.panel import Panel
 
 from ..MessageUtils import error, info
 
+# api clients by context and kube config modification time, reused across commands of a long living process
+# eg. `hckr serve`
+_API_CACHE: dict = {}
+
+
+def _kubeConfigMtime():
+    path = os.path.expanduser(
+        os.environ.get("KUBECONFIG", config.KUBE_CONFIG_DEFAULT_LOCATION).split(
+            os.pathsep
+        )[0]
+    )
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
 
 def _getApi(context):
+    key = (context, _kubeConfigMtime())
+    if key not in _API_CACHE:
+        _API_CACHE[key] = _loadApi(context)
+    return _API_CACHE[key]
+
+
+def _newApi(context):
+    if context:
+        config.load_kube_config(context=context)
+        return client.CoreV1Api(), context
+    config.load_kube_config()
+    _, currentContext = config.list_kube_config_contexts()
+    return client.CoreV1Api(), currentContext["name"]
+
+
+def _loadApi(context):
     try:
-        if context:
-            config.load_kube_config(context=context)
-            return client.CoreV1Api(), context
-        else:
-            config.load_kube_config()
-            _, currentContext = config.list_kube_config_contexts()
-            return client.CoreV1Api(), currentContext["name"]
+        return _newApi(context)
     except config.ConfigException as e:
         error(f"Error loading kube-config: \n{e}")
         exit(1)
 
 
+def warm_api():
+    """
+    Load api client of the default context, so commands forked by ``hckr serve`` inherit it instead of loading
+    kube config themselves. Kube config is loaded again only once it changes, errors are left to the commands.
+    """
+    key = (None, _kubeConfigMtime())
+    if key[1] is None or key in _API_CACHE:
+        return
+    try:
+        _API_CACHE[key] = _newApi(None)
+    except Exception as e:
+        logging.debug(f"Unable to load kube-config\n{e}")
+
+
 def _human_readable_age(start_time):
     now = datetime.now(timezone.utc)
     delta = now - start_time
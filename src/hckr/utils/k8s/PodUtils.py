@@ -10,7 +10,7 @@ from kubernetes.client.exceptions import ApiException  # type: ignore
 from yaspin import yaspin  # type: ignore
 
 from hckr.utils.DataUtils import print_df_as_table
-from hckr.utils.MessageUtils import error, info, colored, warning, success
+from hckr.utils.MessageUtils import error, info, colored, warning, success, spinner
 from hckr.utils.k8s.K8sUtils import _getApi, _human_readable_age
 import logging
 
@@ -32,9 +32,7 @@ def _getContainerName(coreApi, namespace, pod_name):
 
 
 def list_pods(context, namespace, count):
-    with yaspin(
-        text=f"Fetching pods for namespace {namespace}...", color="green", timer=True
-    ) as spinner:
+    with spinner(f"Fetching pods for namespace {namespace}...") as _spinner:
         coreApi, currentContext = _getApi(context)
         ret = coreApi.list_namespaced_pod(namespace)
         sorted_pods = sorted(
@@ -58,12 +56,13 @@ def list_pods(context, namespace, count):
                 }
             )
         df = pd.DataFrame(pods_info)
-        spinner.ok("✔")
+        _spinner.ok("✔")
 
     print_df_as_table(
-        df,
+        df.head(count),
         title=f"Pods in context: {currentContext}, namespace: {namespace}",
         count=count,
+        total_rows=df.shape[0],
     )
 
 
@@ -0,0 +1,47 @@
+from benchmarks.startup import (
+    compare_reports,
+    list_command_paths,
+    parse_importtime,
+    run_benchmark,
+)
+
+IMPORTTIME_OUTPUT = """import time: self [us] | cumulative | imported package
+import time:       100 |        100 |   _io
+import time:       300 |        500 |     click.core
+import time:       200 |        700 |   click
+import time:      1000 |       1800 | hckr.cli
+"""
+
+
+def test_list_command_paths():
+    paths = list_command_paths()
+    assert ("data", "peek") in paths
+    assert ("hash", "sha256") in paths
+    assert ("k8s", "pod", "show") in paths
+    assert ("repl",) not in paths
+
+
+def test_parse_importtime():
+    result = parse_importtime(IMPORTTIME_OUTPUT, top=2)
+    assert result["total_us"] == 1600
+    assert result["module_count"] == 4
+    assert result["top"] == [
+        {"module": "hckr.cli", "cumulative_us": 1800},
+        {"module": "click", "cumulative_us": 700},
+    ]
+
+
+def test_run_benchmark_and_compare():
+    report = run_benchmark([("hash", "md5")], repeat=1, top=3)
+    assert set(report["commands"]) == {"hckr --version", "hckr hash md5 -h"}
+    result = report["commands"]["hckr hash md5 -h"]
+    assert result["wall"]["median_ms"] > 0
+    assert "hckr.cli" in [m["module"] for m in result["imports"]["top"]]
+
+    baseline = {
+        "commands": {
+            "hckr hash md5 -h": {"wall": {"median_ms": result["wall"]["median_ms"] / 2}}
+        }
+    }
+    regressions = compare_reports(baseline, report, threshold=10)
+    assert [name for name, *_ in regressions] == ["hckr hash md5 -h"]
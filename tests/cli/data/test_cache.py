@@ -0,0 +1,165 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from click.testing import CliRunner
+
+from hckr.cli.data import cache, convert, peek, count
+from hckr.utils import CacheUtils
+from hckr.utils.DataUtils import readFile, readFileBatches
+from hckr.utils.FileUtils import FileFormat
+
+
+@pytest.fixture(autouse=True)
+def data_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(CacheUtils, "CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(CacheUtils, "MIN_CACHED_FILE_SIZE", 0)
+    monkeypatch.setenv("HCKR_DATA_CACHE", "on")
+    return tmp_path / "cache"
+
+
+def write_csv(path, rows=1000, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "id": np.arange(rows),
+            "value": rng.random(rows),
+            "name": [f"n{i}" for i in range(rows)],
+        }
+    )
+    df.to_csv(path, index=False)
+    return df
+
+
+def output(result):
+    # rich wraps long lines at terminal width
+    return " ".join(result.output.split())
+
+
+# POSITIVE
+def test_read_file_cached(tmp_path, data_cache):
+    df = write_csv(tmp_path / "values.csv")
+    first = readFile(FileFormat.CSV, str(tmp_path / "values.csv"))
+    assert len(list(data_cache.glob("*.arrow"))) == 1
+    with open(tmp_path / "values.csv", "rb") as f:
+        cached = readFile(FileFormat.CSV, f, nrows=5, columns=["name", "id"])
+    assert list(cached.columns) == ["name", "id"]
+    assert cached.id.tolist() == [0, 1, 2, 3, 4]
+    pd.testing.assert_frame_equal(first, df, check_dtype=False)
+    batches = list(readFileBatches(FileFormat.CSV, str(tmp_path / "values.csv"), 300))
+    assert [batch.shape[0] for batch in batches] == [300, 300, 300, 100]
+    [entry] = CacheUtils.entries()
+    assert entry["rows"] == 1000
+    assert entry["source"] == str(tmp_path / "values.csv")
+
+
+def test_cache_invalidated_on_change(tmp_path, data_cache):
+    write_csv(tmp_path / "values.csv")
+    readFile(FileFormat.CSV, str(tmp_path / "values.csv"))
+    write_csv(tmp_path / "values.csv", rows=10, seed=1)
+    assert readFile(FileFormat.CSV, str(tmp_path / "values.csv")).shape[0] == 10
+    # older copy of the file is replaced
+    [entry] = CacheUtils.entries()
+    assert entry["rows"] == 10
+    pd.testing.assert_frame_equal(
+        readFile(FileFormat.CSV, str(tmp_path / "values.csv")),
+        pd.read_csv(tmp_path / "values.csv"),
+        check_dtype=False,
+    )
+
+
+def test_cache_disabled(tmp_path, data_cache, monkeypatch):
+    monkeypatch.setenv("HCKR_DATA_CACHE", "off")
+    write_csv(tmp_path / "values.csv")
+    readFile(FileFormat.CSV, str(tmp_path / "values.csv"))
+    assert not data_cache.exists()
+
+
+def test_cache_eviction(tmp_path, data_cache):
+    for index in range(3):
+        write_csv(tmp_path / f"values_{index}.csv")
+        readFile(FileFormat.CSV, str(tmp_path / f"values_{index}.csv"))
+    entries = CacheUtils.entries()
+    assert len(entries) == 3
+    # least recently used copies are removed first
+    os.utime(data_cache / f"{entries[-1]['key']}.arrow", (0, 0))
+    assert CacheUtils.evict(entries[0]["cache_size"] * 2) == 1
+    sources = [entry["source"] for entry in CacheUtils.entries()]
+    assert entries[-1]["source"] not in sources
+    assert len(sources) == 2
+
+
+def test_data_cache_commands(tmp_path, data_cache):
+    write_csv(tmp_path / "values.csv")
+    runner = CliRunner()
+    result = runner.invoke(peek, ["-i", str(tmp_path / "values.csv")])
+    assert result.exit_code == 0
+    # peek reads only first rows, it doesn't parse the whole file to cache it
+    assert "Caching columnar copy" not in output(result)
+    assert CacheUtils.entries() == []
+    result = runner.invoke(
+        convert, ["-i", str(tmp_path / "values.csv"), "-o", tmp_path / "out.jsonl"]
+    )
+    assert result.exit_code == 0
+    assert "Caching columnar copy" in output(result)
+    result = runner.invoke(count, ["-i", str(tmp_path / "values.csv")])
+    assert "has 1000 rows" in output(result)
+    result = runner.invoke(peek, ["-i", str(tmp_path / "values.csv")])
+    assert "Reading cached columnar copy" in output(result)
+    result = runner.invoke(cache, ["ls"])
+    assert result.exit_code == 0
+    assert "Data Cache" in result.output
+    assert "1000" in result.output
+    result = runner.invoke(cache, ["clear"])
+    assert result.exit_code == 0
+    assert "Removed 1 cached files" in output(result)
+    assert CacheUtils.entries() == []
+
+
+def test_cache_key_includes_format_and_delimiter(tmp_path, data_cache):
+    df = write_csv(tmp_path / "values.csv")
+    df.to_csv(tmp_path / "values.csv", sep=";", index=False)
+    as_csv = readFile(FileFormat.CSV, str(tmp_path / "values.csv"))
+    as_txt = readFile(FileFormat.TXT, str(tmp_path / "values.csv"))
+    assert list(as_csv.columns) == ["id", "value", "name"]
+    assert list(as_txt.columns) == ["id;value;name"]
+    assert len(CacheUtils.entries()) == 2
+    # read again from their own copies
+    assert readFile(FileFormat.TXT, str(tmp_path / "values.csv")).equals(as_txt)
+    assert readFile(FileFormat.CSV, str(tmp_path / "values.csv")).equals(as_csv)
+
+
+# NEGATIVE
+def test_cache_mixed_types_not_cached(tmp_path, data_cache):
+    rows = [{"id": 1, "value": 1}] * 3 + [{"id": 2, "value": "text"}]
+    pd.DataFrame(rows).to_json(tmp_path / "values.jsonl", orient="records", lines=True)
+    df = readFile(FileFormat.JSONL, str(tmp_path / "values.jsonl"))
+    assert df.shape[0] == 4
+    assert CacheUtils.entries() == []
+    assert not list(data_cache.glob("*.tmp"))
+
+
+def test_data_cache_ls_empty():
+    runner = CliRunner()
+    result = runner.invoke(cache, ["ls"])
+    assert result.exit_code == 0
+    assert "is empty" in output(result)
+
+
+def test_cache_not_filled_by_first_rows(tmp_path, data_cache):
+    write_csv(tmp_path / "values.csv")
+    df = readFile(FileFormat.CSV, str(tmp_path / "values.csv"), nrows=5)
+    assert df.shape[0] == 5
+    assert CacheUtils.entries() == []
+
+
+def test_cache_skips_file_larger_than_cache(tmp_path, data_cache, monkeypatch):
+    write_csv(tmp_path / "values.csv")
+    # smaller than the file
+    monkeypatch.setenv("HCKR_DATA_CACHE_MAX_SIZE_MB", "0.001")
+    for _ in range(2):
+        df = readFile(FileFormat.CSV, str(tmp_path / "values.csv"))
+        assert df.shape[0] == 1000
+    assert CacheUtils.entries() == []
+    assert not data_cache.exists()
@@ -0,0 +1,253 @@
+import datetime
+import gzip
+import io
+import json
+import lzma
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa  # type: ignore
+import pytest
+from click.testing import CliRunner
+from pyarrow import parquet as pq  # type: ignore
+
+from hckr.cli.data import convert
+from hckr.utils.DataUtils import BatchWriter, readFile, readFileBatches
+from hckr.utils.FileUtils import FileFormat
+
+parent_directory = Path(__file__).parent.parent
+
+INPUT_DIR = parent_directory / "resources" / "data" / "peek"
+
+
+def input_file(_format):
+    return INPUT_DIR / f"input{FileFormat(_format).extension()}"
+
+
+# POSITIVE
+def test_data_convert_all_formats(tmp_path):
+    runner = CliRunner()
+    expected = readFile(str(FileFormat.CSV), input_file(FileFormat.CSV))
+    for _format in FileFormat.validFormats():
+        OUTPUT = tmp_path / f"output{FileFormat(_format).extension()}"
+        result = runner.invoke(
+            convert, ["-i", input_file(FileFormat.CSV), "-o", OUTPUT, "-b", 7]
+        )
+        print(result.output)
+        assert result.exit_code == 0
+        assert f"Converted 30 rows from csv to {_format} format" in result.output
+        df = readFile(_format, OUTPUT)
+        assert df.astype(str).equals(expected.astype(str))
+
+
+def test_data_convert_from_all_formats(tmp_path):
+    runner = CliRunner()
+    for _format in FileFormat.validFormats():
+        OUTPUT = tmp_path / f"{_format}.parquet"
+        result = runner.invoke(convert, ["-i", input_file(_format), "-o", OUTPUT])
+        print(result.output)
+        assert result.exit_code == 0
+        expected = readFile(_format, input_file(_format))
+        assert pq.read_table(OUTPUT).num_rows == expected.shape[0]
+
+
+def test_data_convert_parquet_options(tmp_path):
+    runner = CliRunner()
+    OUTPUT = tmp_path / "output.parquet"
+    result = runner.invoke(
+        convert,
+        ["-i", input_file(FileFormat.CSV), "-o", OUTPUT, "-b", 4]
+        + ["--row-group-size", 10, "--compression", "zstd"],
+    )
+    print(result.output)
+    assert result.exit_code == 0
+    metadata = pq.ParquetFile(OUTPUT).metadata
+    assert metadata.num_row_groups == 3
+    assert metadata.row_group(0).num_rows == 10
+    assert metadata.row_group(0).column(0).compression == "ZSTD"
+
+
+def test_data_convert_avro_codec(tmp_path):
+    runner = CliRunner()
+    OUTPUT = tmp_path / "output.data"
+    result = runner.invoke(
+        convert,
+        ["-i", input_file(FileFormat.PARQUET), "-o", OUTPUT]
+        + ["--output-format", "avro", "--avro-codec", "deflate"],
+    )
+    print(result.output)
+    assert result.exit_code == 0
+    assert readFile(str(FileFormat.AVRO), OUTPUT).shape[0] == 30
+
+
+def test_data_convert_compressed(tmp_path):
+    runner = CliRunner()
+    COMPRESSED = tmp_path / "output.jsonl.xz"
+    result = runner.invoke(
+        convert, ["-i", input_file(FileFormat.CSV), "-o", COMPRESSED]
+    )
+    print(result.output)
+    assert result.exit_code == 0
+    assert "Converted 30 rows from csv to jsonl format" in result.output
+    assert lzma.decompress(COMPRESSED.read_bytes()).count(b"\n") == 30
+    # and back from compressed file
+    OUTPUT = tmp_path / "output.parquet.gz"
+    result = runner.invoke(convert, ["-i", COMPRESSED, "-o", OUTPUT])
+    print(result.output)
+    assert result.exit_code == 0
+    assert "Format inferred: jsonl" in result.output
+    table = pq.read_table(io.BytesIO(gzip.decompress(OUTPUT.read_bytes())))
+    assert table.num_rows == 30
+
+
+def test_read_file_batches():
+    for _format in FileFormat.validFormats():
+        batches = list(readFileBatches(_format, input_file(_format), batch_size=4))
+        expected = readFile(_format, input_file(_format))
+        assert all(batch.shape[0] <= 4 for batch in batches)
+        assert sum(batch.shape[0] for batch in batches) == expected.shape[0]
+
+
+def test_data_convert_type_changes_between_batches(tmp_path):
+    # note is empty and amount is an integer in first batches
+    rows = [f"{i},{i}," for i in range(12)] + [
+        f"{i},{i}.5,late {i}" for i in range(12, 20)
+    ]
+    INPUT = tmp_path / "drift.csv"
+    INPUT.write_text("id,amount,note\n" + "\n".join(rows) + "\n")
+    runner = CliRunner()
+    for output in ["parquet", "avro", "feather", "orc", "parquet.gz"]:
+        OUTPUT = tmp_path / f"drift.{output}"
+        result = runner.invoke(convert, ["-i", INPUT, "-o", OUTPUT, "-b", 5])
+        print(result.output)
+        assert result.exit_code == 0
+        assert "Exception ignored" not in result.output
+        assert "Converted 20 rows" in result.output
+        if output == "parquet.gz":
+            df = pq.read_table(
+                io.BytesIO(gzip.decompress(OUTPUT.read_bytes()))
+            ).to_pandas()
+        else:
+            df = readFile(output, OUTPUT)
+        assert df.shape == (20, 3)
+        assert df["amount"].tolist()[10:14] == [10.0, 11.0, 12.5, 13.5]
+        assert df["note"].isna().sum() == 12
+        assert df["note"].iloc[-1] == "late 19"
+    assert not list(tmp_path.glob("*.tmp")) and not list(tmp_path.glob("*.old"))
+
+
+def test_data_convert_dates(tmp_path):
+    INPUT = tmp_path / "dates.parquet"
+    dates = [datetime.date(2024, 1, day) for day in range(1, 4)]
+    table = pa.table(
+        {
+            "day": pa.array(dates + [None], pa.date32()),
+            "at": pa.array([datetime.time(9, 30, 15)] * 3 + [None], pa.time64("us")),
+            "ts": pa.array([datetime.datetime(2024, 1, 1, 12)] * 4, pa.timestamp("us")),
+        }
+    )
+    pq.write_table(table, INPUT)
+    runner = CliRunner()
+    # ORC has no time type
+    for output in ["avro", "parquet", "feather", "csv"]:
+        OUTPUT = tmp_path / f"dates.{output}"
+        result = runner.invoke(convert, ["-i", INPUT, "-o", OUTPUT])
+        print(result.output)
+        assert result.exit_code == 0
+        assert "Converted 4 rows" in result.output
+        df = readFile(output, OUTPUT)
+        assert df.shape == (4, 3)
+        assert str(df["day"].iloc[2]).startswith("2024-01-03")
+    df = readFile("avro", tmp_path / "dates.avro")
+    assert df["day"].tolist()[:3] == dates
+    assert df["at"].iloc[0] == datetime.time(9, 30, 15)
+
+
+def test_data_convert_json_float_precision(tmp_path):
+    INPUT = tmp_path / "floats.csv"
+    INPUT.write_text("id,value\n1,0.4462532365091366\n2,\n3,2.5\n")
+    runner = CliRunner()
+    for output in ["jsonl", "json"]:
+        OUTPUT = tmp_path / f"floats.{output}"
+        result = runner.invoke(convert, ["-i", INPUT, "-o", OUTPUT])
+        print(result.output)
+        assert result.exit_code == 0
+        text = OUTPUT.read_text()
+        if output == "jsonl":
+            records = [json.loads(line) for line in text.splitlines()]
+        else:
+            records = json.loads(text)
+        values = [record["value"] for record in records]
+        assert values == [0.4462532365091366, None, 2.5]
+
+
+# NEGATIVE
+def test_data_convert_invalid_output_format(tmp_path):
+    runner = CliRunner()
+    result = runner.invoke(
+        convert,
+        ["-i", input_file(FileFormat.CSV), "-o", tmp_path / "output.data"]
+        + ["--output-format", "dvs"],
+    )
+    print(result.output)
+    assert result.exit_code == 1
+    assert "Invalid file format dvs" in result.output
+
+
+def test_data_convert_input_file_not_found(tmp_path):
+    runner = CliRunner()
+    result = runner.invoke(
+        convert, ["-i", "invalid.csv", "-o", tmp_path / "output.parquet"]
+    )
+    print(result.output)
+    assert result.exit_code == 1
+    assert "Some error occurred while converting" in result.output
+
+
+def test_data_convert_failure_removes_output(tmp_path):
+    INPUT = tmp_path / "times.parquet"
+    pq.write_table(
+        pa.table({"at": pa.array([datetime.time(9, 30)], pa.time64("us"))}), INPUT
+    )
+    runner = CliRunner()
+    # ORC has no time type
+    for output in ["times.orc", "times.orc.gz"]:
+        result = runner.invoke(convert, ["-i", INPUT, "-o", tmp_path / output])
+        print(result.output)
+        assert result.exit_code == 1
+        assert "Some error occurred while converting" in result.output
+        assert not (tmp_path / output).exists()
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_batch_writer_error_removes_output(tmp_path):
+    OUTPUT = tmp_path / "output.json"
+    with pytest.raises(RuntimeError):
+        with BatchWriter(FileFormat.JSON, OUTPUT) as writer:
+            writer.write(pd.DataFrame({"id": [1, 2]}))
+            raise RuntimeError("interrupted")
+    assert not OUTPUT.exists()
+
+
+def test_batch_writer_stream_type_change():
+    stream = io.BytesIO()
+    with pytest.raises(ValueError, match="amount: int64 -> double"):
+        with BatchWriter(FileFormat.PARQUET, stream) as writer:
+            writer.write(pd.DataFrame({"amount": [1, 2]}))
+            writer.write(pd.DataFrame({"amount": [1.5]}))
+
+
+def test_batch_writer_no_batches(tmp_path):
+    with BatchWriter(FileFormat.PARQUET, tmp_path / "output.parquet") as writer:
+        pass
+    assert not writer.written
+    assert not (tmp_path / "output.parquet").exists()
+
+
+def test_batch_writer_csv_empty_first_batch(tmp_path):
+    OUTPUT = tmp_path / "output.csv"
+    with BatchWriter(FileFormat.CSV, OUTPUT) as writer:
+        writer.write(pd.DataFrame({"a": pd.Series([], dtype="int64")}))
+        writer.write(pd.DataFrame({"a": [1, 2]}))
+    # header is written once
+    assert OUTPUT.read_text().splitlines() == ["a", "1", "2"]
@@ -0,0 +1,83 @@
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from hckr.cli.data import count
+from hckr.utils.DataUtils import BatchWriter, countRows, readFile
+from hckr.utils.FakerUtils import fake_batches
+from hckr.utils.FileUtils import FileFormat
+
+parent_directory = Path(__file__).parent.parent
+
+INPUT_DIR = parent_directory / "resources" / "data" / "peek"
+
+
+def input_file(_format):
+    return INPUT_DIR / f"input{FileFormat(_format).extension()}"
+
+
+# POSITIVE
+def test_data_count_all_formats():
+    runner = CliRunner()
+    for _format in FileFormat.validFormats():
+        FILE = input_file(_format)
+        rows = readFile(_format, FILE).shape[0]
+        result = runner.invoke(count, ["-i", FILE])
+        print(result.output)
+        assert result.exit_code == 0
+        assert f"has {rows} rows" in result.output
+
+
+def test_data_count_tsv_with_workers():
+    runner = CliRunner()
+    result = runner.invoke(count, ["-i", INPUT_DIR / "TabSep.tsv", "-w", 4])
+    print(result.output)
+    assert result.exit_code == 0
+    assert "has 2902 rows" in result.output
+
+
+def test_count_rows_multiline_values(tmp_path):
+    # addresses have newlines, which are quoted in csv
+    schema = {"address": "address", "name": "name"}
+    for _format in [str(FileFormat.CSV), str(FileFormat.JSONL), str(FileFormat.AVRO)]:
+        FILE = tmp_path / f"output{FileFormat(_format).extension()}"
+        with BatchWriter(_format, FILE) as writer:
+            for batch in fake_batches(schema, 200, batch_size=30):
+                writer.write(batch)
+        for workers in [1, 3]:
+            assert countRows(_format, FILE, workers) == 200
+
+
+def test_count_rows_empty_file(tmp_path):
+    FILE = tmp_path / "empty.csv"
+    FILE.write_text("")
+    assert countRows(str(FileFormat.CSV), FILE) == 0
+
+
+def test_data_count_compressed(tmp_path):
+    runner = CliRunner()
+    for _format, compression in [(FileFormat.CSV, ".gz"), (FileFormat.AVRO, ".zst")]:
+        FILE = tmp_path / f"input{_format.extension()}{compression}"
+        with BatchWriter(str(_format), FILE) as writer:
+            writer.write(readFile(str(_format), input_file(_format)))
+        result = runner.invoke(count, ["-i", FILE, "-w", 2])
+        print(result.output)
+        assert result.exit_code == 0
+        assert "has 30" in result.output
+
+
+# NEGATIVE
+def test_data_count_input_file_not_found():
+    runner = CliRunner()
+    result = runner.invoke(count, ["-i", "invalid.csv"])
+    print(result.output)
+    assert result.exit_code == 1
+    assert "Some error occurred while counting rows" in result.output
+
+
+def test_data_count_incompatible_format():
+    runner = CliRunner()
+    result = runner.invoke(count, ["-i", INPUT_DIR / "input.csv", "-f", "avro"])
+    print(result.output)
+    assert result.exit_code == 1
+    assert "is not an Avro file" in result.output
@@ -0,0 +1,156 @@
+import json
+from pathlib import Path
+
+import pandas as pd
+from click.testing import CliRunner
+from pyarrow import parquet as pq  # type: ignore
+
+from hckr.cli import cli
+from hckr.cli.data import convert, count, peek
+from hckr.utils.DataUtils import BatchWriter, readFile
+from hckr.utils.DatasetUtils import Dataset, dataset_files, is_dataset
+from hckr.utils.FileUtils import FileFormat
+
+parent_directory = Path(__file__).parent.parent
+
+INPUT_DIR = parent_directory / "resources" / "data" / "peek"
+
+
+def write_dataset(path):
+    """Partitioned dataset year=2023|2024/month=1 with parts of different formats, 10 rows in each part"""
+    df = readFile(str(FileFormat.CSV), INPUT_DIR / "input.csv")
+    parts = [
+        ("year=2023/month=1", FileFormat.PARQUET),
+        ("year=2023/month=1", FileFormat.AVRO),
+        ("year=2024/month=1", FileFormat.PARQUET),
+        ("year=2024/month=1", FileFormat.CSV),
+    ]
+    for index, (partition, _format) in enumerate(parts):
+        directory = path / partition
+        directory.mkdir(parents=True, exist_ok=True)
+        with BatchWriter(
+            str(_format), directory / f"part-{index}{_format.extension()}"
+        ) as writer:
+            writer.write(df.iloc[index * 5 : index * 5 + 10])
+    (path / "_SUCCESS").write_text("")
+    return path
+
+
+def output(result):
+    return " ".join(result.output.split())  # long paths are wrapped
+
+
+# POSITIVE
+def test_dataset_files(tmp_path):
+    path = write_dataset(tmp_path / "dataset")
+    assert is_dataset(path)
+    assert is_dataset(str(path / "*" / "*" / "*.parquet"))
+    assert not is_dataset(INPUT_DIR / "input.csv")
+    assert len(dataset_files(path)) == 4  # _SUCCESS is ignored
+    assert len(dataset_files(str(path / "year=2024" / "*" / "*"))) == 2
+
+
+def test_dataset_partitions(tmp_path):
+    dataset = Dataset(str(write_dataset(tmp_path / "dataset")))
+    assert dataset.formats == ["avro", "csv", "parquet"]
+    assert set(dataset.columns()) == {"name", "address", "email", "year", "month"}
+    assert dataset.count() == 40
+    df = dataset.head(15, columns=["name", "year"])
+    assert list(df.columns) == ["name", "year"]
+    assert df.shape[0] == 15
+    assert sum(batch.shape[0] for batch in dataset.batches(batch_size=3)) == 40
+
+    pruned = Dataset(str(tmp_path / "dataset"), partitions={"year": "2024"})
+    assert pruned.count() == 20
+    assert set(pruned.head(40, columns=["year"])["year"].astype(str)) == {"2024"}
+
+
+def test_data_peek_dataset(tmp_path):
+    runner = CliRunner()
+    path = write_dataset(tmp_path / "dataset")
+    result = runner.invoke(peek, ["-i", path, "-c", 3, "--columns", "name,year"])
+    print(result.output)
+    assert result.exit_code == 0
+    assert "of 4 files" in output(result)
+    assert "more than 3 rows" in result.output
+
+
+def test_data_count_dataset(tmp_path):
+    runner = CliRunner()
+    path = write_dataset(tmp_path / "dataset")
+    result = runner.invoke(count, ["-i", str(path / "*" / "*" / "*.parquet")])
+    print(result.output)
+    assert result.exit_code == 0
+    assert "has 20 rows in 2 files" in output(result)
+    result = runner.invoke(count, ["-i", path, "--partition", "year=2023"])
+    print(result.output)
+    assert result.exit_code == 0
+    assert "has 20 rows in 4 files" in output(result)
+
+
+def test_data_convert_dataset(tmp_path):
+    runner = CliRunner()
+    path = write_dataset(tmp_path / "dataset")
+    OUTPUT = tmp_path / "output.parquet"
+    result = runner.invoke(convert, ["-i", path, "-o", OUTPUT, "-b", 4])
+    print(result.output)
+    assert result.exit_code == 0
+    assert "Converted 40 rows from avro,csv,parquet to parquet format" in output(result)
+    df = pq.read_table(OUTPUT).to_pandas()
+    assert df.shape == (40, 5)
+    assert sorted(pd.unique(df["year"].astype(str))) == ["2023", "2024"]
+
+
+def test_data_query_dataset_mixed_formats(tmp_path):
+    runner = CliRunner()
+    path = write_dataset(tmp_path / "dataset")
+    result = runner.invoke(
+        cli,
+        ["--output", "json", "data", "query", "-i", path]
+        + ["select year, count(*) as n group by year order by year"],
+        env={"HCKR_UPDATE_CHECK_TTL": "0"},
+    )
+    print(result.output)
+    assert result.exit_code == 0
+    assert json.loads(result.stdout) == [
+        {"year": 2023, "n": 20},
+        {"year": 2024, "n": 20},
+    ]
+    # avro only partition, partition values are typed as in other formats
+    dataset = Dataset(str(path), partitions={"year": "2023"})
+    assert dataset.others and all(
+        table.schema.field("year").type == dataset.arrow.schema.field("year").type
+        for table in dataset.tables()
+    )
+
+
+# NEGATIVE
+def test_data_peek_dataset_no_files(tmp_path):
+    runner = CliRunner()
+    result = runner.invoke(peek, ["-i", str(tmp_path / "*.parquet")])
+    print(result.output)
+    assert result.exit_code == 1
+    assert "No files found for dataset" in result.output
+
+
+def test_data_count_dataset_invalid_partition(tmp_path):
+    runner = CliRunner()
+    path = write_dataset(tmp_path / "dataset")
+    result = runner.invoke(count, ["-i", path, "--partition", "day=1"])
+    print(result.output)
+    assert result.exit_code == 1
+    assert "Partition day not found" in result.output
+    result = runner.invoke(count, ["-i", path, "--partition", "year"])
+    assert result.exit_code == 1
+    assert "Invalid partition year" in result.output
+
+
+def test_dataset_invalid_partition_other_formats(tmp_path):
+    runner = CliRunner()
+    path = write_dataset(tmp_path / "dataset")
+    result = runner.invoke(
+        count, ["-i", str(path / "*" / "*" / "*.avro"), "--partition", "day=1"]
+    )
+    print(result.output)
+    assert result.exit_code == 1
+    assert "Partition day not found" in output(result)
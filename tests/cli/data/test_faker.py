@@ -1,11 +1,17 @@
+import gzip
+import io
+import json
 from pathlib import Path
 
+import pandas as pd
 import pyarrow as pa  # type: ignore
 from click.testing import CliRunner
 from pyarrow import parquet as pq  # type: ignore
 
+from hckr.cli import cli
 from hckr.cli.data import faker
 from hckr.utils.DataUtils import readFile
+from hckr.utils.FakerUtils import IN_FLIGHT_PER_WORKER, _map
 from hckr.utils.FileUtils import (
     delete_path_if_exists,
     FileFormat,
@@ -148,3 +154,230 @@ def test_data_faker_schema_file_not_found():
         """Error: Invalid value for '-s' / '--schema': Path 'not_found.json' does not exist."""
         in result.output
     )
+
+
+def test_data_faker_batches():
+    runner = CliRunner()
+    for _format in FileFormat.validFormats():
+        FILE = (
+            OUTPUT_DIR
+            / f"output.{'xlsx' if _format == str(FileFormat.EXCEL) else _format}"
+        )
+        delete_path_if_exists(FILE)
+        result = runner.invoke(
+            faker, ["-s", SCHEMA_FILE, "-o", FILE, "-c", 10, "-b", 3]
+        )
+        print(result.output)
+        assert result.exit_code == 0
+        assert "Data has total 10 rows and 6 columns" in result.output
+        df = readFile(_format, FILE)
+        assert df.shape == (10, 6)
+        assert df["user_email"].notnull().all()
+    # every batch is a row group
+    assert pq.ParquetFile(OUTPUT_DIR / "output.parquet").num_row_groups == 4
+
+
+def test_data_faker_seed_same_for_any_workers():
+    runner = CliRunner()
+    outputs = []
+    for workers in [1, 2]:
+        FILE = OUTPUT_DIR / f"output.csv"
+        delete_path_if_exists(FILE)
+        result = runner.invoke(
+            faker,
+            ["-s", SCHEMA_FILE, "-o", FILE, "-c", 10, "-b", 4, "--seed", 42]
+            + ["-w", workers],
+        )
+        print(result.output)
+        assert result.exit_code == 0
+        outputs.append(readFile(str(FileFormat.CSV), FILE))
+    assert outputs[0].equals(outputs[1])
+
+
+def test_data_faker_unseeded_workers_distinct_shards(tmp_path):
+    runner = CliRunner()
+    FILE = tmp_path / "output.csv"
+    result = runner.invoke(
+        faker, ["-s", SCHEMA_FILE, "-o", FILE, "-c", 8, "-b", 2, "-w", 4]
+    )
+    print(result.output)
+    assert result.exit_code == 0
+    df = readFile(str(FileFormat.CSV), FILE)
+    shards = [
+        df.iloc[start : start + 2].reset_index(drop=True) for start in range(0, 8, 2)
+    ]
+    # every worker generates its own rows
+    assert not any(
+        shards[i].equals(shards[j]) for i in range(4) for j in range(i + 1, 4)
+    )
+
+
+def test_map_bounds_items_in_flight():
+    pulled = []
+
+    def items():
+        for item in range(-30, 0):
+            pulled.append(item)
+            yield item
+
+    workers = 2
+    for consumed, result in enumerate(_map(abs, items(), workers)):
+        assert result == 30 - consumed  # in order
+        # results of a slow consumer don't pile up
+        assert len(pulled) <= consumed + 1 + workers * IN_FLIGHT_PER_WORKER
+
+
+def test_data_faker_part_files():
+    runner = CliRunner()
+    OUTPUT = OUTPUT_DIR / "parts"
+    for _format in FileFormat.validFormats():
+        result = runner.invoke(
+            faker,
+            ["-s", SCHEMA_FILE, "-o", OUTPUT, "-f", _format, "-c", 10, "-b", 4]
+            + ["-w", 2, "--part-files"],
+        )
+        print(result.output)
+        assert result.exit_code == 0
+        assert "Data has total 10 rows and 6 columns" in result.output
+        parts = sorted(OUTPUT.glob(f"part-*{FileFormat(_format).extension()}"))
+        assert [part.name for part in parts] == [
+            f"part-0000{index}{FileFormat(_format).extension()}" for index in range(3)
+        ]
+        assert sum(readFile(_format, part).shape[0] for part in parts) == 10
+        for part in parts:
+            delete_path_if_exists(part)
+    delete_path_if_exists(OUTPUT)
+
+
+def test_data_faker_part_files_without_format():
+    runner = CliRunner()
+    result = runner.invoke(
+        faker, ["-s", SCHEMA_FILE, "-o", OUTPUT_DIR / "parts", "--part-files"]
+    )
+    print(result.output)
+    assert result.exit_code == 1
+    assert "Please provide format using -f / --format option" in result.output
+
+
+def test_data_faker_provider_arguments(tmp_path):
+    schema = tmp_path / "schema.json"
+    schema.write_text('{"id": "pyint:1:5", "created": "date_time_between:-30y:now"}')
+    FILE = tmp_path / "output.csv"
+    runner = CliRunner()
+    result = runner.invoke(faker, ["-s", schema, "-o", FILE, "-c", 20])
+    print(result.output)
+    assert result.exit_code == 0
+    df = readFile(str(FileFormat.CSV), FILE)
+    assert df["id"].between(1, 5).all()
+
+
+def test_data_faker_string_provider_arguments(tmp_path):
+    # arguments of providers taking strings are not parsed as literals
+    schema = tmp_path / "schema.json"
+    schema.write_text('{"code": "numerify:123", "ref": "bothify:0#?"}')
+    FILE = tmp_path / "output.json"
+    runner = CliRunner()
+    result = runner.invoke(faker, ["-s", schema, "-o", FILE, "-c", 20])
+    print(result.output)
+    assert result.exit_code == 0
+    records = json.loads(FILE.read_text())
+    assert all(record["code"] == "123" for record in records)
+    assert all(
+        isinstance(record["ref"], str) and record["ref"].startswith("0")
+        for record in records
+    )
+
+
+def test_data_faker_invalid_provider_arguments(tmp_path):
+    schema = tmp_path / "schema.json"
+    schema.write_text('{"id": "pyint:1:5:6:7:8"}')
+    FILE = tmp_path / "output.csv"
+    runner = CliRunner()
+    result = runner.invoke(faker, ["-s", schema, "-o", FILE, "-c", 20])
+    print(result.output)
+    assert result.exit_code == 1
+    assert (
+        "Invalid arguments [1, 5, 6, '7', '8'] for Faker method pyint" in result.output
+    )
+    assert not FILE.exists()
+
+
+def test_data_faker_stdout():
+    runner = CliRunner()
+    result = runner.invoke(
+        faker, ["-s", SCHEMA_FILE, "-o", "-", "-c", 10, "-b", 3, "--seed", 42]
+    )
+    print(result.stderr)
+    assert result.exit_code == 0
+    df = pd.read_csv(io.StringIO(result.stdout))
+    assert df.shape == (10, 6)
+    assert "10 rows written to stdout in csv format" in result.stderr
+    assert "Data has total" not in result.output  # no preview for stdout
+
+
+def test_data_faker_stdout_jsonl():
+    runner = CliRunner()
+    result = runner.invoke(faker, ["-s", SCHEMA_FILE, "-o", "-", "-f", "jsonl"])
+    assert result.exit_code == 0
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    assert len(records) == 10
+    assert "user_email" in records[0]
+
+
+def test_data_faker_stdout_feather():
+    runner = CliRunner()
+    result = runner.invoke(faker, ["-s", SCHEMA_FILE, "-o", "-", "-f", "feather"])
+    assert result.exit_code == 0
+    table = pa.ipc.open_file(pa.BufferReader(result.stdout_bytes)).read_all()
+    assert table.num_rows == 10
+    assert "user_email" in table.column_names
+
+
+def test_data_faker_stdout_excel():
+    runner = CliRunner()
+    result = runner.invoke(faker, ["-s", SCHEMA_FILE, "-o", "-", "-f", "excel"])
+    assert result.exit_code == 1
+    assert "Excel format can't be written to a stream" in result.stderr
+    assert result.stdout == ""
+
+
+def test_data_faker_compressed_output(tmp_path):
+    FILE = tmp_path / "output.csv.gz"
+    runner = CliRunner()
+    result = runner.invoke(faker, ["-s", SCHEMA_FILE, "-o", FILE, "-c", 20, "-b", 7])
+    print(result.output)
+    assert result.exit_code == 0
+    assert "in csv format" in result.output
+    df = pd.read_csv(io.BytesIO(gzip.decompress(FILE.read_bytes())))
+    assert df.shape == (20, 6)
+
+
+def test_data_faker_compressed_excel(tmp_path):
+    runner = CliRunner()
+    result = runner.invoke(faker, ["-s", SCHEMA_FILE, "-o", tmp_path / "out.xlsx.gz"])
+    assert result.exit_code == 1
+    assert "Excel files are already compressed" in result.output
+
+
+def test_data_faker_no_preview(tmp_path):
+    FILE = tmp_path / "output.csv"
+    runner = CliRunner()
+    result = runner.invoke(faker, ["-s", SCHEMA_FILE, "-o", FILE, "--no-preview"])
+    assert result.exit_code == 0
+    assert "Data has total" not in result.output
+    assert readFile(str(FileFormat.CSV), FILE).shape[0] == 10
+
+
+def test_data_faker_output_json(tmp_path):
+    FILE = tmp_path / "output.csv"
+    runner = CliRunner()
+    result = runner.invoke(
+        cli,
+        ["--output", "json", "data", "faker", "-s", SCHEMA_FILE, "-o", FILE],
+        env={"HCKR_UPDATE_CHECK_TTL": "0"},
+    )
+    print(result.output)
+    assert result.exit_code == 0
+    # messages and output file panel are written to stderr
+    assert "File Output" not in result.stdout
+    assert str(FILE) in result.stderr
@@ -1,13 +1,35 @@
+import gzip
+import json
+import os
+import threading
+import time
 from pathlib import Path
 
+import fastavro
+import pandas as pd
 import pyarrow as pa  # type: ignore
 from click.testing import CliRunner
 from pyarrow import parquet as pq  # type: ignore
 
+from hckr.cli import cli
 from hckr.cli.data import peek
+from hckr.utils.DataUtils import (
+    readFile,
+    readColumns,
+    readFileBlocks,
+    readFileTail,
+    _format_cells,
+    MAX_CELL_LENGTH,
+)
 from hckr.utils.FileUtils import (
     FileFormat,
+    detect_file_format,
+    open_compressed,
+    COMPATIBLE_FORMATS,
+    COMPRESSION_EXTENSIONS,
 )
+from hckr.utils.FollowUtils import _Poller, follow_records, parse_records
+from hckr.utils.SampleUtils import reservoir_sample
 
 parent_directory = Path(__file__).parent.parent
 
@@ -15,6 +37,10 @@ INPUT_DIR = parent_directory / "resources" / "data" / "peek"
 INPUT_CSV_FILE = INPUT_DIR / "input.csv"
 
 
+def input_file(_format):
+    return INPUT_DIR / f"input{FileFormat(_format).extension()}"
+
+
 def peekUtil(_format, _count=None):
     runner = CliRunner()
     DEFAULT_COUNT = 10
@@ -67,7 +93,7 @@ def test_data_peek_with_large_cols():
     result = runner.invoke(peek, ["-i", INPUT_DIR / "Account.csv"])
     print(result.output)
     assert (
-        "Data has total 13 rows and 61 columns, showing first 10 rows and 10 columns"
+        "Data has more than 10 rows and 61 columns, showing first 10 rows"
         in result.output
     )
 
@@ -77,7 +103,8 @@ def test_data_peek_with_tsv_format():
     result = runner.invoke(peek, ["-i", INPUT_DIR / "TabSep.tsv"])
     print(result.output)
     assert (
-        "Data has total 2902 rows and 6 columns, showing first 10 rows" in result.output
+        "Data has more than 10 rows and 6 columns, showing first 10 rows"
+        in result.output
     )
 
 
@@ -86,7 +113,8 @@ def test_data_peek_with_text_format():
     result = runner.invoke(peek, ["-i", INPUT_DIR / "simple.text"])
     print(result.output)
     assert (
-        "Data has total 29 rows and 1 columns, showing first 10 rows" in result.output
+        "Data has more than 10 rows and 1 columns, showing first 10 rows"
+        in result.output
     )
 
 
@@ -99,7 +127,514 @@ def test_data_peek_with_json_lines():
     assert "Data has total 3 rows and 4 columns, showing first 3 rows" in result.output
 
 
+def test_data_peek_all_rows():
+    runner = CliRunner()
+    result = runner.invoke(peek, ["-i", INPUT_DIR / "simple.text", "-c", 29])
+    print(result.output)
+    assert (
+        "Data has total 29 rows and 1 columns, showing first 29 rows" in result.output
+    )
+
+
+def test_read_file_bounded():
+    for _format in FileFormat.validFormats():
+        FILE = (
+            INPUT_DIR
+            / f"input.{'xlsx' if _format == str(FileFormat.EXCEL) else _format}"
+        )
+        full = readFile(_format, FILE)
+        head = readFile(_format, FILE, nrows=5)
+        assert head.shape == (5, full.shape[1])
+        assert head.astype(str).equals(full.head(5).astype(str))
+
+
+def test_read_parquet_bounded_across_row_groups(tmp_path):
+    FILE = tmp_path / "input.parquet"
+    table = pa.table({"id": list(range(10))})
+    pq.write_table(table, FILE, row_group_size=3)
+    df = readFile(str(FileFormat.PARQUET), FILE, nrows=7)
+    assert df["id"].tolist() == list(range(7))
+
+
+def test_data_peek_columns():
+    runner = CliRunner()
+    for _format in FileFormat.validFormats():
+        FILE = (
+            INPUT_DIR
+            / f"input.{'xlsx' if _format == str(FileFormat.EXCEL) else _format}"
+        )
+        columns = list(readFile(_format, FILE, nrows=1).columns[:2])[::-1]
+        result = runner.invoke(peek, ["-i", FILE, "--columns", ",".join(columns)])
+        print(result.output)
+        assert result.exit_code == 0
+        assert f"and {len(columns)} columns, showing first 10 rows" in result.output
+        df = readFile(_format, FILE, nrows=3, columns=columns)
+        assert list(df.columns) == columns
+        assert df.shape == (3, len(columns))
+
+
+def test_data_peek_wide_file_reads_visible_columns():
+    runner = CliRunner()
+    result = runner.invoke(peek, ["-i", INPUT_DIR / "Account.csv", "-c", 2])
+    print(result.output)
+    assert "and 61 columns, showing first 2 rows and 10 columns" in result.output
+
+
+def test_read_columns():
+    for _format in FileFormat.validFormats():
+        FILE = (
+            INPUT_DIR
+            / f"input.{'xlsx' if _format == str(FileFormat.EXCEL) else _format}"
+        )
+        columns = readColumns(_format, FILE)
+        if columns is not None:  # JSON needs data to be parsed
+            assert columns == list(readFile(_format, FILE).columns)
+
+
+def test_format_cells_truncates_long_values():
+    df = pd.DataFrame({"id": [1, 2], "text": ["x" * 1000, None]})
+    rows = _format_cells(df)
+    assert rows[0][0] == "1"
+    assert len(rows[0][1]) == MAX_CELL_LENGTH
+    assert rows[0][1].endswith("…")
+    assert all(isinstance(cell, str) for row in rows for cell in row)
+
+
+def test_data_peek_output_jsonl():
+    runner = CliRunner()
+    result = runner.invoke(
+        cli,
+        ["--output", "jsonl", "data", "peek", "-i", INPUT_CSV_FILE, "-c", 5],
+        env={"HCKR_UPDATE_CHECK_TTL": "0"},
+    )
+    print(result.output)
+    assert result.exit_code == 0
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    assert len(records) == 5
+    assert list(records[0]) == list(readColumns(str(FileFormat.CSV), INPUT_CSV_FILE))
+    assert "Peeking 5 rows" in result.stderr
+
+
+def test_data_peek_output_json_float_precision(tmp_path):
+    runner = CliRunner()
+    FILE = tmp_path / "values.csv"
+    FILE.write_text("value\n0.4462532365091366\n")
+    for output, parse in [
+        ("json", json.loads),
+        ("jsonl", lambda stdout: [json.loads(line) for line in stdout.splitlines()]),
+    ]:
+        result = runner.invoke(
+            cli,
+            ["--output", output, "data", "peek", "-i", FILE],
+            env={"HCKR_UPDATE_CHECK_TTL": "0"},
+        )
+        assert result.exit_code == 0
+        assert parse(result.stdout) == [{"value": 0.4462532365091366}]
+
+
+def test_data_peek_detects_format_without_extension(tmp_path):
+    runner = CliRunner()
+    for _format in FileFormat.validFormats():
+        FILE = tmp_path / f"{_format}.data"
+        FILE.write_bytes(input_file(_format).read_bytes())
+        result = runner.invoke(peek, ["-i", FILE])
+        print(result.output)
+        assert result.exit_code == 0
+        expected = {"txt": "csv"}.get(_format, _format)  # txt has a csv header
+        assert f"Format inferred: {expected}" in result.output
+        assert "showing first 10 rows" in result.output
+
+
+def test_data_peek_detects_format_with_wrong_extension(tmp_path):
+    runner = CliRunner()
+    FILE = tmp_path / "input.csv"
+    FILE.write_bytes(input_file(FileFormat.PARQUET).read_bytes())
+    result = runner.invoke(peek, ["-i", FILE])
+    print(result.output)
+    assert result.exit_code == 0
+    assert "File extension .csv doesn't match its content" in result.output
+    assert "Format inferred: parquet" in result.output
+
+
+def test_detect_file_format():
+    for _format in FileFormat.validFormats():
+        with open(input_file(_format), "rb") as handle:
+            detected, compression = detect_file_format(handle)
+            assert handle.tell() == 0
+        assert compression is None
+        _format = FileFormat(_format)
+        assert detected in COMPATIBLE_FORMATS.get(_format, {_format})
+    with open(INPUT_DIR / "json-lines.json", "rb") as handle:
+        assert detect_file_format(handle) == (FileFormat.JSONL, None)
+
+
+def test_data_peek_text_starting_with_compression_magic(tmp_path):
+    runner = CliRunner()
+    FILE = tmp_path / "codes.csv"
+    FILE.write_text("BZh_code,name\n1,a\n2,b\n")
+    with open(FILE, "rb") as handle:
+        assert detect_file_format(handle) == (FileFormat.CSV, None)
+    for options in [[], ["-f", "csv"]]:
+        result = runner.invoke(peek, ["-i", FILE] + options)
+        print(result.output)
+        assert result.exit_code == 0
+        assert "BZh_code" in result.output
+
+
+def test_data_peek_text_starting_with_orc_magic(tmp_path):
+    runner = CliRunner()
+    FILE = tmp_path / "authors.csv"
+    FILE.write_text("ORCID,name\n0000-0001,a\n0000-0002,b\n")
+    with open(FILE, "rb") as handle:
+        assert detect_file_format(handle) == (FileFormat.CSV, None)
+    COMPRESSED_FILE = tmp_path / "authors.csv.gz"
+    COMPRESSED_FILE.write_bytes(gzip.compress(FILE.read_bytes()))
+    for FILE, options in [(FILE, ["-f", "csv"]), (FILE, []), (COMPRESSED_FILE, [])]:
+        result = runner.invoke(peek, ["-i", FILE] + options)
+        print(result.output)
+        assert result.exit_code == 0
+        assert "0000-0002" in result.output
+
+
+def test_data_peek_compressed_files(tmp_path):
+    runner = CliRunner()
+    for _format, compression in [
+        (FileFormat.CSV, "gz"),
+        (FileFormat.JSONL, "zst"),
+        (FileFormat.AVRO, "bz2"),
+        (FileFormat.PARQUET, "xz"),
+        (FileFormat.FEATHER, "gz"),
+        (FileFormat.ORC, "zst"),
+    ]:
+        FILE = tmp_path / f"input{_format.extension()}.{compression}"
+        with open(FILE, "wb") as raw, open_compressed(
+            raw, "wb", COMPRESSION_EXTENSIONS[f".{compression}"]
+        ) as target:
+            target.write(input_file(_format).read_bytes())
+        result = runner.invoke(peek, ["-i", FILE, "-c", 3])
+        print(result.output)
+        assert result.exit_code == 0
+        assert f"Format inferred: {_format}" in result.output
+        assert "more than 3 rows" in result.output
+
+
+def write_blocks(path, _format, rows=1000, block_rows=100):
+    # a file of rows / block_rows blocks ( row groups, record batches, stripes )
+    df = pd.DataFrame({"id": range(rows), "name": [f"name-{i}" for i in range(rows)]})
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if _format == FileFormat.PARQUET:
+        pq.write_table(table, path, row_group_size=block_rows)
+    elif _format == FileFormat.FEATHER:
+        with pa.ipc.new_file(path, table.schema) as writer:
+            writer.write_table(table, max_chunksize=block_rows)
+    elif _format == FileFormat.ORC:
+        from pyarrow import orc  # type: ignore
+
+        orc.write_table(table, path, stripe_size=1024, batch_size=block_rows)
+    else:
+        schema = fastavro.parse_schema(
+            {
+                "type": "record",
+                "name": "row",
+                "fields": [
+                    {"name": "id", "type": "long"},
+                    {"name": "name", "type": "string"},
+                ],
+            }
+        )
+        with open(path, "wb") as f:
+            fastavro.writer(f, schema, df.to_dict("records"), sync_interval=1000)
+    return df
+
+
+def test_reservoir_sample():
+    batches = [
+        pd.DataFrame({"id": range(start, start + 100)}) for start in range(0, 1000, 100)
+    ]
+    sample, rows = reservoir_sample(iter(batches), 50, seed=1)
+    assert rows == 1000
+    assert sample.shape[0] == 50
+    assert sample.id.is_monotonic_increasing  # in original order
+    assert sample.id.is_unique
+    assert sample.id.max() >= 500  # not only from first batches
+    assert sample.equals(reservoir_sample(iter(batches), 50, seed=1)[0])
+    sample, rows = reservoir_sample(iter(batches[:1]), 500)
+    assert sample.shape[0] == rows == 100
+
+
+def test_read_file_blocks(tmp_path):
+    for _format in [
+        FileFormat.PARQUET,
+        FileFormat.AVRO,
+        FileFormat.FEATHER,
+        FileFormat.ORC,
+    ]:
+        FILE = tmp_path / f"blocks{_format.extension()}"
+        df = write_blocks(FILE, _format)
+        blocks = list(readFileBlocks(_format, FILE, lambda index, blocks: True))
+        assert len(blocks) > 1, _format
+        assert pd.concat(blocks, ignore_index=True).equals(df)
+        odd = list(
+            readFileBlocks(
+                _format, FILE, lambda index, blocks: index % 2 == 1, columns=["name"]
+            )
+        )
+        assert len(odd) == len(blocks) // 2
+        assert list(odd[0].columns) == ["name"]
+        assert odd[0].name.iloc[0] == blocks[1].name.iloc[0]
+
+
+def test_data_peek_sample():
+    runner = CliRunner()
+    for _format in FileFormat.validFormats():
+        args = ["-i", input_file(_format), "--sample", 4, "--seed", 7]
+        result = runner.invoke(peek, args)
+        print(result.output)
+        assert result.exit_code == 0
+        assert "Sampled 4 random rows" in result.output
+        assert "showing first 4 rows" in result.output
+        outputs = [
+            runner.invoke(
+                cli,
+                ["--output", "jsonl", "data", "peek"] + args,
+                env={"HCKR_UPDATE_CHECK_TTL": "0"},
+            ).stdout
+            for _ in range(2)
+        ]
+        assert len(outputs[0].splitlines()) == 4
+        assert outputs[0] == outputs[1]  # same rows for same seed
+
+
+def test_data_peek_sample_fraction(tmp_path):
+    runner = CliRunner()
+    for _format in [FileFormat.PARQUET, FileFormat.FEATHER]:
+        FILE = tmp_path / f"blocks{_format.extension()}"
+        write_blocks(FILE, _format)
+        result = runner.invoke(
+            peek, ["-i", FILE, "--sample-fraction", 0.2, "-c", 3, "--seed", 1]
+        )
+        print(result.output)
+        assert result.exit_code == 0
+        # only 2 of 10 blocks are read
+        assert "Sampled 3 random rows from 200 rows read" in result.output
+    FILE = tmp_path / "blocks.csv"
+    write_blocks(tmp_path / "blocks.parquet", FileFormat.PARQUET).to_csv(
+        FILE, index=False
+    )
+    result = runner.invoke(peek, ["-i", FILE, "--sample-fraction", 0.5, "--seed", 1])
+    assert result.exit_code == 0
+    assert "Sampled 10 random rows" in result.output
+
+
+def test_read_file_tail(monkeypatch):
+    # small chunks, so records with quoted newlines are split across chunks
+    monkeypatch.setattr("hckr.utils.DataUtils.TAIL_CHUNK_SIZE", 16)
+    for _format in FileFormat.validFormats():
+        full = readFile(_format, input_file(_format))
+        for nrows in [1, 4, full.shape[0] + 1]:
+            tail = readFileTail(_format, input_file(_format), nrows)
+            expected = full.tail(nrows).reset_index(drop=True)
+            assert tail.astype(str).equals(expected.astype(str)), (_format, nrows)
+
+
+def test_read_file_tail_last_blocks(tmp_path):
+    for _format in [
+        FileFormat.PARQUET,
+        FileFormat.AVRO,
+        FileFormat.FEATHER,
+        FileFormat.ORC,
+    ]:
+        FILE = tmp_path / f"blocks{_format.extension()}"
+        df = write_blocks(FILE, _format)
+        tail = readFileTail(_format, FILE, 150, columns=["name"])
+        assert tail.name.tolist() == df.name.tail(150).tolist()
+
+
+def test_data_peek_tail(tmp_path):
+    runner = CliRunner()
+    FILE = tmp_path / "log.jsonl.gz"
+    df = pd.DataFrame({"id": range(100), "level": ["INFO", "WARN"] * 50})
+    with gzip.open(FILE, "wt") as f:
+        df.to_json(f, orient="records", lines=True)
+    for path in [INPUT_CSV_FILE, FILE]:
+        result = runner.invoke(peek, ["-i", path, "--tail", "-c", 3])
+        print(result.output)
+        assert result.exit_code == 0
+        assert "Last Rows" in result.output
+        assert "more than 3 rows" in result.output
+    result = runner.invoke(
+        cli,
+        ["--output", "jsonl", "data", "peek", "-i", FILE, "--tail", "-c", 2],
+        env={"HCKR_UPDATE_CHECK_TTL": "0"},
+    )
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    assert records == [{"id": 98, "level": "INFO"}, {"id": 99, "level": "WARN"}]
+
+
+def append_later(path, *chunks, delay=0.3):
+    # appends chunks to a file from another thread, while it's being followed
+    def append():
+        for chunk in chunks:
+            time.sleep(delay)
+            with open(path, "ab") as f:
+                f.write(chunk)
+
+    thread = threading.Thread(target=append)
+    thread.start()
+    return thread
+
+
+def test_follow_records(tmp_path, monkeypatch):
+    FILE = tmp_path / "log.csv"
+    for poll in [False, True]:
+        if poll:
+            monkeypatch.setattr(
+                "hckr.utils.FollowUtils.file_watcher", lambda path: _Poller()
+            )
+        FILE.write_bytes(b'id,msg\n1,"a\nb"\n2,partial')
+        thread = append_later(FILE, b'\n3,"c\n', b'd"\n4,e\n')
+        records = list(
+            follow_records(
+                FILE, quoted=True, header=True, idle_timeout=1, interval=0.05
+            )
+        )
+        thread.join()
+        # partially written record is read once it's complete, quoted newline doesn't end a record
+        assert b"".join(records) == b'2,partial\n3,"c\nd"\n4,e\n'
+        assert parse_records(
+            FileFormat.CSV, b"".join(records), b"id,msg\n"
+        ).id.tolist() == [2, 3, 4]
+
+
+def test_follow_records_rotated_partial_header(tmp_path, monkeypatch):
+    FILE = tmp_path / "log.csv"
+    FILE.write_bytes(b"id,msg\n1,a\n")
+    records = []
+
+    def follow():
+        for record in follow_records(
+            FILE, header=True, idle_timeout=1.5, interval=0.05
+        ):
+            records.append(record)
+
+    consumer = threading.Thread(target=follow)
+    consumer.start()
+    time.sleep(0.3)
+    # rotated, and header of new file is partially written
+    ROTATED = tmp_path / "log.csv.new"
+    ROTATED.write_bytes(b"id,m")
+    os.replace(ROTATED, FILE)
+    checks = []
+    fstat = os.fstat
+    monkeypatch.setattr(os, "fstat", lambda fd: checks.append(fd) or fstat(fd))
+    append_later(FILE, b"sg\n2,b\n", delay=0.5).join()
+    consumer.join()
+    assert records == [b"2,b\n"]
+    # partial header is waited for, file isn't checked again in a busy loop
+    assert len(checks) < 500
+
+
+def test_data_peek_follow(tmp_path):
+    runner = CliRunner()
+    FILE = tmp_path / "log.jsonl"
+    FILE.write_text('{"id": 1, "level": "ERROR"}\n{"id": 2, "level": "INFO"}\n')
+    thread = append_later(
+        FILE,
+        b'{"id": 3, "level": "INFO"}\n{"id": 4, "level": "ERROR"}\n',
+        b'{"id": 5, "level": "ERROR"}\n',
+    )
+    result = runner.invoke(
+        cli,
+        ["--output", "jsonl", "data", "peek", "-i", FILE, "--follow"]
+        + ["--where", "level = 'ERROR'", "--follow-timeout", 1.5],
+        env={"HCKR_UPDATE_CHECK_TTL": "0"},
+    )
+    thread.join()
+    print(result.output)
+    assert result.exit_code == 0
+    assert [json.loads(line)["id"] for line in result.stdout.splitlines()] == [1, 4, 5]
+    assert "Stopped following" in result.stderr
+
+
+def test_data_peek_follow_csv_output(tmp_path):
+    runner = CliRunner()
+    FILE = tmp_path / "log.csv"
+    FILE.write_text("id,level\n1,ERROR\n")
+    thread = append_later(FILE, b"2,INFO\n", b"3,ERROR\n")
+    result = runner.invoke(
+        cli,
+        ["--output", "csv", "data", "peek", "-i", FILE, "--follow"]
+        + ["--follow-timeout", 1.5],
+        env={"HCKR_UPDATE_CHECK_TTL": "0"},
+    )
+    thread.join()
+    print(result.output)
+    assert result.exit_code == 0
+    # header only once, before first rows
+    assert result.stdout.splitlines() == ["id,level", "1,ERROR", "2,INFO", "3,ERROR"]
+
+
+def test_data_peek_follow_incomplete_last_line(tmp_path):
+    runner = CliRunner()
+    FILE = tmp_path / "log.csv"
+    FILE.write_text("a,b\n1,x\n2,y\n3,partial")
+    thread = append_later(FILE, b"line\n4,z\n")
+    result = runner.invoke(
+        cli,
+        ["--output", "csv", "data", "peek", "-i", FILE, "--follow"]
+        + ["--follow-timeout", 1.5],
+        env={"HCKR_UPDATE_CHECK_TTL": "0"},
+    )
+    thread.join()
+    print(result.output)
+    assert result.exit_code == 0
+    # incomplete line is shown once, when it's complete
+    assert result.stdout.splitlines() == ["a,b", "1,x", "2,y", "3,partialline", "4,z"]
+
+
 # NEGATIVE
+def test_data_peek_follow_invalid_options(tmp_path):
+    runner = CliRunner()
+    result = runner.invoke(peek, ["-i", INPUT_CSV_FILE, "--where", "id = 1"])
+    assert result.exit_code == 1
+    assert "--where option is only supported with --follow" in result.output
+    COMPRESSED_FILE = tmp_path / "input.csv.gz"
+    COMPRESSED_FILE.write_bytes(gzip.compress(INPUT_CSV_FILE.read_bytes()))
+    # rows can't be appended to a JSON array
+    for FILE in [input_file(FileFormat.PARQUET), COMPRESSED_FILE, input_file("json")]:
+        result = runner.invoke(peek, ["-i", FILE, "--follow"])
+        assert result.exit_code == 1
+        assert "only supported for uncompressed CSV and JSON lines" in " ".join(
+            result.output.split()
+        )
+    result = runner.invoke(
+        peek, ["-i", INPUT_CSV_FILE, "--follow", "--where", "invalid ="]
+    )
+    assert result.exit_code == 1
+    assert "Invalid filter" in result.output
+
+
+def test_data_peek_tail_invalid_options(tmp_path):
+    runner = CliRunner()
+    result = runner.invoke(peek, ["-i", INPUT_CSV_FILE, "--tail", "--sample", 3])
+    assert result.exit_code == 1
+    assert "--tail option can't be used with --sample" in result.output
+    (tmp_path / "part-0.csv").write_bytes(INPUT_CSV_FILE.read_bytes())
+    result = runner.invoke(peek, ["-i", tmp_path, "--tail"])
+    assert result.exit_code == 1
+    assert "--tail option is only supported for a file" in result.output
+
+
+def test_data_peek_invalid_sample_fraction():
+    runner = CliRunner()
+    for fraction in ["0", "1.5"]:
+        result = runner.invoke(
+            peek, ["-i", INPUT_CSV_FILE, "--sample-fraction", fraction]
+        )
+        assert result.exit_code == 2
+        assert "Invalid value for '--sample-fraction'" in result.output
+
+
 def test_data_peek_no_input():
     runner = CliRunner()
     result = runner.invoke(peek, [])
@@ -124,6 +659,25 @@ def test_data_peek_with_invalid_input_file_format():
     assert f"""Invalid file format {INVALID_FORMAT}""" in result.output
 
 
+def test_data_peek_invalid_columns():
+    runner = CliRunner()
+    result = runner.invoke(peek, ["-i", INPUT_CSV_FILE, "--columns", "invalid"])
+    print(result.output)
+    assert result.exit_code == 1
+    assert "Columns ['invalid'] not found" in result.output
+
+
+def test_data_peek_nested_compressed_file(tmp_path):
+    runner = CliRunner()
+    FILE = tmp_path / "input.csv.gz.gz"
+    FILE.write_bytes(gzip.compress(gzip.compress(INPUT_CSV_FILE.read_bytes())))
+    result = runner.invoke(peek, ["-i", FILE])
+    print(result.output)
+    assert result.exit_code == 1
+    # rich wraps ( and shortens ) the long tmp path at terminal width
+    assert "nested gzip compression" in " ".join(result.output.split())
+
+
 def test_data_peek_with_input_file_not_found():
     runner = CliRunner()
     # giving CSV file but Format as AVRO
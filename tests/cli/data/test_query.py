@@ -0,0 +1,214 @@
+import gzip
+import lzma
+
+import pandas as pd
+import pyarrow as pa  # type: ignore
+import pytest
+from click.testing import CliRunner
+from pyarrow import parquet as pq  # type: ignore
+
+from hckr.cli import cli
+from hckr.cli.data import query
+from hckr.utils.DataUtils import readFile
+from hckr.utils.DatasetUtils import Dataset
+from hckr.utils.QueryUtils import QueryError, parse_query, parse_where, run_query
+
+
+def write_events(path, rows=100):
+    df = pd.DataFrame(
+        {
+            "user": [["a", "b", "c"][i % 3] for i in range(rows)],
+            "amount": range(rows),
+            "ts": pd.date_range("2024-01-01", periods=rows, freq="D"),
+        }
+    )
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), path, 10)
+    return df
+
+
+def run(path, text):
+    dataset = Dataset(str(path), "parquet")
+    return pd.concat(run_query(dataset, parse_query(text, dataset.schema()), 7))
+
+
+# POSITIVE
+def test_parse_where(tmp_path):
+    df = write_events(tmp_path / "events.parquet")
+    dataset = Dataset(str(tmp_path / "events.parquet"), "parquet")
+    for where, expected in [
+        ("amount >= 90", df.amount >= 90),
+        (
+            "amount between 10 and 12 or user = 'c'",
+            df.amount.between(10, 12) | (df.user == "c"),
+        ),
+        ("not (user in ('a', 'b'))", ~df.user.isin(["a", "b"])),
+        ("ts < '2024-01-05'", df.ts < "2024-01-05"),
+        ("user like 'a%' and amount <> 0", (df.user == "a") & (df.amount != 0)),
+        ("amount > -1 and user is not null", df.amount > -1),
+    ]:
+        expression = parse_where(where, dataset.schema())
+        rows = sum(table.num_rows for table in dataset.tables(filter=expression))
+        assert rows == expected.sum(), where
+
+
+def test_query_aggregates(tmp_path):
+    df = write_events(tmp_path / "events.parquet")
+    result = run(
+        tmp_path / "events.parquet",
+        "select user, count(*) as n, sum(amount), avg(amount), max(ts) "
+        "from events where amount >= 10 group by user order by user",
+    )
+    expected = df[df.amount >= 10].groupby("user")
+    assert list(result.columns) == [
+        "user",
+        "n",
+        "sum(amount)",
+        "avg(amount)",
+        "max(ts)",
+    ]
+    assert list(result["n"]) == list(expected.size())
+    assert list(result["sum(amount)"]) == list(expected.amount.sum())
+    assert list(result["avg(amount)"]) == list(expected.amount.mean())
+    assert list(result["max(ts)"]) == list(expected.ts.max())
+
+
+def test_query_order_limit(tmp_path):
+    write_events(tmp_path / "events.parquet")
+    result = run(
+        tmp_path / "events.parquet",
+        "select amount as a, user where user = 'b' order by a desc limit 3",
+    )
+    assert list(result.columns) == ["a", "user"]
+    assert list(result["a"]) == [97, 94, 91]
+    result = run(tmp_path / "events.parquet", "select count(*) where amount < 0")
+    assert list(result["count(*)"]) == [0]
+
+
+def test_data_query(tmp_path):
+    write_events(tmp_path / "events.parquet")
+    runner = CliRunner()
+    result = runner.invoke(
+        query,
+        ["-i", tmp_path / "events.parquet", "select user, amount", "-c", 3]
+        + ["--where", "amount >= 50"],
+    )
+    print(result.output)
+    assert result.exit_code == 0
+    assert "Data has more than 3 rows and 2 columns" in result.output
+
+
+def test_data_query_avro_to_file(tmp_path):
+    runner = CliRunner()
+    OUTPUT = tmp_path / "output.csv"
+    INPUT = tmp_path / "events.avro"
+    write_events(tmp_path / "events.parquet")
+    runner.invoke(
+        cli, ["data", "convert", "-i", tmp_path / "events.parquet", "-o", INPUT]
+    )
+    result = runner.invoke(
+        query, ["-i", INPUT, "--where", "user = 'a' and amount < 30", "-o", OUTPUT]
+    )
+    print(result.output)
+    assert result.exit_code == 0
+    assert "10 rows written to" in result.output
+    assert readFile("csv", OUTPUT).shape == (10, 3)
+
+
+def test_data_query_machine_output(tmp_path):
+    write_events(tmp_path / "events.parquet")
+    runner = CliRunner()
+    result = runner.invoke(
+        cli,
+        ["--output", "jsonl", "data", "query", "-i", tmp_path / "events.parquet"]
+        + ["select user, count(*) as n group by user order by n desc, user"],
+    )
+    assert result.exit_code == 0
+    assert result.stdout.splitlines()[0] == '{"user":"a","n":34}'
+
+
+# NEGATIVE
+def test_parse_query_errors():
+    schema = pa.schema([("user", pa.string()), ("amount", pa.int64())])
+    for text, message in [
+        ("select foo", "Column foo not found"),
+        ("select user, count(*)", "must be in GROUP BY"),
+        ("select user group by user", "GROUP BY needs an aggregate"),
+        ("select median(amount)", "Invalid function median"),
+        ("select * where amount >", "Expected a value for amount"),
+        ("select * limit 5 user", "Unexpected user"),
+    ]:
+        with pytest.raises(QueryError, match=message.replace("(", "\\(")):
+            parse_query(text, schema)
+
+
+def test_data_query_invalid_where(tmp_path):
+    write_events(tmp_path / "events.parquet")
+    runner = CliRunner()
+    result = runner.invoke(
+        query, ["-i", tmp_path / "events.parquet", "--where", "amount ="]
+    )
+    print(result.output)
+    assert result.exit_code == 1
+    assert "Invalid query" in result.output
+
+
+def test_data_query_missing_input(tmp_path):
+    runner = CliRunner()
+    result = runner.invoke(query, ["-i", tmp_path / "missing.parquet"])
+    print(result.output)
+    assert result.exit_code == 1
+    assert result.exception is None or isinstance(result.exception, SystemExit)
+    assert "Some error occurred while reading" in result.output
+
+
+def test_data_query_compressed_columnar(tmp_path):
+    write_events(tmp_path / "events.parquet")
+    runner = CliRunner()
+    for extension in [".parquet", ".feather", ".orc"]:
+        INPUT = tmp_path / f"events{extension}.gz"
+        runner.invoke(
+            cli, ["data", "convert", "-i", tmp_path / "events.parquet", "-o", INPUT]
+        )
+        result = runner.invoke(
+            cli,
+            ["--output", "jsonl", "data", "query", "-i", INPUT]
+            + ["select count(*) as n where user = 'a'"],
+            env={"HCKR_UPDATE_CHECK_TTL": "0"},
+        )
+        print(result.output)
+        assert result.exit_code == 0
+        assert result.stdout.strip() == '{"n":34}'
+
+
+def test_data_query_compressed_text(tmp_path):
+    csv = write_events(tmp_path / "events.parquet").to_csv(index=False).encode()
+    (tmp_path / "events.csv.xz").write_bytes(lzma.compress(csv))
+    # compression is detected from content
+    (tmp_path / "events.data").write_bytes(gzip.compress(csv))
+    runner = CliRunner()
+    for path in ["events.csv.xz", "events.data"]:
+        result = runner.invoke(
+            cli,
+            ["--output", "jsonl", "data", "query", "-i", tmp_path / path]
+            + ["select count(*) as n", "--where", "amount < 2"],
+            env={"HCKR_UPDATE_CHECK_TTL": "0"},
+        )
+        print(result.output)
+        assert result.exit_code == 0
+        assert result.stdout.strip() == '{"n":2}'
+
+
+def test_data_query_no_rows_to_file(tmp_path):
+    write_events(tmp_path / "events.parquet")
+    runner = CliRunner()
+    OUTPUT = tmp_path / "empty.parquet"
+    result = runner.invoke(
+        query,
+        ["-i", tmp_path / "events.parquet", "--where", "amount > 1000", "-o", OUTPUT],
+    )
+    print(result.output)
+    assert result.exit_code == 0
+    assert "0 rows written to" in result.output
+    table = pq.read_table(OUTPUT)
+    assert table.num_rows == 0
+    assert table.column_names == ["user", "amount", "ts"]
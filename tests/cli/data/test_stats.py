@@ -0,0 +1,180 @@
+import gzip
+import json
+import lzma
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa  # type: ignore
+from click.testing import CliRunner
+from pyarrow import parquet as pq  # type: ignore
+
+from hckr.cli import cli
+from hckr.cli.data import stats
+from hckr.utils.StatsUtils import (
+    HyperLogLog,
+    TDigest,
+    column_stats,
+    parquet_statistics,
+)
+
+
+def write_values(path, rows=10000):
+    rng = np.random.default_rng(7)
+    df = pd.DataFrame(
+        {
+            "id": np.arange(rows),
+            "score": rng.normal(50, 10, rows),
+            "name": rng.choice(["a", "b", "c", None], rows),
+        }
+    )
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), path, 1000)
+    return df
+
+
+def output(result):
+    # rich wraps long lines at terminal width
+    return " ".join(result.output.split())
+
+
+# POSITIVE
+def test_hyperloglog_count():
+    for distinct in [10, 1000, 100000]:
+        hll = HyperLogLog()
+        values = np.arange(distinct)
+        hll.add_hashes(pd.util.hash_array(np.concatenate([values, values])))
+        assert abs(hll.count() - distinct) <= max(1, distinct * 0.03)
+
+
+def test_tdigest_quantiles():
+    values = np.random.default_rng(1).random(100000)
+    digest = TDigest()
+    for batch in np.array_split(values, 20):
+        digest.add(batch)
+    assert len(digest.means) < 1000
+    for q in [0.01, 0.25, 0.5, 0.75, 0.99]:
+        assert abs(digest.quantile(q) - np.quantile(values, q)) < 0.01
+    assert digest.quantile(0) == values.min()
+    assert digest.quantile(1) == values.max()
+
+
+def test_column_stats(tmp_path):
+    df = write_values(tmp_path / "values.parquet")
+    table = pq.read_table(tmp_path / "values.parquet")
+    result = column_stats(table.to_batches(max_chunksize=999), table.schema)
+    result = result.set_index("column")
+    assert result.loc["id", "count"] == 10000
+    assert result.loc["name", "nulls"] == df.name.isna().sum()
+    assert result.loc["name", "distinct"] == 3
+    assert result.loc["name", "min"] == "a"
+    assert result.loc["score", "min"] == df.score.min()
+    assert abs(result.loc["score", "mean"] - df.score.mean()) < 1e-4
+    assert abs(result.loc["score", "std"] - df.score.std()) < 1e-4
+    assert abs(result.loc["score", "p50"] - df.score.median()) < 0.5
+    assert abs(result.loc["id", "distinct"] - 10000) < 300
+
+
+def test_parquet_statistics(tmp_path):
+    df = write_values(tmp_path / "values.parquet")
+    rows, known = parquet_statistics(tmp_path / "values.parquet")
+    assert rows == 10000
+    assert known["id"] == {"nulls": 0, "min": 0, "max": 9999}
+    assert known["name"]["nulls"] == df.name.isna().sum()
+
+
+def test_data_stats_files(tmp_path):
+    df = write_values(tmp_path / "values.parquet")
+    df.to_csv(tmp_path / "values.csv.gz", index=False)
+    runner = CliRunner()
+    with open(tmp_path / "values.parquet", "rb") as f:
+        (tmp_path / "values.parquet.gz").write_bytes(gzip.compress(f.read()))
+    csv = df.to_csv(index=False).encode()
+    (tmp_path / "values.csv.xz").write_bytes(lzma.compress(csv))
+    # compression is detected from content
+    (tmp_path / "values.data").write_bytes(gzip.compress(csv))
+    for path in [
+        "values.parquet",
+        "values.csv.gz",
+        "values.parquet.gz",
+        "values.csv.xz",
+        "values.data",
+    ]:
+        result = runner.invoke(
+            stats, ["-i", str(tmp_path / path), "--columns", "id,score"]
+        )
+        assert result.exit_code == 0
+        assert "Data has total 2 rows and 12 columns" in output(result)
+        result = runner.invoke(
+            cli,
+            ["--output", "json", "data", "stats", "-i", str(tmp_path / path)],
+            env={"HCKR_UPDATE_CHECK_TTL": "0"},
+        )
+        records = {record["column"]: record for record in json.loads(result.stdout)}
+        assert records["id"]["max"] == 9999
+        assert records["score"]["count"] == 10000
+
+
+def test_data_stats_metadata(tmp_path):
+    write_values(tmp_path / "values.parquet")
+    runner = CliRunner()
+    result = runner.invoke(
+        stats, ["-i", str(tmp_path / "values.parquet"), "--metadata"]
+    )
+    assert result.exit_code == 0
+    assert "Data has total 3 rows and 6 columns" in output(result)
+    assert "mean" not in result.output
+
+
+def test_data_stats_dataset(tmp_path):
+    for year in [2023, 2024]:
+        (tmp_path / f"year={year}").mkdir()
+        write_values(tmp_path / f"year={year}" / "part-0.parquet")
+    runner = CliRunner()
+    result = runner.invoke(
+        stats, ["-i", str(tmp_path), "--partition", "year=2024", "--columns", "id"]
+    )
+    assert result.exit_code == 0
+    assert "Data has total 1 rows" in output(result)
+    result = runner.invoke(
+        cli,
+        ["--output", "json", "data", "stats", "-i", str(tmp_path), "--columns", "id"],
+        env={"HCKR_UPDATE_CHECK_TTL": "0"},
+    )
+    assert json.loads(result.stdout)[0]["count"] == 20000
+
+
+# NEGATIVE
+def test_data_stats_invalid_quantiles(tmp_path):
+    write_values(tmp_path / "values.parquet")
+    runner = CliRunner()
+    result = runner.invoke(
+        stats, ["-i", str(tmp_path / "values.parquet"), "--quantiles", "0.5,2"]
+    )
+    assert result.exit_code == 1
+    assert "Invalid quantiles" in result.output
+
+
+def test_data_stats_missing_column(tmp_path):
+    write_values(tmp_path / "values.parquet")
+    runner = CliRunner()
+    result = runner.invoke(
+        stats, ["-i", str(tmp_path / "values.parquet"), "--columns", "missing"]
+    )
+    assert result.exit_code == 1
+    assert "Columns ['missing'] not found" in output(result)
+
+
+def test_data_stats_metadata_not_parquet(tmp_path):
+    write_values(tmp_path / "values.parquet").to_csv(
+        tmp_path / "values.csv", index=False
+    )
+    runner = CliRunner()
+    result = runner.invoke(stats, ["-i", str(tmp_path / "values.csv"), "--metadata"])
+    assert result.exit_code == 1
+    assert "only supported for an uncompressed Parquet file" in output(result)
+
+
+def test_data_stats_input_file_not_found(tmp_path):
+    runner = CliRunner()
+    result = runner.invoke(stats, ["-i", str(tmp_path / "nope.parquet")])
+    assert result.exit_code == 1
+    assert "Some error occurred while profiling" in output(result)
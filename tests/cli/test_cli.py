@@ -1,3 +1,4 @@
+import pytest
 from click.testing import CliRunner
 
 from hckr.cli import cli
@@ -11,11 +12,14 @@ def test_hckr():
     assert result.exit_code == 0
     assert __version__ in result.output
     assert "[OPTIONS] COMMAND [ARGS]..." in result.output
-    assert (
-        """Options:
-  -v, --verbose  Enable verbose output, use -v for INFO and -vv for DEBUG
-  --version      Show the version and exit.
-  -h, --help     Show this message and exit.
+    assert """Options:
+  -v, --verbose                   Enable verbose output, use -v for INFO and -vv
+                                  for DEBUG
+  --output [json|jsonl|csv|plain]
+                                  Print results as records instead of tables /
+                                  panels, other messages are written to stderr
+  --version                       Show the version and exit.
+  -h, --help                      Show this message and exit.
 
 Commands:
   azure      Azure commands
@@ -31,6 +35,188 @@ Commands:
   info       info commands
   k8s        Kubernetes commands
   net        network commands
-  repl       Start an interactive shell."""
-        in result.output
+  repl       Start an interactive shell.
+  serve      Run hckr server for the thin client hckrc""" in result.output
+
+
+def test_hckr_lazy_subcommands():
+    from hckr.cli import LAZY_SUBCOMMANDS
+
+    runner = CliRunner()
+    result = runner.invoke(cli, ["hash", "md5", "-s", "hckr"])
+    print(result.output)
+    assert result.exit_code == 0
+    assert "MD5:" in result.output
+    assert sorted(LAZY_SUBCOMMANDS) == [
+        name for name in cli.list_commands(None) if name != "repl"
+    ]
+
+
+def test_hckr_import_does_not_load_subcommands():
+    import subprocess
+    import sys
+
+    code = (
+        "import sys, hckr.cli; "
+        "print([m for m in ('hckr.cli.data', 'hckr.cli.k8s.pod', 'hckr.cli.db') if m in sys.modules])"
+    )
+    output = subprocess.check_output([sys.executable, "-c", code], text=True)
+    assert output.strip() == "[]"
+
+
+def test_check_latest_version_uses_cached_state(tmp_path, monkeypatch):
+    import json
+    import time
+
+    from hckr.utils import CliUtils
+
+    state_path = tmp_path / "update_check.json"
+    state_path.write_text(
+        json.dumps({"last_checked": time.time(), "latest_version": "999.0.0"})
+    )
+    monkeypatch.setenv("HCKR_UPDATE_CHECK_TTL", "3600")
+    monkeypatch.setattr(
+        CliUtils,
+        "_refresh_in_background",
+        lambda *args: pytest.fail("fresh state must not be refreshed"),
+    )
+    assert CliUtils.check_latest_version(state_path) == (True, "999.0.0")
+
+
+def test_check_latest_version_refreshes_stale_state(tmp_path, monkeypatch):
+    import json
+    import threading
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+
+    from hckr.utils import CliUtils
+
+    class PyPi(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = json.dumps({"info": {"version": "0.0.1"}}).encode()
+            self.send_response(200)
+            self.end_headers()
+            self.wfile.write(body)
+
+    pypi = HTTPServer(("127.0.0.1", 0), PyPi)
+    threading.Thread(target=pypi.serve_forever, daemon=True).start()
+    state_path = tmp_path / "update_check.json"
+    monkeypatch.setenv("HCKR_UPDATE_CHECK_TTL", "3600")
+    monkeypatch.setattr(CliUtils, "PYPI_URL", f"http://127.0.0.1:{pypi.server_port}")
+    processes = []
+    refresh = CliUtils._refresh_in_background
+    monkeypatch.setattr(
+        CliUtils,
+        "_refresh_in_background",
+        lambda *args: processes.append(refresh(*args)),
+    )
+    # no cached version yet, so no update is shown and refresh happens in background
+    assert CliUtils.check_latest_version(state_path) == (False, __version__)
+    processes[0].wait(timeout=60)
+    pypi.shutdown()
+    assert CliUtils._read_update_state(state_path)["latest_version"] == "0.0.1"
+
+
+def test_check_latest_version_records_attempt_before_fetch(tmp_path, monkeypatch):
+    import json
+
+    from hckr.utils import CliUtils
+
+    state_path = tmp_path / "update_check.json"
+    state_path.write_text(json.dumps({"last_checked": 1, "latest_version": "0.0.1"}))
+    monkeypatch.setenv("HCKR_UPDATE_CHECK_TTL", "3600")
+    # a fetch which doesn't finish eg. unreachable PyPi
+    monkeypatch.setattr(CliUtils, "_refresh_in_background", lambda *args: None)
+    CliUtils.check_latest_version(state_path)
+    state = CliUtils._read_update_state(state_path)
+    assert state["last_checked"] > 1
+    assert state["latest_version"] == "0.0.1"
+    # retried only after TTL
+    monkeypatch.setattr(
+        CliUtils,
+        "_refresh_in_background",
+        lambda *args: pytest.fail("attempted state must not be refreshed"),
+    )
+    CliUtils.check_latest_version(state_path)
+
+
+def test_check_update_output_json(monkeypatch):
+    import json
+
+    from hckr.utils import CliUtils
+
+    monkeypatch.setattr(CliUtils, "check_latest_version", lambda: (True, "999.0.0"))
+    runner = CliRunner()
+    result = runner.invoke(cli, ["--output", "json", "hash", "md5", "-s", "abc"])
+    assert result.exit_code == 0
+    # update notice is written to stderr, so stdout stays valid JSON
+    json.loads(result.stdout)
+    assert "pip install --upgrade hckr" in result.stderr
+
+
+def test_check_latest_version_disabled(tmp_path, monkeypatch):
+    from hckr.utils import CliUtils
+
+    state_path = tmp_path / "update_check.json"
+    monkeypatch.setenv("HCKR_UPDATE_CHECK_TTL", "0")
+    assert CliUtils.check_latest_version(state_path) == (False, __version__)
+    assert not state_path.exists()
+
+
+def test_sentry_init_is_deferred(monkeypatch):
+    import sys
+
+    from hckr.utils import CliUtils
+
+    reported, previous = [], []
+    monkeypatch.setenv("HCKR_TELEMETRY", "on")
+    monkeypatch.setenv("HCKR_SENTRY_TRACES_SAMPLE_RATE", "0")
+    monkeypatch.setenv("HCKR_SENTRY_PROFILES_SAMPLE_RATE", "0")
+    monkeypatch.setattr(
+        CliUtils,
+        "_sentry_sdk_init",
+        lambda *rates: pytest.fail("sentry must not be initialised at start"),
+    )
+    monkeypatch.setattr(sys, "excepthook", lambda *exc_info: previous.append(exc_info))
+    CliUtils.sentry_init()
+
+    class FakeSentry:
+        def capture_exception(self, exc_info):
+            reported.append(exc_info)
+
+        def flush(self, timeout):
+            pass
+
+    monkeypatch.setattr(CliUtils, "_sentry_sdk_init", lambda *rates: FakeSentry())
+    error = ValueError("boom")
+    sys.excepthook(ValueError, error, None)
+    assert reported == [(ValueError, error, None)]
+    assert previous == [(ValueError, error, None)]
+
+
+def test_sentry_init_with_sample_rates(monkeypatch):
+    from hckr.utils import CliUtils
+
+    rates = []
+    monkeypatch.setenv("HCKR_TELEMETRY", "on")
+    monkeypatch.setenv("HCKR_SENTRY_TRACES_SAMPLE_RATE", "0.25")
+    monkeypatch.setenv("HCKR_SENTRY_PROFILES_SAMPLE_RATE", "2")
+    monkeypatch.setattr(CliUtils, "_sentry_sdk_init", lambda *args: rates.append(args))
+    CliUtils.sentry_init()
+    assert rates == [(0.25, 1.0)]
+
+
+def test_sentry_init_telemetry_off(monkeypatch):
+    import sys
+
+    from hckr.utils import CliUtils
+
+    excepthook = sys.excepthook
+    monkeypatch.setenv("HCKR_TELEMETRY", "off")
+    monkeypatch.setenv("HCKR_SENTRY_TRACES_SAMPLE_RATE", "1")
+    monkeypatch.setattr(
+        CliUtils,
+        "_sentry_sdk_init",
+        lambda *rates: pytest.fail("sentry must not be initialised"),
     )
+    CliUtils.sentry_init()
+    assert sys.excepthook is excepthook
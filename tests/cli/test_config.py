@@ -1,6 +1,7 @@
 import random
 import string
 
+from hckr.cli import cli
 from hckr.cli.config import set, get, list_configs, show
 from tests.testUtils import _get_args_with_config_path
 
@@ -62,6 +63,19 @@ def test_config_list(cli_runner):
     assert "[CUSTOM]" in result.output
 
 
+def test_config_list_output_csv(cli_runner):
+    result = cli_runner.invoke(
+        cli,
+        ["--output", "csv", "config", "list"] + _get_args_with_config_path([]),
+        env={"HCKR_UPDATE_CHECK_TTL": "0"},
+    )
+    print(result.output)
+    assert result.exit_code == 0
+    lines = result.stdout.splitlines()
+    assert lines[0] == "section,key,value"
+    assert lines[1].startswith("DEFAULT,")
+
+
 # NEGATIVE USE CASES
 def test_config_get_set_missing_key(cli_runner):
     result = cli_runner.invoke(set, _get_args_with_config_path([]))
@@ -1,5 +1,8 @@
+import json
+
 from click.testing import CliRunner
 
+from hckr.cli import cli
 from hckr.cli.db import query
 from hckr.cli.configure import configure_db
 from tests.testUtils import _get_args_with_config_path
@@ -41,6 +44,34 @@ def test_db_query_sqlite(cli_runner, sqlite_options):
 
     _run_query_and_assert(cli_runner, "select * from users;")
 
+    result = cli_runner.invoke(
+        cli,
+        ["--output", "json", "db", "query", "select name, email from users;"]
+        + _get_args_with_config_path(["-c", "testdb_sqlite"]),
+        env={"HCKR_UPDATE_CHECK_TTL": "0"},
+    )
+    print(result.output)
+    assert json.loads(result.stdout) == [
+        {"name": "Alice", "email": "alice@example.com"}
+    ]
+    for name in ["Bob", "Carol", "Dave"]:
+        _run_query_and_assert(
+            cli_runner,
+            f"INSERT INTO users (name, email) VALUES ('{name}', '{name}@example.com');",
+        )
+    # records are same rows as the table shows, first 3 rows
+    result = cli_runner.invoke(
+        cli,
+        ["--output", "json", "db", "query", "select name from users;"]
+        + _get_args_with_config_path(["-c", "testdb_sqlite"]),
+        env={"HCKR_UPDATE_CHECK_TTL": "0"},
+    )
+    assert [record["name"] for record in json.loads(result.stdout)] == [
+        "Alice",
+        "Bob",
+        "Carol",
+    ]
+
 
 # NEGATIVE USE CASES
 
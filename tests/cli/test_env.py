@@ -1,7 +1,9 @@
+import json
 import os
 
 from click.testing import CliRunner
 
+from hckr.cli import cli
 from hckr.cli.env import get, set, env_list
 
 
@@ -33,3 +35,15 @@ def test_env_list():
     assert result.exit_code == 0
     assert "Listing all environment variables" in result.output
     assert "HOME =" in result.output
+
+
+def test_env_list_output_jsonl():
+    runner = CliRunner()
+    result = runner.invoke(
+        cli,
+        ["--output", "jsonl", "env", "list", "-p", "^HOME="],
+        env={"HCKR_UPDATE_CHECK_TTL": "0"},
+    )
+    print(result.output)
+    assert result.exit_code == 0
+    assert json.loads(result.stdout) == {"name": "HOME", "value": os.environ["HOME"]}
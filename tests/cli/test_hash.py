@@ -1,7 +1,9 @@
+import json
 from pathlib import Path
 from typing import Any
 
 from click.testing import CliRunner
+from hckr.cli import cli
 from hckr.cli.hash import sha1, sha256, sha512, md5
 from hckr.utils.HashUtils import HashType
 
@@ -94,3 +96,29 @@ def test_file_hash_is_dir():
         assert "Path is directory, please pass file path" in result.output.replace(
             "\n", ""
         )
+
+
+def test_string_hash_output_json():
+    runner = CliRunner()
+    result = runner.invoke(
+        cli,
+        ["--output", "json", "hash", "md5", "--string", HASH_STRING],
+        env={"HCKR_UPDATE_CHECK_TTL": "0"},
+    )
+    print(result.output)
+    assert result.exit_code == 0
+    assert json.loads(result.stdout) == [
+        {"digest": EXPECTED_HASHES["md5"], "input": HASH_STRING, "algorithm": "md5"}
+    ]
+    assert "Finding hash for string" in result.stderr
+
+
+def test_file_hash_output_plain():
+    runner = CliRunner()
+    result = runner.invoke(
+        cli,
+        ["--output", "plain", "hash", "sha1", "--file", HASH_FILE],
+        env={"HCKR_UPDATE_CHECK_TTL": "0"},
+    )
+    assert result.exit_code == 0
+    assert result.stdout.split("\t")[0] == EXPECTED_HASHES["sha1"]
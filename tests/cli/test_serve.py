@@ -0,0 +1,149 @@
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import pytest
+
+from hckr.utils.ServeUtils import run_remote, server_running
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX"), reason="hckr serve needs unix sockets"
+)
+
+
+def _client(socket_file, *args):
+    env = dict(os.environ, HCKR_SOCKET=str(socket_file))
+    return subprocess.run(
+        [sys.executable, "-m", "hckr.client", *args],
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+
+
+@pytest.fixture
+def hckr_server(tmp_path):
+    socket_file = tmp_path / "hckr.sock"
+    env = dict(os.environ, HCKR_UPDATE_CHECK_TTL="0", HCKR_TELEMETRY="off")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "hckr", "serve", "-s", str(socket_file)],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    for _ in range(300):
+        if server_running(str(socket_file)):
+            break
+        time.sleep(0.1)
+    yield server, socket_file
+    if server.poll() is None:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+def test_serve_runs_commands(hckr_server):
+    _, socket_file = hckr_server
+    result = _client(socket_file, "hash", "md5", "-s", "hckr")
+    print(result.stdout, result.stderr)
+    assert result.returncode == 0
+    assert "MD5:" in result.stdout
+
+    # server keeps running for next commands, errors are returned as exit code
+    result = _client(socket_file, "invalid-command")
+    assert result.returncode == 2
+    assert "No such command 'invalid-command'" in result.stderr
+
+
+def _follow_client(socket_file, tmp_path):
+    # a command which runs till its client is stopped
+    FILE = tmp_path / "log.csv"
+    FILE.write_text("id,level\n1,INFO\n")
+    env = dict(os.environ, HCKR_SOCKET=str(socket_file), HCKR_UPDATE_CHECK_TTL="0")
+    client = subprocess.Popen(
+        [sys.executable, "-m", "hckr.client", "data", "peek", "-i", str(FILE)]
+        + ["--follow"],
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+    )
+    assert "1" in client.stdout.readline()  # command is running
+    return client
+
+
+def _server_children(server):
+    children = f"/proc/{server.pid}/task/{server.pid}/children"
+    if not os.path.exists(children):
+        pytest.skip("needs /proc to find child processes")
+    with open(children) as f:
+        return f.read().split()
+
+
+def test_serve_runs_commands_concurrently(hckr_server, tmp_path):
+    server, socket_file = hckr_server
+    client = _follow_client(socket_file, tmp_path)
+    # a running command doesn't block other requests
+    result = _client(socket_file, "hash", "md5", "-s", "hckr")
+    assert result.returncode == 0
+    assert "MD5:" in result.stdout
+    # command of a disconnected client is cancelled
+    client.kill()
+    client.wait(timeout=10)
+    for _ in range(100):
+        if not _server_children(server):
+            break
+        time.sleep(0.1)
+    assert _server_children(server) == []
+
+
+def test_serve_stops_with_running_command(hckr_server, tmp_path):
+    server, socket_file = hckr_server
+    client = _follow_client(socket_file, tmp_path)
+    server.terminate()
+    server.wait(timeout=10)
+    assert not socket_file.exists()
+    client.kill()
+    client.wait(timeout=10)
+
+
+def test_serve_socket_permissions(hckr_server):
+    _, socket_file = hckr_server
+    assert socket_file.stat().st_mode & 0o777 == 0o600
+
+
+def test_serve_removes_socket_on_stop(hckr_server):
+    server, socket_file = hckr_server
+    assert socket_file.exists()
+    server.terminate()
+    server.wait(timeout=10)
+    assert not socket_file.exists()
+
+
+def test_client_without_server(tmp_path):
+    socket_file = tmp_path / "missing.sock"
+    assert run_remote(["hash", "md5", "-s", "hckr"], str(socket_file)) is None
+    result = _client(socket_file, "hash", "md5", "-s", "hckr")
+    assert result.returncode == 0
+    assert "MD5:" in result.stdout
+
+
+def test_serve_warms_database_engines(tmp_path):
+    from hckr.utils.DbUtils import _get_engine, warm_engines
+
+    config_file = tmp_path / ".hckrcfg"
+    database = tmp_path / "test.sqlite"
+    config_file.write_text(
+        "[DEFAULT]\n\n[testdb]\nconfig_type = database\n"
+        f"type = SQLite\ndatabase = {database}\n\n"
+        "[other]\nconfig_type = default\n"
+    )
+    warm_engines(config_file)
+    misses = _get_engine.cache_info().misses
+    engine = _get_engine(f"sqlite:///{database}")
+    assert _get_engine.cache_info().misses == misses
+    # engine is created without connecting, so forked commands don't share connections
+    assert engine.pool.checkedout() == 0
+    assert not database.exists()